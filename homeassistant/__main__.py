@@ -108,6 +108,11 @@ def get_arguments() -> argparse.Namespace:
         action="store_true",
         help="Skips pip install of required packages on startup",
     )
+    parser.add_argument(
+        "--trace-startup",
+        action="store_true",
+        help="Record a timeline of the startup to startup_trace.json",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose logging to file."
     )
@@ -253,6 +258,7 @@ async def setup_and_run_hass(config_dir: str, args: argparse.Namespace) -> int:
         log_no_color=args.log_no_color,
         skip_pip=args.skip_pip,
         safe_mode=args.safe_mode,
+        trace_startup=args.trace_startup,
     )
 
     if hass is None:
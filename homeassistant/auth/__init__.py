@@ -3,12 +3,16 @@ import asyncio
 from collections import OrderedDict
 from datetime import timedelta
 import logging
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import jwt
 
 from homeassistant import data_entry_flow
-from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
+from homeassistant.auth.const import (
+    ACCESS_TOKEN_CACHE_SIZE,
+    ACCESS_TOKEN_CACHE_TTL,
+    ACCESS_TOKEN_EXPIRATION,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
@@ -146,6 +150,8 @@ class AuthManager:
         self._providers = providers
         self._mfa_modules = mfa_modules
         self.login_flow = AuthManagerFlowManager(hass, self)
+        # Verified access tokens with their refresh token and expiry timestamp
+        self._access_token_cache: "OrderedDict[str, Tuple[models.RefreshToken, float]]" = OrderedDict()
 
     @property
     def auth_providers(self) -> List[AuthProvider]:
@@ -279,6 +285,9 @@ class AuthManager:
             await asyncio.wait(tasks)
 
         await self._store.async_remove_user(user)
+        self._async_invalidate_access_tokens(
+            lambda refresh_token: refresh_token.user is user
+        )
 
         self.hass.bus.async_fire(EVENT_USER_REMOVED, {"user_id": user.id})
 
@@ -305,6 +314,9 @@ class AuthManager:
         if user.is_owner:
             raise ValueError("Unable to deactivate the owner")
         await self._store.async_deactivate_user(user)
+        self._async_invalidate_access_tokens(
+            lambda refresh_token: refresh_token.user is user
+        )
 
     async def async_remove_credentials(self, credentials: models.Credentials) -> None:
         """Remove credentials."""
@@ -431,6 +443,9 @@ class AuthManager:
     ) -> None:
         """Delete a refresh token."""
         await self._store.async_remove_refresh_token(refresh_token)
+        self._async_invalidate_access_tokens(
+            lambda cached: cached.id == refresh_token.id
+        )
 
     @callback
     def async_create_access_token(
@@ -454,31 +469,57 @@ class AuthManager:
         self, token: str
     ) -> Optional[models.RefreshToken]:
         """Return refresh token if an access token is valid."""
+        now = dt_util.utcnow().timestamp()
+
+        cached = self._access_token_cache.get(token)
+        if cached is not None:
+            refresh_token, valid_until = cached
+            if now < valid_until and _is_refresh_token_active(refresh_token):
+                self._access_token_cache.move_to_end(token)
+                return refresh_token
+            del self._access_token_cache[token]
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
             return None
 
-        refresh_token = await self.async_get_refresh_token(
-            cast(str, unverif_claims.get("iss"))
-        )
+        found = await self.async_get_refresh_token(cast(str, unverif_claims.get("iss")))
 
-        if refresh_token is None:
+        if found is None:
             jwt_key = ""
             issuer = ""
         else:
-            jwt_key = refresh_token.jwt_key
-            issuer = refresh_token.id
+            jwt_key = found.jwt_key
+            issuer = found.id
 
         try:
-            jwt.decode(token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"])
+            claims = jwt.decode(
+                token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"]
+            )
         except jwt.InvalidTokenError:
             return None
 
-        if refresh_token is None or not refresh_token.user.is_active:
+        if found is None or not found.user.is_active:
             return None
 
-        return refresh_token
+        valid_until = now + ACCESS_TOKEN_CACHE_TTL.total_seconds()
+        if "exp" in claims:
+            valid_until = min(valid_until, claims["exp"])
+        self._access_token_cache[token] = (found, valid_until)
+        if len(self._access_token_cache) > ACCESS_TOKEN_CACHE_SIZE:
+            self._access_token_cache.popitem(last=False)
+
+        return found
+
+    @callback
+    def _async_invalidate_access_tokens(
+        self, matches: Callable[[models.RefreshToken], bool]
+    ) -> None:
+        """Forget the verified access tokens of matching refresh tokens."""
+        for token, (refresh_token, _) in list(self._access_token_cache.items()):
+            if matches(refresh_token):
+                del self._access_token_cache[token]
 
     @callback
     def _async_get_auth_provider(
@@ -502,3 +543,9 @@ class AuthManager:
                 return False
 
         return True
+
+
+def _is_refresh_token_active(refresh_token: models.RefreshToken) -> bool:
+    """Return if a refresh token still exists and its user is active."""
+    user = refresh_token.user
+    return user.is_active and user.refresh_tokens.get(refresh_token.id) is refresh_token
@@ -2,12 +2,19 @@
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
 import hmac
 from logging import getLogger
 from typing import Any, Dict, List, Optional
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.area_registry import EVENT_AREA_REGISTRY_UPDATED
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import (
+    EVENT_ENTITY_REGISTRY_UPDATED,
+    async_entries_for_device,
+)
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -36,6 +43,9 @@ class AuthStore:
         self.hass = hass
         self._users: Optional[Dict[str, models.User]] = None
         self._groups: Optional[Dict[str, models.Group]] = None
+        # Refresh tokens of all users by id and by digest of the token
+        self._refresh_tokens: Dict[str, models.RefreshToken] = {}
+        self._refresh_tokens_by_digest: Dict[str, models.RefreshToken] = {}
         self._perm_lookup: Optional[PermissionLookup] = None
         self._store = hass.helpers.storage.Store(
             STORAGE_VERSION, STORAGE_KEY, private=True
@@ -141,6 +151,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        for refresh_token in user.refresh_tokens.values():
+            self._async_unindex_refresh_token(refresh_token)
         self._async_schedule_save()
 
     async def async_update_user(
@@ -223,6 +235,7 @@ class AuthStore:
 
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
+        self._async_index_refresh_token(refresh_token)
 
         self._async_schedule_save()
         return refresh_token
@@ -235,10 +248,10 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            if user.refresh_tokens.pop(refresh_token.id, None):
-                self._async_schedule_save()
-                break
+        found = self._refresh_tokens.get(refresh_token.id)
+        if found is not None and found.user.refresh_tokens.pop(found.id, None):
+            self._async_unindex_refresh_token(found)
+            self._async_schedule_save()
 
     async def async_get_refresh_token(
         self, token_id: str
@@ -248,12 +261,7 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            refresh_token = user.refresh_tokens.get(token_id)
-            if refresh_token is not None:
-                return refresh_token
-
-        return None
+        return self._refresh_tokens.get(token_id)
 
     async def async_get_refresh_token_by_token(
         self, token: str
@@ -263,15 +271,29 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        found = None
+        found = self._refresh_tokens_by_digest.get(_token_digest(token))
 
-        for user in self._users.values():
-            for refresh_token in user.refresh_tokens.values():
-                if hmac.compare_digest(refresh_token.token, token):
-                    found = refresh_token
+        if found is None or not hmac.compare_digest(found.token, token):
+            return None
 
         return found
 
+    @callback
+    def _async_index_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Add a refresh token to the indexes."""
+        self._refresh_tokens[refresh_token.id] = refresh_token
+        self._refresh_tokens_by_digest[
+            _token_digest(refresh_token.token)
+        ] = refresh_token
+
+    @callback
+    def _async_unindex_refresh_token(self, refresh_token: models.RefreshToken) -> None:
+        """Remove a refresh token from the indexes."""
+        self._refresh_tokens.pop(refresh_token.id, None)
+        digest = _token_digest(refresh_token.token)
+        if self._refresh_tokens_by_digest.get(digest) is refresh_token:
+            del self._refresh_tokens_by_digest[digest]
+
     @callback
     def async_log_refresh_token_usage(
         self, refresh_token: models.RefreshToken, remote_ip: Optional[str] = None
@@ -302,6 +324,7 @@ class AuthStore:
             return
 
         self._perm_lookup = perm_lookup = PermissionLookup(ent_reg, dev_reg)
+        self._async_track_registries(perm_lookup)
 
         if data is None:
             self._set_defaults()
@@ -471,10 +494,39 @@ class AuthStore:
                 last_used_ip=rt_dict.get("last_used_ip"),
             )
             users[rt_dict["user_id"]].refresh_tokens[token.id] = token
+            self._async_index_refresh_token(token)
 
         self._groups = groups
         self._users = users
 
+    @callback
+    def _async_track_registries(self, perm_lookup: PermissionLookup) -> None:
+        """Invalidate entity permissions when the registries change."""
+
+        @callback
+        def entity_updated(event: Event) -> None:
+            """Invalidate the permissions of an updated entity."""
+            perm_lookup.async_invalidate(event.data["entity_id"])
+            if "old_entity_id" in event.data:
+                perm_lookup.async_invalidate(event.data["old_entity_id"])
+
+        @callback
+        def device_updated(event: Event) -> None:
+            """Invalidate the permissions of the entities of a device."""
+            for entry in async_entries_for_device(
+                perm_lookup.entity_registry, event.data["device_id"]
+            ):
+                perm_lookup.async_invalidate(entry.entity_id)
+
+        @callback
+        def area_updated(event: Event) -> None:
+            """Invalidate the permissions of all entities."""
+            perm_lookup.async_invalidate()
+
+        self.hass.bus.async_listen(EVENT_ENTITY_REGISTRY_UPDATED, entity_updated)
+        self.hass.bus.async_listen(EVENT_DEVICE_REGISTRY_UPDATED, device_updated)
+        self.hass.bus.async_listen(EVENT_AREA_REGISTRY_UPDATED, area_updated)
+
     @callback
     def _async_schedule_save(self) -> None:
         """Save users."""
@@ -568,6 +620,11 @@ class AuthStore:
         self._groups = groups
 
 
+def _token_digest(token: str) -> str:
+    """Return the digest of a token used to index it."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def _system_admin_group() -> models.Group:
     """Create system admin group."""
     return models.Group(
@@ -7,3 +7,7 @@ MFA_SESSION_EXPIRATION = timedelta(minutes=5)
 GROUP_ID_ADMIN = "system-admin"
 GROUP_ID_USER = "system-users"
 GROUP_ID_READ_ONLY = "system-read-only"
+
+# Access tokens that were verified are trusted for this long
+ACCESS_TOKEN_CACHE_TTL = timedelta(minutes=1)
+ACCESS_TOKEN_CACHE_SIZE = 1024
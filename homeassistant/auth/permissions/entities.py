@@ -1,6 +1,6 @@
 """Entity permissions."""
 from collections import OrderedDict
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Set
 
 import voluptuous as vol
 
@@ -84,6 +84,54 @@ def _lookup_entity_id(
     return entities_dict.get(entity_id)
 
 
+class EntityPermissionTable:
+    """Outcome of a compiled policy, materialized per entity and key.
+
+    The first check of an entity adds it to the allow or the deny set of
+    the key, so later checks are a set lookup. Tables of policies that
+    look up devices or areas are invalidated through the permission lookup
+    when the registries change.
+    """
+
+    __slots__ = ("_check", "_allowed", "_denied", "__weakref__")
+
+    def __init__(self, check: Callable[[str, str], bool]) -> None:
+        """Initialize the table."""
+        self._check = check
+        self._allowed: Dict[str, Set[str]] = {}
+        self._denied: Dict[str, Set[str]] = {}
+
+    def __call__(self, entity_id: str, key: str) -> bool:
+        """Test if the policy allows access to an entity."""
+        allowed = self._allowed.get(key)
+
+        if allowed is None:
+            allowed = self._allowed[key] = set()
+            denied = self._denied[key] = set()
+        elif entity_id in allowed:
+            return True
+        else:
+            denied = self._denied[key]
+            if entity_id in denied:
+                return False
+
+        result = self._check(entity_id, key)
+        (allowed if result else denied).add(entity_id)
+        return result
+
+    def invalidate(self, entity_id: Optional[str] = None) -> None:
+        """Forget the outcome for an entity, or all entities if None."""
+        if entity_id is None:
+            self._allowed.clear()
+            self._denied.clear()
+            return
+
+        for entities in self._allowed.values():
+            entities.discard(entity_id)
+        for entities in self._denied.values():
+            entities.discard(entity_id)
+
+
 def compile_entities(
     policy: CategoryType, perm_lookup: PermissionLookup
 ) -> Callable[[str, str], bool]:
@@ -95,4 +143,15 @@ def compile_entities(
     subcategories[ENTITY_DOMAINS] = _lookup_domain
     subcategories[SUBCAT_ALL] = lookup_all
 
-    return compile_policy(policy, subcategories, perm_lookup)
+    check = compile_policy(policy, subcategories, perm_lookup)
+
+    # Policies that allow or deny everything don't need a table
+    if not isinstance(policy, dict):
+        return check
+
+    table = EntityPermissionTable(check)
+    if perm_lookup is not None and (
+        ENTITY_DEVICE_IDS in policy or ENTITY_AREAS in policy
+    ):
+        perm_lookup.tables.add(table)
+    return table
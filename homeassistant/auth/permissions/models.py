@@ -1,5 +1,6 @@
 """Models for permissions."""
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+import weakref
 
 import attr
 
@@ -8,6 +9,8 @@ if TYPE_CHECKING:
     from homeassistant.helpers import entity_registry as ent_reg  # noqa: F401
     from homeassistant.helpers import device_registry as dev_reg  # noqa: F401
 
+    from .entities import EntityPermissionTable  # noqa: F401
+
 
 @attr.s(slots=True)
 class PermissionLookup:
@@ -15,3 +18,15 @@ class PermissionLookup:
 
     entity_registry = attr.ib(type="ent_reg.EntityRegistry")
     device_registry = attr.ib(type="dev_reg.DeviceRegistry")
+    # Tables of policies that depend on the registries
+    tables = attr.ib(
+        type="weakref.WeakSet[EntityPermissionTable]",
+        factory=weakref.WeakSet,
+        eq=False,
+        repr=False,
+    )
+
+    def async_invalidate(self, entity_id: Optional[str] = None) -> None:
+        """Forget the permissions of an entity, or all entities if None."""
+        for table in list(self.tables):
+            table.invalidate(entity_id)
@@ -20,6 +20,7 @@ from homeassistant.const import (
     REQUIRED_NEXT_PYTHON_VER,
 )
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_trace
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
@@ -74,11 +75,15 @@ async def async_setup_hass(
     log_no_color: bool,
     skip_pip: bool,
     safe_mode: bool,
+    trace_startup: bool = False,
 ) -> Optional[core.HomeAssistant]:
     """Set up Home Assistant."""
     hass = core.HomeAssistant()
     hass.config.config_dir = config_dir
 
+    if trace_startup:
+        startup_trace.async_enable(hass)
+
     async_enable_logging(hass, verbose, log_rotate_days, log_file, log_no_color)
 
     hass.config.skip_pip = skip_pip
@@ -172,14 +177,15 @@ async def async_from_config_dict(
     # Set up core.
     _LOGGER.debug("Setting up %s", CORE_INTEGRATIONS)
 
-    if not all(
-        await asyncio.gather(
+    with startup_trace.async_span(hass, startup_trace.LANE_BOOTSTRAP, "core"):
+        core_setup = await asyncio.gather(
             *(
                 async_setup_component(hass, domain, config)
                 for domain in CORE_INTEGRATIONS
             )
         )
-    ):
+
+    if not all(core_setup):
         _LOGGER.error("Home Assistant core failed to initialize. ")
         return None
 
@@ -204,6 +210,8 @@ async def async_from_config_dict(
     stop = monotonic()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop - start)
 
+    await startup_trace.async_finish(hass)
+
     if REQUIRED_NEXT_PYTHON_DATE and sys.version_info[:3] < REQUIRED_NEXT_PYTHON_VER:
         msg = (
             "Support for the running Python version "
@@ -477,14 +485,30 @@ async def _async_set_up_integrations(
     # Start setup
     if stage_1_domains:
         _LOGGER.info("Setting up stage 1: %s", stage_1_domains)
-        await async_setup_multi_components(hass, stage_1_domains, config, setup_started)
+        with startup_trace.async_span(
+            hass,
+            startup_trace.LANE_BOOTSTRAP,
+            "stage 1",
+            domains=sorted(stage_1_domains),
+        ):
+            await async_setup_multi_components(
+                hass, stage_1_domains, config, setup_started
+            )
 
     # Enables after dependencies
     async_set_domains_to_be_loaded(hass, stage_1_domains | stage_2_domains)
 
     if stage_2_domains:
         _LOGGER.info("Setting up stage 2: %s", stage_2_domains)
-        await async_setup_multi_components(hass, stage_2_domains, config, setup_started)
+        with startup_trace.async_span(
+            hass,
+            startup_trace.LANE_BOOTSTRAP,
+            "stage 2",
+            domains=sorted(stage_2_domains),
+        ):
+            await async_setup_multi_components(
+                hass, stage_2_domains, config, setup_started
+            )
 
     # Wrap up startup
     _LOGGER.debug("Waiting for startup to wrap up")
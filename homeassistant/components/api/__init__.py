@@ -64,6 +64,7 @@ def setup(hass, config):
     hass.http.register_view(APIEntityStateView)
     hass.http.register_view(APIEventListenersView)
     hass.http.register_view(APIEventView)
+    hass.http.register_view(APIEventMetricsView)
     hass.http.register_view(APIServicesView)
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIComponentsView)
@@ -340,6 +341,46 @@ class APIEventView(HomeAssistantView):
         return self.json_message(f"Event {event_type} fired.")
 
 
+class APIEventMetricsView(HomeAssistantView):
+    """View to handle event dispatch metrics requests."""
+
+    url = "/api/event_metrics"
+    name = "api:event-metrics"
+
+    @ha.callback
+    def get(self, request):
+        """Get event dispatch metrics."""
+        if not request["hass_user"].is_admin:
+            raise Unauthorized()
+        hass = request.app["hass"]
+        return self.json(
+            {
+                "enabled": hass.bus.metrics_enabled,
+                "events": async_event_metrics_json(hass),
+            }
+        )
+
+    async def post(self, request):
+        """Enable or disable event dispatch metrics."""
+        if not request["hass_user"].is_admin:
+            raise Unauthorized()
+        try:
+            data = await request.json()
+        except ValueError:
+            return self.json_message("Invalid JSON specified.", HTTP_BAD_REQUEST)
+
+        enabled = data.get("enabled") if isinstance(data, dict) else None
+
+        if not isinstance(enabled, bool):
+            return self.json_message("No enabled flag specified.", HTTP_BAD_REQUEST)
+
+        request.app["hass"].bus.async_set_metrics_enabled(enabled)
+
+        if enabled:
+            return self.json_message("Event metrics enabled.")
+        return self.json_message("Event metrics disabled.")
+
+
 class APIServicesView(HomeAssistantView):
     """View to handle Services requests."""
 
@@ -439,3 +480,9 @@ def async_events_json(hass):
         {"event": key, "listener_count": value}
         for key, value in hass.bus.async_listeners().items()
     ]
+
+
+@ha.callback
+def async_event_metrics_json(hass):
+    """Generate event dispatch metrics to JSONify."""
+    return [{"event": key, **value} for key, value in hass.bus.async_metrics().items()]
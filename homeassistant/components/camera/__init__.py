@@ -51,6 +51,7 @@ from homeassistant.helpers.network import get_url
 from homeassistant.loader import bind_hass
 
 from .const import DATA_CAMERA_PREFS, DOMAIN
+from .frame_cache import FrameCache, FrameFanout, frame_hash
 from .prefs import CameraPreferences
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -84,6 +85,7 @@ TOKEN_CHANGE_INTERVAL = timedelta(minutes=5)
 _RND = SystemRandom()
 
 MIN_STREAM_INTERVAL = 0.5  # seconds
+MAX_FRAME_CACHE_TTL = 60  # seconds
 
 CAMERA_SERVICE_SCHEMA = vol.Schema({vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids})
 
@@ -153,7 +155,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.async_cached_camera_image()
 
             if image:
                 return Image(camera.content_type, image)
@@ -182,6 +184,28 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
 
     This method must be run in the event loop.
     """
+
+    async def distinct_images():
+        """Fetch images at the interval and yield the ones that changed."""
+        last_hash = None
+
+        while True:
+            img_bytes = await image_cb()
+            if not img_bytes:
+                return
+
+            img_hash = frame_hash(img_bytes)
+            if img_hash != last_hash:
+                last_hash = img_hash
+                yield img_bytes
+
+            await asyncio.sleep(interval)
+
+    return await _async_write_still_stream(request, distinct_images(), content_type)
+
+
+async def _async_write_still_stream(request, images, content_type):
+    """Write images to an HTTP MJPEG stream until there are no more."""
     response = web.StreamResponse()
     response.content_type = "multipart/x-mixed-replace; boundary=--frameboundary"
     await response.prepare(request)
@@ -199,23 +223,19 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
             + b"\r\n"
         )
 
-    last_image = None
+    first = True
 
-    while True:
-        img_bytes = await image_cb()
-        if not img_bytes:
-            break
-
-        if img_bytes != last_image:
+    try:
+        async for img_bytes in images:
             await write_to_mjpeg_stream(img_bytes)
 
             # Chrome seems to always ignore first picture,
             # print it twice.
-            if last_image is None:
+            if first:
                 await write_to_mjpeg_stream(img_bytes)
-            last_image = img_bytes
-
-        await asyncio.sleep(interval)
+                first = False
+    finally:
+        await images.aclose()
 
     return response
 
@@ -331,6 +351,8 @@ class Camera(Entity):
         self.content_type = DEFAULT_CONTENT_TYPE
         self.access_tokens: collections.deque = collections.deque([], 2)
         self.async_update_token()
+        self._frame_cache = None
+        self._still_streams = {}
 
     @property
     def should_poll(self):
@@ -384,10 +406,36 @@ class Camera(Entity):
         """Return bytes of camera image."""
         return await self.hass.async_add_executor_job(self.camera_image)
 
+    async def async_cached_camera_image(self):
+        """Return bytes of camera image, shared by concurrent requests.
+
+        An image fetched less than the frame_cache_ttl preference ago is
+        reused, and requests for a new image while one is being fetched
+        wait for that fetch.
+        """
+        if self._frame_cache is None:
+            self._frame_cache = FrameCache(self.hass, lambda: self.async_camera_image())
+
+        prefs = self.hass.data.get(DATA_CAMERA_PREFS)
+        ttl = prefs.get(self.entity_id).frame_cache_ttl if prefs else 0
+        return await self._frame_cache.async_get(ttl)
+
     async def handle_async_still_stream(self, request, interval):
-        """Generate an HTTP MJPEG stream from camera images."""
-        return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
+        """Generate an HTTP MJPEG stream from camera images.
+
+        All clients streaming at the same interval share one fetch loop.
+        """
+        fanout = self._still_streams.get(interval)
+        if fanout is None:
+            fanout = self._still_streams[interval] = FrameFanout(
+                self.hass,
+                self.async_cached_camera_image,
+                interval,
+                lambda: self._still_streams.pop(interval, None),
+            )
+
+        return await _async_write_still_stream(
+            request, fanout.async_frames(), self.content_type
         )
 
     async def handle_async_mjpeg_stream(self, request):
@@ -513,7 +561,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.async_cached_camera_image()
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -628,6 +676,9 @@ async def websocket_get_prefs(hass, connection, msg):
         vol.Required("type"): "camera/update_prefs",
         vol.Required("entity_id"): cv.entity_id,
         vol.Optional("preload_stream"): bool,
+        vol.Optional("frame_cache_ttl"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_FRAME_CACHE_TTL)
+        ),
     }
 )
 async def websocket_update_prefs(hass, connection, msg):
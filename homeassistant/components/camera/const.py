@@ -4,3 +4,4 @@ DOMAIN = "camera"
 DATA_CAMERA_PREFS = "camera_prefs"
 
 PREF_PRELOAD_STREAM = "preload_stream"
+PREF_FRAME_CACHE_TTL = "frame_cache_ttl"
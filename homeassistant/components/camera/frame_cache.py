@@ -0,0 +1,145 @@
+"""Share camera frames between the clients viewing a camera."""
+import asyncio
+import hashlib
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Optional, Set
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+FrameFetcher = Callable[[], Awaitable[Optional[bytes]]]
+
+
+def frame_hash(frame: bytes) -> bytes:
+    """Return a digest to compare frames without comparing their bytes."""
+    return hashlib.blake2b(frame, digest_size=16).digest()
+
+
+class FrameCache:
+    """Latest frame of a camera.
+
+    A frame younger than the TTL is returned without fetching a new one.
+    Concurrent requests for a new frame share a single fetch, which keeps
+    running when the requests that started it are cancelled.
+    """
+
+    def __init__(self, hass: HomeAssistant, fetch: FrameFetcher) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._fetch = fetch
+        self.frame: Optional[bytes] = None
+        self.fetched_at: Optional[float] = None
+        self._pending: Optional[asyncio.Future] = None
+
+    async def async_get(self, ttl: float = 0) -> Optional[bytes]:
+        """Return a frame that is at most ttl seconds old."""
+        if (
+            self.frame is not None
+            and self.fetched_at is not None
+            and self.hass.loop.time() - self.fetched_at < ttl
+        ):
+            return self.frame
+
+        if self._pending is None:
+            self._pending = self.hass.async_create_task(self._async_fetch())
+
+        return await asyncio.shield(self._pending)
+
+    async def _async_fetch(self) -> Optional[bytes]:
+        """Fetch a new frame."""
+        try:
+            frame = await self._fetch()
+        finally:
+            self._pending = None
+
+        self.frame = frame
+        self.fetched_at = self.hass.loop.time()
+        return frame
+
+
+class FrameFanout:
+    """Frames of a camera fetched at an interval for all subscribers.
+
+    A single producer fetches the frames while there are subscribers and
+    only passes on frames that differ from the previous one. Subscribers
+    that can't keep up skip to the latest frame.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fetch: FrameFetcher,
+        interval: float,
+        on_idle: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Initialize the fan-out."""
+        self.hass = hass
+        self._fetch = fetch
+        self._interval = interval
+        self._on_idle = on_idle
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._producer: Optional[asyncio.Future] = None
+        self._last_frame: Optional[bytes] = None
+
+    @property
+    def subscribers(self) -> int:
+        """Return the number of subscribers."""
+        return len(self._subscribers)
+
+    async def async_frames(self) -> AsyncIterator[bytes]:
+        """Iterate over the frames until the camera stops returning them."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+
+        if self._last_frame is not None:
+            queue.put_nowait(self._last_frame)
+        if self._producer is None:
+            self._producer = self.hass.loop.create_task(self._async_produce())
+
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._subscribers.discard(queue)
+
+    async def _async_produce(self) -> None:
+        """Fetch frames while there are subscribers."""
+        last_hash = None
+
+        try:
+            while self._subscribers:
+                frame = await self._fetch()
+                if not frame:
+                    break
+
+                if frame is not self._last_frame:
+                    digest = frame_hash(frame)
+                    if digest != last_hash:
+                        last_hash = digest
+                        self._last_frame = frame
+                        self._publish(frame)
+
+                await asyncio.sleep(self._interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error fetching frame")
+        finally:
+            self._producer = None
+            self._last_frame = None
+            # End the streams of the remaining subscribers
+            self._publish(None)
+            if self._on_idle is not None:
+                self._on_idle()
+
+    @callback
+    def _publish(self, frame: Optional[bytes]) -> None:
+        """Pass a frame to the subscribers, replacing frames not read yet."""
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frame)
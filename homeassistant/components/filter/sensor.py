@@ -5,7 +5,6 @@ from datetime import timedelta
 from functools import partial
 import logging
 from numbers import Number
-import statistics
 from typing import Optional
 
 import voluptuous as vol
@@ -27,6 +26,11 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change
 from homeassistant.util.decorator import Registry
 import homeassistant.util.dt as dt_util
+from homeassistant.util.sliding_window import (
+    ExponentialMovingState,
+    SlidingMedian,
+    TimeWeightedSum,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -472,15 +476,24 @@ class OutlierFilter(Filter):
         self._radius = radius
         self._stats_internal = Counter()
         self._store_raw = True
+        # Median of the raw states in the window, keyed by their position
+        self._median = SlidingMedian()
+        self._count = 0
 
     def _filter_state(self, new_state):
         """Implement the outlier filter."""
 
-        median = statistics.median([s.state for s in self.states]) if self.states else 0
-        if (
-            len(self.states) == self.states.maxlen
-            and abs(new_state.state - median) > self._radius
-        ):
+        median = self._median.median if self.states else 0
+        window_full = len(self.states) == self.states.maxlen
+
+        # Follow the window, which receives the raw state after filtering
+        if self.states.maxlen:
+            if window_full:
+                self._median.remove(self._count - self.states.maxlen)
+            self._median.add(new_state.state, self._count)
+            self._count += 1
+
+        if window_full and abs(new_state.state - median) > self._radius:
 
             self._stats_internal["erasures"] += 1
 
@@ -502,19 +515,11 @@ class LowPassFilter(Filter):
         """Initialize Filter."""
         super().__init__(FILTER_NAME_LOWPASS, window_size, precision, entity)
         self._time_constant = time_constant
+        self._moving_state = ExponentialMovingState(1.0 / time_constant)
 
     def _filter_state(self, new_state):
         """Implement the low pass filter."""
-
-        if not self.states:
-            return new_state
-
-        new_weight = 1.0 / self._time_constant
-        prev_weight = 1.0 - new_weight
-        new_state.state = (
-            prev_weight * self.states[-1].state + new_weight * new_state.state
-        )
-
+        new_state.state = self._moving_state.update(new_state.state)
         return new_state
 
 
@@ -534,14 +539,15 @@ class TimeSMAFilter(Filter):
         """
         super().__init__(FILTER_NAME_TIME_SMA, window_size, precision, entity)
         self._time_window = window_size
+        # Timestamp and value of the last state that left the window
         self.last_leak = None
-        self.queue = deque()
+        self.queue = TimeWeightedSum()
 
     def _leak(self, left_boundary):
         """Remove timeouted elements."""
         while self.queue:
-            if self.queue[0].timestamp + self._time_window <= left_boundary:
-                self.last_leak = self.queue.popleft()
+            if self.queue.oldest[0] + self._time_window <= left_boundary:
+                self.last_leak = self.queue.pop_oldest()
             else:
                 return
 
@@ -549,15 +555,15 @@ class TimeSMAFilter(Filter):
         """Implement the Simple Moving Average filter."""
 
         self._leak(new_state.timestamp)
-        self.queue.append(copy(new_state))
+        self.queue.add(new_state.timestamp, new_state.state)
 
-        moving_sum = 0
+        # The state before the oldest one in the window covers its start
         start = new_state.timestamp - self._time_window
-        prev_state = self.last_leak or self.queue[0]
-        for state in self.queue:
-            moving_sum += (state.timestamp - start).total_seconds() * prev_state.state
-            start = state.timestamp
-            prev_state = state
+        oldest_timestamp, oldest_value = self.queue.oldest
+        prev_value = self.last_leak[1] if self.last_leak else oldest_value
+        moving_sum = (
+            oldest_timestamp - start
+        ).total_seconds() * prev_value + self.queue.total
 
         new_state.state = moving_sum / self._time_window.total_seconds()
 
@@ -1,14 +1,13 @@
 """Provide pre-made queries on top of the recorder component."""
 from collections import defaultdict
 from datetime import timedelta
-from itertools import groupby
+from itertools import chain, groupby
 import json
 import logging
 import time
 from typing import Optional, cast
 
 from aiohttp import web
-from sqlalchemy import and_, func
 import voluptuous as vol
 
 from homeassistant.components import recorder
@@ -18,6 +17,12 @@ from homeassistant.components.recorder.models import (
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.snapshot import states_at_time_ids
+from homeassistant.components.recorder.statistics import (
+    PERIOD_HOURLY,
+    PERIODS,
+    statistics_during_period,
+)
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.const import (
     CONF_DOMAINS,
@@ -30,6 +35,13 @@ from homeassistant.core import Context, State, split_entity_id
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.dt as dt_util
 
+from .columnar import (
+    DOWNSAMPLE_LTTB,
+    DOWNSAMPLE_MEAN,
+    TIMESTAMP_PRECISION,
+    series_factory,
+)
+
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
 _LOGGER = logging.getLogger(__name__)
@@ -79,6 +91,13 @@ NEED_ATTRIBUTE_DOMAINS = {
 SCRIPT_DOMAIN = "script"
 ATTR_CAN_CANCEL = "can_cancel"
 
+QUERY_COLUMNAR_STATES = [States.entity_id, States.state, States.last_updated]
+COLUMNAR_YIELD_PER = 1000
+STREAM_YIELD_PER = 1000
+
+FORMAT_COLUMNAR = "columnar"
+MAX_BUCKETS = 10000
+
 QUERY_STATES = [
     States.domain,
     States.entity_id,
@@ -116,8 +135,46 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
+    query = _significant_states_query(
+        session,
+        QUERY_STATES,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+
+    states = execute(query)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def _significant_states_query(
+    session,
+    columns,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return a query for the significant states sorted by entity and time."""
     if significant_changes_only:
-        query = session.query(*QUERY_STATES).filter(
+        query = session.query(*columns).filter(
             (
                 States.domain.in_(SIGNIFICANT_DOMAINS)
                 | (States.last_changed == States.last_updated)
@@ -125,7 +182,7 @@ def _get_significant_states(
             & (States.last_updated > start_time)
         )
     else:
-        query = session.query(*QUERY_STATES).filter(States.last_updated > start_time)
+        query = session.query(*columns).filter(States.last_updated > start_time)
 
     if filters:
         query = filters.apply(query, entity_ids)
@@ -133,25 +190,88 @@ def _get_significant_states(
     if end_time is not None:
         query = query.filter(States.last_updated < end_time)
 
-    query = query.order_by(States.entity_id, States.last_updated)
+    return query.order_by(States.entity_id, States.last_updated)
 
-    states = execute(query)
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
+def _get_columnar_states(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    buckets=None,
+    downsample=DOWNSAMPLE_MEAN,
+):
+    """
+    Return the numeric states during UTC period start_time - end_time as columns.
 
-    return _sorted_states_to_json(
-        hass,
+    Only the entity_id, state and last_updated columns are loaded and rows
+    are streamed from the database. Without buckets every point is returned,
+    with buckets the points of each entity are downsampled while they are
+    read so only the downsampled series are held in memory.
+    """
+    timer_start = time.perf_counter()
+
+    if end_time is None:
+        end_time = dt_util.utcnow()
+
+    new_series = series_factory(
+        start_time.timestamp(), end_time.timestamp(), buckets, downsample
+    )
+    result = {}
+    # Set all entity IDs in result set to maintain the order
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            result[ent_id] = new_series()
+
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        start_timestamp = start_time.timestamp()
+        for state in _get_states_with_session(
+            session, start_time, entity_ids, run=run, filters=filters
+        ):
+            series = result.get(state.entity_id)
+            if series is None:
+                series = result[state.entity_id] = new_series()
+            series.add(start_timestamp, state.state)
+
+    query = _significant_states_query(
         session,
-        states,
+        QUERY_COLUMNAR_STATES,
         start_time,
+        end_time,
         entity_ids,
         filters,
-        include_start_time_state,
-        minimal_response,
+        significant_changes_only,
     )
 
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp = process_timestamp
+
+    for ent_id, group in groupby(
+        query.yield_per(COLUMNAR_YIELD_PER), lambda row: row.entity_id
+    ):
+        series = result.get(ent_id)
+        if series is None:
+            series = result[ent_id] = new_series()
+        add = series.add
+        for row in group:
+            add(_process_timestamp(row.last_updated).timestamp(), row.state)
+
+    for series in result.values():
+        series.finish()
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_columnar_states took %fs", elapsed)
+
+    # Filter out the series without any numeric states
+    return [series.as_dict(ent_id) for ent_id, series in result.items() if series]
+
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
@@ -246,37 +366,13 @@ def _get_states_with_session(
             return []
 
     # We have more than one entity to look at (most commonly we want
-    # all entities,) so we need to do a search on all states since the
-    # last recorder run started.
-
-    most_recent_states_by_date = session.query(
-        States.entity_id.label("max_entity_id"),
-        func.max(States.last_updated).label("max_last_updated"),
-    ).filter(
-        (States.last_updated >= run.start) & (States.last_updated < utc_point_in_time)
+    # all entities,) so we need the latest state of each entity since the
+    # last recorder run started. The recorder keeps snapshots of these so
+    # only the states after the latest snapshot need to be searched.
+    most_recent_state_ids = states_at_time_ids(
+        session, run.start, utc_point_in_time, entity_ids
     )
 
-    if entity_ids:
-        most_recent_states_by_date.filter(States.entity_id.in_(entity_ids))
-
-    most_recent_states_by_date = most_recent_states_by_date.group_by(States.entity_id)
-
-    most_recent_states_by_date = most_recent_states_by_date.subquery()
-
-    most_recent_state_ids = session.query(
-        func.max(States.state_id).label("max_state_id")
-    ).join(
-        most_recent_states_by_date,
-        and_(
-            States.entity_id == most_recent_states_by_date.c.max_entity_id,
-            States.last_updated == most_recent_states_by_date.c.max_last_updated,
-        ),
-    )
-
-    most_recent_state_ids = most_recent_state_ids.group_by(States.entity_id)
-
-    most_recent_state_ids = most_recent_state_ids.subquery()
-
     query = query.join(
         most_recent_state_ids, States.state_id == most_recent_state_ids.c.max_state_id,
     ).filter(~States.domain.in_(IGNORE_DOMAINS))
@@ -386,6 +482,128 @@ def _sorted_states_to_json(
     return {key: val for key, val in result.items() if val}
 
 
+def _stream_significant_states(
+    hass,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """Yield the significant states of each entity while reading them.
+
+    Like _get_significant_states, but the rows are read in batches and
+    every entity is yielded as an iterator of its states, so only one batch
+    of rows is held in memory. Entities are ordered like entity_ids when
+    given and by entity_id otherwise.
+    """
+    with session_scope(hass=hass) as session:
+        start_states = {}
+        if include_start_time_state:
+            run = recorder.run_information_from_instance(hass, start_time)
+            for state in _get_states_with_session(
+                session, start_time, entity_ids, run=run, filters=filters
+            ):
+                state.last_changed = start_time
+                state.last_updated = start_time
+                start_states[state.entity_id] = state
+
+        def query_rows(query_entity_ids):
+            """Yield the significant state rows of entities in batches."""
+            yield from _significant_states_query(
+                session,
+                QUERY_STATES,
+                start_time,
+                end_time,
+                query_entity_ids,
+                filters,
+                significant_changes_only,
+            ).yield_per(STREAM_YIELD_PER)
+
+        if entity_ids is not None:
+            entity_rows = (
+                (ent_id, start_states.get(ent_id), query_rows([ent_id]))
+                for ent_id in dict.fromkeys(entity_ids)
+            )
+        else:
+            entity_rows = _merge_start_states(
+                start_states, groupby(query_rows(None), lambda row: row.entity_id),
+            )
+
+        for ent_id, start_state, rows in entity_rows:
+            states = _entity_states(ent_id, start_state, rows, minimal_response)
+            first = next(states, None)
+            # Leave out the entities without any states
+            if first is not None:
+                yield chain((first,), states)
+
+
+def _merge_start_states(start_states, entity_rows):
+    """Merge the start states into rows grouped by sorted entity_id."""
+    pending = sorted(start_states)
+    index = 0
+    for ent_id, rows in entity_rows:
+        while index < len(pending) and pending[index] < ent_id:
+            yield pending[index], start_states[pending[index]], ()
+            index += 1
+        if index < len(pending) and pending[index] == ent_id:
+            index += 1
+        yield ent_id, start_states.get(ent_id), rows
+
+    for ent_id in pending[index:]:
+        yield ent_id, start_states[ent_id], ()
+
+
+def _entity_states(ent_id, start_state, rows, minimal_response):
+    """Yield the states of an entity like _sorted_states_to_json does."""
+    domain = split_entity_id(ent_id)[0]
+
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        if start_state is not None:
+            yield start_state
+        for row in rows:
+            native_state = LazyState(row)
+            if domain != SCRIPT_DOMAIN or native_state.attributes.get(ATTR_CAN_CANCEL):
+                yield native_state
+        return
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    rows = iter(rows)
+    if start_state is None:
+        row = next(rows, None)
+        if row is None:
+            return
+        start_state = LazyState(row)
+    yield start_state
+
+    prev_state = start_state.state
+    # The last state change is held back as it is sent as a full state
+    last_row = None
+    for row in rows:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if row.state == prev_state:
+            continue
+
+        if last_row is not None:
+            yield {
+                STATE_KEY: last_row.state,
+                LAST_CHANGED_KEY: process_timestamp_to_utc_isoformat(
+                    last_row.last_changed
+                ),
+            }
+        last_row = row
+        prev_state = row.state
+
+    if last_row is not None:
+        yield LazyState(last_row)
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = list(get_states(hass, utc_point_in_time, (entity_id,), run))
@@ -407,6 +625,7 @@ async def async_setup(hass, config):
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.http.register_view(HistoryStatisticsView())
     hass.components.frontend.async_register_built_in_panel(
         "history", "history", "hass:poll-box"
     )
@@ -469,6 +688,49 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app["hass"]
 
+        if request.query.get("format") == FORMAT_COLUMNAR:
+            buckets = request.query.get("buckets")
+            if buckets is not None:
+                try:
+                    buckets = int(buckets)
+                except ValueError:
+                    buckets = 0
+                if not 0 < buckets <= MAX_BUCKETS:
+                    return self.json_message("Invalid buckets", HTTP_BAD_REQUEST)
+
+            downsample = request.query.get("downsample", DOWNSAMPLE_MEAN)
+            if downsample not in (DOWNSAMPLE_MEAN, DOWNSAMPLE_LTTB):
+                return self.json_message("Invalid downsample", HTTP_BAD_REQUEST)
+
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._columnar_states_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    buckets,
+                    downsample,
+                ),
+            )
+
+        if not self.use_include_order:
+            return await self.json_stream(
+                request,
+                _stream_significant_states,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -517,18 +779,121 @@ class HistoryPeriodView(HomeAssistantView):
         # Optionally reorder the result to respect the ordering given
         # by any entities explicitly included in the configuration.
         if self.use_include_order:
-            sorted_result = []
-            for order_entity in self.filters.included_entities:
-                for state_list in result:
-                    if state_list[0].entity_id == order_entity:
-                        sorted_result.append(state_list)
-                        result.remove(state_list)
-                        break
-            sorted_result.extend(result)
-            result = sorted_result
+            result = self._include_ordered(
+                result, lambda state_list: state_list[0].entity_id
+            )
 
         return self.json(result)
 
+    def _columnar_states_json(
+        self,
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        buckets,
+        downsample,
+    ):
+        """Fetch significant numeric states from the database as columnar json."""
+        timer_start = time.perf_counter()
+
+        with session_scope(hass=hass) as session:
+            result = _get_columnar_states(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                buckets,
+                downsample,
+            )
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Extracted %d series in %fs", len(result), elapsed)
+
+        if self.use_include_order:
+            result = self._include_ordered(result, lambda series: series["entity_id"])
+
+        return self.json(result)
+
+    def _include_ordered(self, result, get_entity_id):
+        """Reorder the result by the entities included in the configuration."""
+        sorted_result = []
+        for order_entity in self.filters.included_entities:
+            for item in result:
+                if get_entity_id(item) == order_entity:
+                    sorted_result.append(item)
+                    result.remove(item)
+                    break
+        sorted_result.extend(result)
+        return sorted_result
+
+
+class HistoryStatisticsView(HomeAssistantView):
+    """Handle long-term statistics requests."""
+
+    url = "/api/history/statistics"
+    name = "api:history:view-statistics"
+    extra_urls = ["/api/history/statistics/{datetime}"]
+
+    async def get(
+        self, request: web.Request, datetime: Optional[str] = None
+    ) -> web.Response:
+        """Return the statistics of entities over a period of time."""
+        if datetime:
+            start_time = dt_util.parse_datetime(datetime)
+
+            if start_time is None:
+                return self.json_message("Invalid datetime", HTTP_BAD_REQUEST)
+
+            start_time = dt_util.as_utc(start_time)
+        else:
+            start_time = dt_util.utcnow() - timedelta(days=1)
+
+        end_time = request.query.get("end_time")
+        if end_time:
+            end_time = dt_util.parse_datetime(end_time)
+            if end_time is None:
+                return self.json_message("Invalid end_time", HTTP_BAD_REQUEST)
+            end_time = dt_util.as_utc(end_time)
+
+        period = request.query.get("period", PERIOD_HOURLY)
+        if period not in PERIODS:
+            return self.json_message("Invalid period", HTTP_BAD_REQUEST)
+
+        entity_ids = request.query.get("filter_entity_id")
+        if entity_ids:
+            entity_ids = entity_ids.lower().split(",")
+
+        hass = request.app["hass"]
+
+        statistics = await hass.async_add_executor_job(
+            statistics_during_period, hass, start_time, end_time, entity_ids, period
+        )
+
+        return self.json(
+            [
+                {
+                    "entity_id": entity_id,
+                    "timestamps": [
+                        round(row["start"].timestamp(), TIMESTAMP_PRECISION)
+                        for row in rows
+                    ],
+                    "min": [row["min"] for row in rows],
+                    "max": [row["max"] for row in rows],
+                    "mean": [row["mean"] for row in rows],
+                    "last": [row["last"] for row in rows],
+                }
+                for entity_id, rows in statistics.items()
+            ]
+        )
+
 
 class Filters:
     """Container for the configured include and exclude filters."""
@@ -0,0 +1,267 @@
+"""Columnar and downsampled series for the history API.
+
+A series collects the numeric states of a single entity as parallel
+arrays of timestamps (seconds since the epoch) and values. The
+downsampling series only keep a bounded amount of data so their
+memory use depends on the number of buckets, not on the number of rows.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+DOWNSAMPLE_MEAN = "mean"
+DOWNSAMPLE_LTTB = "lttb"
+
+ATTR_ENTITY_ID = "entity_id"
+ATTR_TIMESTAMPS = "timestamps"
+ATTR_VALUES = "values"
+ATTR_MIN = "min"
+ATTR_MAX = "max"
+ATTR_MEAN = "mean"
+
+TIMESTAMP_PRECISION = 3
+
+
+def state_to_float(state: Optional[str]) -> Optional[float]:
+    """Return the state as a finite float or None if it is not numeric."""
+    try:
+        value = float(state)  # type: ignore
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(value):
+        return None
+    return value
+
+
+class ColumnarSeries:
+    """All points of an entity as columns.
+
+    States that are not numeric are kept as None so graphs can show gaps.
+    """
+
+    __slots__ = ("timestamps", "values", "_numeric")
+
+    def __init__(self) -> None:
+        """Initialize the series."""
+        self.timestamps: List[float] = []
+        self.values: List[Optional[float]] = []
+        self._numeric = False
+
+    def add(self, timestamp: float, state: Optional[str]) -> None:
+        """Add a state to the series."""
+        value = state_to_float(state)
+        if value is not None:
+            self._numeric = True
+        self.timestamps.append(round(timestamp, TIMESTAMP_PRECISION))
+        self.values.append(value)
+
+    def finish(self) -> None:
+        """Finish the series."""
+
+    def __bool__(self) -> bool:
+        """Return if the series has any numeric points."""
+        return self._numeric
+
+    def as_dict(self, entity_id: str) -> Dict[str, Any]:
+        """Return the series as a JSON friendly dict."""
+        return {
+            ATTR_ENTITY_ID: entity_id,
+            ATTR_TIMESTAMPS: self.timestamps,
+            ATTR_VALUES: self.values,
+        }
+
+
+class _BucketedSeries:
+    """Base class for series that group points in equal time buckets."""
+
+    __slots__ = ("_start", "_width", "_last_bucket")
+
+    def __init__(self, start: float, end: float, buckets: int) -> None:
+        """Initialize the series."""
+        self._start = start
+        self._width = max(end - start, 0) / buckets or 1
+        self._last_bucket = buckets - 1
+
+    def _bucket(self, timestamp: float) -> int:
+        """Return the bucket a timestamp falls in."""
+        bucket = int((timestamp - self._start) // self._width)
+        return min(max(bucket, 0), self._last_bucket)
+
+    def _bucket_start(self, bucket: int) -> float:
+        """Return the start timestamp of a bucket."""
+        return round(self._start + bucket * self._width, TIMESTAMP_PRECISION)
+
+
+class MeanSeries(_BucketedSeries):
+    """Min, max and mean of the numeric points in each time bucket.
+
+    The mean is the average of the samples, it is not time weighted.
+    Empty buckets are left out.
+    """
+
+    __slots__ = ("_buckets",)
+
+    def __init__(self, start: float, end: float, buckets: int) -> None:
+        """Initialize the series."""
+        super().__init__(start, end, buckets)
+        # bucket -> [min, max, sum, count]
+        self._buckets: Dict[int, List[float]] = {}
+
+    def add(self, timestamp: float, state: Optional[str]) -> None:
+        """Add a state to the series."""
+        value = state_to_float(state)
+        if value is None:
+            return
+
+        bucket = self._bucket(timestamp)
+        stats = self._buckets.get(bucket)
+        if stats is None:
+            self._buckets[bucket] = [value, value, value, 1]
+            return
+
+        if value < stats[0]:
+            stats[0] = value
+        elif value > stats[1]:
+            stats[1] = value
+        stats[2] += value
+        stats[3] += 1
+
+    def finish(self) -> None:
+        """Finish the series."""
+
+    def __bool__(self) -> bool:
+        """Return if the series has any points."""
+        return bool(self._buckets)
+
+    def as_dict(self, entity_id: str) -> Dict[str, Any]:
+        """Return the series as a JSON friendly dict."""
+        buckets = sorted(self._buckets)
+        return {
+            ATTR_ENTITY_ID: entity_id,
+            ATTR_TIMESTAMPS: [self._bucket_start(bucket) for bucket in buckets],
+            ATTR_MIN: [self._buckets[bucket][0] for bucket in buckets],
+            ATTR_MAX: [self._buckets[bucket][1] for bucket in buckets],
+            ATTR_MEAN: [
+                self._buckets[bucket][2] / self._buckets[bucket][3]
+                for bucket in buckets
+            ],
+        }
+
+
+class LttbSeries(_BucketedSeries):
+    """Largest-Triangle-Three-Buckets downsampling of the numeric points.
+
+    Buckets are equal time ranges instead of equal point counts, which
+    allows the points to be processed in a single pass while only holding
+    the points of two buckets at once. The first and last points are
+    always kept and at most one point is selected per bucket in between.
+    """
+
+    __slots__ = (
+        "timestamps",
+        "values",
+        "_current",
+        "_current_bucket",
+        "_next",
+        "_next_bucket",
+    )
+
+    def __init__(self, start: float, end: float, buckets: int) -> None:
+        """Initialize the series."""
+        super().__init__(start, end, buckets)
+        self.timestamps: List[float] = []
+        self.values: List[float] = []
+        self._current: List[Tuple[float, float]] = []
+        self._current_bucket = -1
+        self._next: List[Tuple[float, float]] = []
+        self._next_bucket = -1
+
+    def add(self, timestamp: float, state: Optional[str]) -> None:
+        """Add a state to the series."""
+        value = state_to_float(state)
+        if value is None:
+            return
+
+        point = (timestamp, value)
+
+        if not self.timestamps:
+            self._select(point)
+            return
+
+        bucket = self._bucket(timestamp)
+
+        if not self._current or bucket == self._current_bucket:
+            self._current.append(point)
+            self._current_bucket = bucket
+        elif not self._next or bucket == self._next_bucket:
+            self._next.append(point)
+            self._next_bucket = bucket
+        else:
+            self._select_best(self._current, _average(self._next))
+            self._current, self._current_bucket = self._next, self._next_bucket
+            self._next, self._next_bucket = [point], bucket
+
+    def finish(self) -> None:
+        """Select the points of the last buckets."""
+        if self._next:
+            self._select_best(self._current, _average(self._next))
+            self._current = self._next
+            self._next = []
+
+        if not self._current:
+            return
+
+        last = self._current[-1]
+        if len(self._current) > 1:
+            self._select_best(self._current[:-1], last)
+        self._select(last)
+        self._current = []
+
+    def _select(self, point: Tuple[float, float]) -> None:
+        """Add a point to the output."""
+        self.timestamps.append(round(point[0], TIMESTAMP_PRECISION))
+        self.values.append(point[1])
+
+    def _select_best(
+        self, points: List[Tuple[float, float]], after: Tuple[float, float]
+    ) -> None:
+        """Select the point forming the largest triangle with its neighbours."""
+        a_x = self.timestamps[-1]
+        a_y = self.values[-1]
+        c_x, c_y = after
+        best = max(
+            points,
+            key=lambda point: abs(
+                (a_x - c_x) * (point[1] - a_y) - (a_x - point[0]) * (c_y - a_y)
+            ),
+        )
+        self._select(best)
+
+    def __bool__(self) -> bool:
+        """Return if the series has any points."""
+        return bool(self.timestamps)
+
+    def as_dict(self, entity_id: str) -> Dict[str, Any]:
+        """Return the series as a JSON friendly dict."""
+        return {
+            ATTR_ENTITY_ID: entity_id,
+            ATTR_TIMESTAMPS: self.timestamps,
+            ATTR_VALUES: self.values,
+        }
+
+
+def _average(points: List[Tuple[float, float]]) -> Tuple[float, float]:
+    """Return the average point of a list of points."""
+    count = len(points)
+    return (
+        sum(point[0] for point in points) / count,
+        sum(point[1] for point in points) / count,
+    )
+
+
+def series_factory(start: float, end: float, buckets: Optional[int], downsample: str):
+    """Return a function creating an empty series for an entity."""
+    if not buckets:
+        return ColumnarSeries
+    if downsample == DOWNSAMPLE_LTTB:
+        return lambda: LttbSeries(start, end, buckets)
+    return lambda: MeanSeries(start, end, buckets)
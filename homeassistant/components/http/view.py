@@ -2,9 +2,11 @@
 import asyncio
 import json
 import logging
-from typing import Any, Callable, List, Optional
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from aiohttp.typedefs import LooseHeaders
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
@@ -22,6 +24,10 @@ from .const import KEY_AUTHENTICATED, KEY_HASS, KEY_REAL_IP
 
 _LOGGER = logging.getLogger(__name__)
 
+# Size of the chunks of a streamed response and how many can be waiting
+STREAM_CHUNK_SIZE = 65536
+STREAM_QUEUE_SIZE = 4
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -62,6 +68,87 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    async def json_stream(
+        self, request: web.Request, generate: Callable[..., Iterable], *args: Any
+    ) -> web.StreamResponse:
+        """Stream a JSON list whose items are generated in the executor.
+
+        generate is called with args in the executor. Items that are
+        iterators are streamed as nested lists. The items are encoded and sent
+        in chunks while they are generated, so the memory used does not grow
+        with the number of items.
+        """
+        hass = request.app[KEY_HASS]
+        chunks: asyncio.Queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+        stopped = threading.Event()
+
+        def put(chunk: Optional[bytes]) -> None:
+            """Hand a chunk to the event loop, waiting while the queue is full."""
+            asyncio.run_coroutine_threadsafe(chunks.put(chunk), hass.loop).result()
+
+        def produce() -> None:
+            """Encode the generated items in chunks."""
+            items = iter(generate(*args))
+            try:
+                buffer: List[bytes] = []
+                size = 0
+                for fragment in _encode_json_list(items):
+                    buffer.append(fragment)
+                    size += len(fragment)
+                    if size < STREAM_CHUNK_SIZE:
+                        continue
+                    if stopped.is_set():
+                        return
+                    put(b"".join(buffer))
+                    buffer = []
+                    size = 0
+                put(b"".join(buffer))
+            finally:
+                close = getattr(items, "close", None)
+                if close is not None:
+                    close()
+                put(None)
+
+        producer = hass.async_add_executor_job(produce)
+        chunk = await chunks.get()
+
+        if chunk is None:
+            # Generating failed before anything was sent, the producer
+            # always sends at least the brackets of the list otherwise.
+            try:
+                await producer
+            except (ValueError, TypeError) as err:
+                _LOGGER.error("Unable to serialize to JSON: %s", err)
+            raise HTTPInternalServerError
+
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        try:
+            await response.prepare(request)
+            while chunk is not None:
+                await response.write(chunk)
+                chunk = await chunks.get()
+        finally:
+            if chunk is not None:
+                # The client went away, stop generating and unblock the producer
+                stopped.set()
+                while not chunks.empty():
+                    chunks.get_nowait()
+
+        try:
+            await producer
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error streaming JSON response")
+            # Part of the list was sent already. Close the connection
+            # instead of ending the response so the client sees it is
+            # incomplete.
+            if request.transport is not None:
+                request.transport.close()
+            return response
+
+        await response.write_eof()
+        return response
+
     def json_message(
         self,
         message: str,
@@ -99,6 +186,24 @@ class HomeAssistantView:
             app["allow_cors"](route)
 
 
+def _encode_json_list(items: Iterable) -> Iterator[bytes]:
+    """Encode items as a JSON list, one fragment at a time."""
+    yield b"["
+    first = True
+    for item in items:
+        if first:
+            first = False
+        else:
+            yield b","
+        if isinstance(item, Iterator):
+            yield from _encode_json_list(item)
+        else:
+            yield json.dumps(
+                item, sort_keys=True, cls=JSONEncoder, allow_nan=False
+            ).encode("UTF-8")
+    yield b"]"
+
+
 def request_handler_factory(view: HomeAssistantView, handler: Callable) -> Callable:
     """Wrap the handler classes."""
     assert asyncio.iscoroutinefunction(handler) or is_callback(
@@ -1,10 +1,7 @@
 """Support for sending data to an Influx database."""
 import logging
 import math
-import queue
 import re
-import threading
-import time
 from typing import Dict
 
 from influxdb import InfluxDBClient, exceptions
@@ -27,7 +24,6 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_VERIFY_SSL,
     EVENT_HOMEASSISTANT_STOP,
-    EVENT_STATE_CHANGED,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
@@ -38,6 +34,16 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.exporter import (
+    CONF_BATCH_SIZE,
+    CONF_DROP_POLICY,
+    CONF_LINGER,
+    CONF_MAX_BACKLOG,
+    CONF_MAX_IN_FLIGHT,
+    EXPORTER_SCHEMA,
+    ExportError,
+    ExportPipeline,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,9 +73,6 @@ RETRY_DELAY = 20
 QUEUE_BACKLOG_SECONDS = 30
 RETRY_INTERVAL = 60  # seconds
 
-BATCH_TIMEOUT = 1
-BATCH_BUFFER_SIZE = 100
-
 DB_CONNECTION_FAILURE_MSG = ()
 
 
@@ -160,6 +163,7 @@ _CONFIG_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
         vol.Optional(CONF_COMPONENT_CONFIG_DOMAIN, default={}): vol.Schema(
             {cv.string: _CONFIG_SCHEMA_ENTRY}
         ),
+        **EXPORTER_SCHEMA,
     }
 )
 
@@ -280,11 +284,7 @@ def setup(hass, config):
     def event_to_json(event):
         """Add an event to the outgoing Influx list."""
         state = event.data.get("new_state")
-        if (
-            state is None
-            or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
-            or not entity_filter(state.entity_id)
-        ):
+        if state is None or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE):
             return
 
         try:
@@ -359,127 +359,48 @@ def setup(hass, config):
 
         return json
 
-    if use_v2_api:
-        instance = hass.data[DOMAIN] = InfluxThread(
-            hass, None, bucket, write_api, event_to_json, max_tries
-        )
-    else:
-        instance = hass.data[DOMAIN] = InfluxThread(
-            hass, influx, None, None, event_to_json, max_tries
-        )
-
-    instance.start()
-
-    def shutdown(event):
-        """Shut down the thread."""
-        instance.queue.put(None)
-        instance.join()
-        influx.close()
-
-    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
-
-    return True
-
-
-class InfluxThread(threading.Thread):
-    """A threaded event handler class."""
-
-    def __init__(self, hass, influx, bucket, write_api, event_to_json, max_tries):
-        """Initialize the listener."""
-        threading.Thread.__init__(self, name="InfluxDB")
-        self.queue = queue.Queue()
-        self.influx = influx
-        self.bucket = bucket
-        self.write_api = write_api
-        self.event_to_json = event_to_json
-        self.max_tries = max_tries
-        self.write_errors = 0
-        self.shutdown = False
-        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
-
-    def _event_listener(self, event):
-        """Listen for new messages on the bus and queue them for Influx."""
-        item = (time.monotonic(), event)
-        self.queue.put(item)
-
-    @staticmethod
-    def batch_timeout():
-        """Return number of seconds to wait for more events."""
-        return BATCH_TIMEOUT
-
-    def get_events_json(self):
-        """Return a batch of events formatted for writing."""
-        queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
-
-        count = 0
-        json = []
-
-        dropped = 0
+    def write_batch(json):
+        """Write preprocessed events to influxdb."""
+        if use_v2_api:
+            write_api.write(bucket=bucket, record=json)
+        else:
+            influx.write_points(json)
 
+    async def async_write_batch(json):
+        """Write preprocessed events to influxdb in the executor."""
         try:
-            while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
-                item = self.queue.get(timeout=timeout)
-                count += 1
-
-                if item is None:
-                    self.shutdown = True
-                else:
-                    timestamp, event = item
-                    age = time.monotonic() - timestamp
-
-                    if age < queue_seconds:
-                        event_json = self.event_to_json(event)
-                        if event_json:
-                            json.append(event_json)
-                    else:
-                        dropped += 1
-
-        except queue.Empty:
-            pass
+            await hass.async_add_executor_job(write_batch, json)
+        except (
+            exceptions.InfluxDBClientError,
+            exceptions.InfluxDBServerError,
+            OSError,
+            ApiException,
+        ) as err:
+            raise ExportError(err) from err
+
+    pipeline = hass.data[DOMAIN] = ExportPipeline(
+        hass,
+        _LOGGER,
+        DOMAIN,
+        lambda export_event: event_to_json(export_event.event),
+        async_write_batch,
+        entity_filter=entity_filter,
+        batch_size=conf[CONF_BATCH_SIZE],
+        linger=conf[CONF_LINGER],
+        max_in_flight=conf[CONF_MAX_IN_FLIGHT],
+        max_backlog=conf[CONF_MAX_BACKLOG],
+        drop_policy=conf[CONF_DROP_POLICY],
+        max_age=QUEUE_BACKLOG_SECONDS + max_tries * RETRY_DELAY,
+        max_retries=max_tries,
+        retry_delay=RETRY_DELAY,
+    )
+    hass.add_job(pipeline.async_start)
 
-        if dropped:
-            _LOGGER.warning("Catching up, dropped %d old events", dropped)
+    async def async_shutdown(event):
+        """Write the remaining events and close the connection."""
+        await pipeline.async_stop()
+        await hass.async_add_executor_job(influx.close)
 
-        return count, json
+    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, async_shutdown)
 
-    def write_to_influxdb(self, json):
-        """Write preprocessed events to influxdb, with retry."""
-        for retry in range(self.max_tries + 1):
-            try:
-                if self.write_api is not None:
-                    self.write_api.write(bucket=self.bucket, record=json)
-                else:
-                    self.influx.write_points(json)
-
-                if self.write_errors:
-                    _LOGGER.error("Resumed, lost %d events", self.write_errors)
-                    self.write_errors = 0
-
-                _LOGGER.debug("Wrote %d events", len(json))
-                break
-            except (
-                exceptions.InfluxDBClientError,
-                exceptions.InfluxDBServerError,
-                OSError,
-                ApiException,
-            ) as err:
-                if retry < self.max_tries:
-                    time.sleep(RETRY_DELAY)
-                else:
-                    if not self.write_errors:
-                        _LOGGER.error("Write error: %s", err)
-                    self.write_errors += len(json)
-
-    def run(self):
-        """Process incoming events."""
-        while not self.shutdown:
-            count, json = self.get_events_json()
-            if json:
-                self.write_to_influxdb(json)
-            for _ in range(count):
-                self.queue.task_done()
-
-    def block_till_done(self):
-        """Block till all events processed."""
-        self.queue.join()
+    return True
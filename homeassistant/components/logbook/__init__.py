@@ -188,13 +188,9 @@ class LogbookView(HomeAssistantView):
 
         hass = request.app["hass"]
 
-        def json_events():
-            """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(hass, self.config, start_day, end_day, entity_id)
-            )
-
-        return await hass.async_add_job(json_events)
+        return await self.json_stream(
+            request, _iter_events, hass, self.config, start_day, end_day, entity_id
+        )
 
 
 def humanify(hass, events, entity_attr_cache, prev_states=None):
@@ -360,6 +356,11 @@ def _all_entities_filter(_):
 
 def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
+    return list(_iter_events(hass, config, start_day, end_day, entity_id))
+
+
+def _iter_events(hass, config, start_day, end_day, entity_id=None):
+    """Yield the events for a period of time while reading them."""
     entity_attr_cache = EntityAttributeCache(hass)
 
     def yield_events(query):
@@ -447,7 +448,7 @@ def _get_events(hass, config, start_day, end_day, entity_id=None):
 
         # When all data is schema v8 or later, prev_states can be removed
         prev_states = {}
-        return list(humanify(hass, yield_events(query), entity_attr_cache, prev_states))
+        yield from humanify(hass, yield_events(query), entity_attr_cache, prev_states)
 
 
 def _keep_event(hass, event, entities_filter, entity_attr_cache):
@@ -8,7 +8,8 @@ import logging
 from operator import attrgetter
 import os
 import ssl
-from typing import Any, Callable, List, Optional, Union
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import attr
 import certifi
@@ -65,6 +66,7 @@ from .const import (
 )
 from .debug_info import log_messages
 from .discovery import MQTT_DISCOVERY_UPDATED, clear_discovery_hash, set_discovery_hash
+from .matcher import TopicMatcher
 from .models import Message, MessageCallbackType, PublishPayloadType
 from .subscription import async_subscribe_topics, async_unsubscribe_topics
 from .util import _VALID_QOS_SCHEMA, valid_publish_topic, valid_subscribe_topic
@@ -277,6 +279,9 @@ MQTT_PUBLISH_SCHEMA = vol.Schema(
 
 SubscribePayloadType = Union[str, bytes]  # Only bytes if encoding is None
 
+# Marks a payload that can't be decoded with an encoding
+_UNDECODABLE = object()
+
 
 def _build_publish_data(topic: Any, qos: int, retain: bool) -> ServiceDataType:
     """Build the arguments for the publish service without the payload."""
@@ -357,9 +362,14 @@ async def async_subscribe(
     msg_callback: MessageCallbackType,
     qos: int = DEFAULT_QOS,
     encoding: Optional[str] = "utf-8",
+    coalesce: Optional[float] = None,
 ):
     """Subscribe to an MQTT topic.
 
+    When coalesce is set, the callback is called at most once per that many
+    seconds. Messages arriving in between are dropped except for the
+    latest one, which is delivered when the window ends.
+
     Call the return value to unsubscribe.
     """
     # Count callback parameters which don't have a default value
@@ -380,6 +390,10 @@ async def async_subscribe(
         )
         wrapped_msg_callback = wrap_msg_callback(msg_callback)
 
+    kwargs = {}
+    if coalesce:
+        kwargs["coalesce"] = coalesce
+
     async_remove = await hass.data[DATA_MQTT].async_subscribe(
         topic,
         catch_log_exception(
@@ -391,6 +405,7 @@ async def async_subscribe(
         ),
         qos,
         encoding,
+        **kwargs,
     )
     return async_remove
 
@@ -402,10 +417,11 @@ def subscribe(
     msg_callback: MessageCallbackType,
     qos: int = DEFAULT_QOS,
     encoding: str = "utf-8",
+    coalesce: Optional[float] = None,
 ) -> Callable[[], None]:
     """Subscribe to an MQTT topic."""
     async_remove = asyncio.run_coroutine_threadsafe(
-        async_subscribe(hass, topic, msg_callback, qos, encoding), hass.loop
+        async_subscribe(hass, topic, msg_callback, qos, encoding, coalesce), hass.loop
     ).result()
 
     def remove():
@@ -436,6 +452,7 @@ async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_topic_stats)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -568,6 +585,24 @@ class Subscription:
     callback = attr.ib(type=MessageCallbackType)
     qos = attr.ib(type=int, default=0)
     encoding = attr.ib(type=str, default="utf-8")
+    coalesce = attr.ib(type=Optional[float], default=None)
+
+
+@attr.s(slots=True)
+class TopicStats:
+    """Class to hold the message counters of a subscribed topic filter."""
+
+    received = attr.ib(type=int, default=0)
+    coalesced = attr.ib(type=int, default=0)
+    dispatched = attr.ib(type=int, default=0)
+
+
+@attr.s(slots=True)
+class _CoalesceWindow:
+    """Class to hold the latest message held back for a subscription."""
+
+    timer = attr.ib(type=asyncio.TimerHandle)
+    message = attr.ib(type=Optional[Message], default=None)
 
 
 class MQTT:
@@ -583,6 +618,13 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._matcher: TopicMatcher[Subscription] = TopicMatcher()
+        self._windows: Dict[int, _CoalesceWindow] = {}
+        self.topic_stats: Dict[str, TopicStats] = {}
+        # Messages received by the paho thread, handed to the loop in bulk
+        self._ingest: List[Any] = []
+        self._ingest_lock = threading.Lock()
+        self._ingest_scheduled = False
         self.connected = False
         self._mqttc: mqtt.Client = None
         self._paho_lock = asyncio.Lock()
@@ -730,6 +772,7 @@ class MQTT:
         msg_callback: MessageCallbackType,
         qos: int,
         encoding: Optional[str] = None,
+        coalesce: Optional[float] = None,
     ) -> Callable[[], None]:
         """Set up a subscription to a topic with the provided qos.
 
@@ -738,8 +781,9 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(topic, msg_callback, qos, encoding)
+        subscription = Subscription(topic, msg_callback, qos, encoding, coalesce)
         self.subscriptions.append(subscription)
+        self._matcher.add(topic, subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -751,11 +795,18 @@ class MQTT:
             if subscription not in self.subscriptions:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
+            self._matcher.remove(topic, subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            window = self._windows.pop(id(subscription), None)
+            if window is not None:
+                window.timer.cancel()
+
+            if self._matcher.has_filter(topic):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
+            self.topic_stats.pop(topic, None)
+
             # Only unsubscribe if currently connected.
             if self.connected:
                 self.hass.async_create_task(self._async_unsubscribe(topic))
@@ -831,8 +882,28 @@ class MQTT:
             )
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        Messages are queued and only the first one of a batch schedules a
+        job, the job handles all messages queued until it runs.
+        """
+        with self._ingest_lock:
+            self._ingest.append(msg)
+            if self._ingest_scheduled:
+                return
+            self._ingest_scheduled = True
+
+        self.hass.add_job(self._mqtt_handle_ingest)
+
+    @callback
+    def _mqtt_handle_ingest(self) -> None:
+        """Handle the messages queued by the paho thread."""
+        with self._ingest_lock:
+            messages, self._ingest = self._ingest, []
+            self._ingest_scheduled = False
+
+        for msg in messages:
+            self._mqtt_handle_message(msg)
 
     @callback
     def _mqtt_handle_message(self, msg) -> None:
@@ -842,28 +913,39 @@ class MQTT:
             " (retained)" if msg.retain else "",
             msg.payload,
         )
-        timestamp = dt_util.utcnow()
-
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
-                continue
+        subscriptions = list(self._matcher.iter_match(msg.topic))
+        if not subscriptions:
+            return
 
-            payload: SubscribePayloadType = msg.payload
-            if subscription.encoding is not None:
+        timestamp = dt_util.utcnow()
+        for topic_filter in {subscription.topic for subscription in subscriptions}:
+            self._topic_stats(topic_filter).received += 1
+        # Payloads decoded for the matching subscriptions, by encoding
+        decoded: Dict[Optional[str], Any] = {None: msg.payload}
+
+        for subscription in subscriptions:
+            encoding = subscription.encoding
+            if encoding in decoded:
+                payload = decoded[encoding]
+            else:
                 try:
-                    payload = msg.payload.decode(subscription.encoding)
+                    payload = msg.payload.decode(encoding)
                 except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s (for %s)",
-                        msg.payload,
-                        msg.topic,
-                        subscription.encoding,
-                        subscription.callback,
-                    )
-                    continue
+                    payload = _UNDECODABLE
+                decoded[encoding] = payload
+
+            if payload is _UNDECODABLE:
+                _LOGGER.warning(
+                    "Can't decode payload %s on %s with encoding %s (for %s)",
+                    msg.payload,
+                    msg.topic,
+                    encoding,
+                    subscription.callback,
+                )
+                continue
 
-            self.hass.async_run_job(
-                subscription.callback,
+            self._async_dispatch(
+                subscription,
                 Message(
                     msg.topic,
                     payload,
@@ -874,6 +956,40 @@ class MQTT:
                 ),
             )
 
+    @callback
+    def _async_dispatch(self, subscription: Subscription, message: Message) -> None:
+        """Call the callback of a subscription, coalescing if requested."""
+        if subscription.coalesce:
+            window = self._windows.get(id(subscription))
+            if window is not None:
+                if window.message is not None:
+                    self._topic_stats(subscription.topic).coalesced += 1
+                window.message = message
+                return
+
+            self._windows[id(subscription)] = _CoalesceWindow(
+                self.hass.loop.call_later(
+                    subscription.coalesce, self._async_close_window, subscription
+                )
+            )
+
+        self._topic_stats(subscription.topic).dispatched += 1
+        self.hass.async_run_job(subscription.callback, message)
+
+    @callback
+    def _async_close_window(self, subscription: Subscription) -> None:
+        """Deliver the latest message held back during a coalescing window."""
+        window = self._windows.pop(id(subscription))
+        if window.message is not None:
+            self._async_dispatch(subscription, window.message)
+
+    def _topic_stats(self, topic_filter: str) -> TopicStats:
+        """Return the message counters of a subscribed topic filter."""
+        stats = self.topic_stats.get(topic_filter)
+        if stats is None:
+            stats = self.topic_stats[topic_filter] = TopicStats()
+        return stats
+
     def _mqtt_on_disconnect(self, _mqttc, _userdata, result_code: int) -> None:
         """Disconnected callback."""
         self.connected = False
@@ -897,20 +1013,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -1216,6 +1318,20 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/topic_stats"})
+@callback
+def websocket_topic_stats(hass, connection, msg):
+    """Get the message counters of all subscribed topic filters."""
+    connection.send_result(
+        msg["id"],
+        {
+            topic_filter: attr.asdict(stats)
+            for topic_filter, stats in hass.data[DATA_MQTT].topic_stats.items()
+        },
+    )
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
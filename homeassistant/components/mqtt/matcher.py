@@ -0,0 +1,106 @@
+"""Topic filter matching for MQTT subscriptions."""
+from typing import Dict, Generic, Iterator, List, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+WILDCARD_LEVEL = "+"
+WILDCARD_SUBTREE = "#"
+
+
+class _Node(Generic[_T]):
+    """Node of the topic trie, one for each level of a topic filter."""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: Dict[str, "_Node[_T]"] = {}
+        self.values: List[_T] = []
+
+
+class TopicMatcher(Generic[_T]):
+    """Prefix tree of topic filters.
+
+    The trie is updated when a filter is added or removed, so matching a
+    topic only walks the levels of the topic and the wildcard nodes next
+    to them instead of testing every filter. Matching follows the MQTT
+    rules: topics starting with "$" are not matched by a wildcard on the
+    first level and "a/#" also matches "a".
+    """
+
+    def __init__(self) -> None:
+        """Initialize the matcher."""
+        self._root: _Node[_T] = _Node()
+
+    def add(self, topic_filter: str, value: _T) -> None:
+        """Add a value for a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _Node()
+            node = child
+        node.values.append(value)
+
+    def remove(self, topic_filter: str, value: _T) -> None:
+        """Remove a value of a topic filter.
+
+        Raises KeyError if the value was not added for the filter.
+        """
+        path = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            child = node.children.get(level)
+            if child is None:
+                raise KeyError(topic_filter)
+            path.append((node, level, child))
+            node = child
+
+        try:
+            node.values.remove(value)
+        except ValueError:
+            raise KeyError(topic_filter)
+
+        # Prune nodes that no longer lead to any value
+        for parent, level, child in reversed(path):
+            if child.values or child.children:
+                break
+            del parent.children[level]
+
+    def has_filter(self, topic_filter: str) -> bool:
+        """Return if any value is registered for exactly this filter."""
+        node: Optional[_Node[_T]] = self._root
+        for level in topic_filter.split("/"):
+            node = node.children.get(level)  # type: ignore
+            if node is None:
+                return False
+        return bool(node.values)  # type: ignore
+
+    def iter_match(self, topic: str) -> Iterator[_T]:
+        """Iterate over the values of all filters matching a topic."""
+        levels = topic.split("/")
+        last = len(levels)
+        normal = not topic.startswith("$")
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, index = stack.pop()
+            children = node.children
+
+            if normal or index > 0:
+                subtree = children.get(WILDCARD_SUBTREE)
+                if subtree is not None:
+                    yield from subtree.values
+
+            if index == last:
+                yield from node.values
+                continue
+
+            if normal or index > 0:
+                child = children.get(WILDCARD_LEVEL)
+                if child is not None:
+                    stack.append((child, index + 1))
+
+            child = children.get(levels[index])
+            if child is not None:
+                stack.append((child, index + 1))
@@ -40,6 +40,7 @@ from .discovery import MQTT_DISCOVERY_NEW, clear_discovery_hash
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_COALESCE = "coalesce"
 CONF_EXPIRE_AFTER = "expire_after"
 
 DEFAULT_NAME = "MQTT Sensor"
@@ -47,6 +48,7 @@ DEFAULT_FORCE_UPDATE = False
 PLATFORM_SCHEMA = (
     mqtt.MQTT_RO_PLATFORM_SCHEMA.extend(
         {
+            vol.Optional(CONF_COALESCE): vol.All(vol.Coerce(float), vol.Range(min=0)),
             vol.Optional(CONF_DEVICE): mqtt.MQTT_ENTITY_DEVICE_INFO_SCHEMA,
             vol.Optional(CONF_DEVICE_CLASS): DEVICE_CLASSES_SCHEMA,
             vol.Optional(CONF_EXPIRE_AFTER): cv.positive_int,
@@ -172,6 +174,7 @@ class MqttSensor(
                     "topic": self._config[CONF_STATE_TOPIC],
                     "msg_callback": message_received,
                     "qos": self._config[CONF_QOS],
+                    "coalesce": self._config.get(CONF_COALESCE),
                 }
             },
         )
@@ -25,6 +25,7 @@ class EntitySubscription:
     unsubscribe_callback = attr.ib(type=Optional[Callable[[], None]])
     qos = attr.ib(type=int, default=0)
     encoding = attr.ib(type=str, default="utf-8")
+    coalesce = attr.ib(type=Optional[float], default=None)
 
     async def resubscribe_if_necessary(self, hass, other):
         """Re-subscribe to the new topic if necessary."""
@@ -45,8 +46,12 @@ class EntitySubscription:
         # Prepare debug data
         debug_info.add_subscription(self.hass, self.message_callback, self.topic)
 
+        kwargs = {}
+        if self.coalesce:
+            kwargs["coalesce"] = self.coalesce
+
         self.unsubscribe_callback = await mqtt.async_subscribe(
-            hass, self.topic, self.message_callback, self.qos, self.encoding
+            hass, self.topic, self.message_callback, self.qos, self.encoding, **kwargs
         )
 
     def _should_resubscribe(self, other):
@@ -54,10 +59,11 @@ class EntitySubscription:
         if other is None:
             return True
 
-        return (self.topic, self.qos, self.encoding) != (
+        return (self.topic, self.qos, self.encoding, self.coalesce) != (
             other.topic,
             other.qos,
             other.encoding,
+            other.coalesce,
         )
 
 
@@ -86,6 +92,7 @@ async def async_subscribe_topics(
             unsubscribe_callback=None,
             qos=value.get("qos", DEFAULT_QOS),
             encoding=value.get("encoding", "utf-8"),
+            coalesce=value.get("coalesce"),
             hass=hass,
         )
         # Get the current subscription state
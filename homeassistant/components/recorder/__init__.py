@@ -1,15 +1,17 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, deque, namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import count
+import json
 import logging
 import queue
 import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
@@ -26,17 +28,26 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import migration, purge, snapshot
 from .const import DATA_INSTANCE
 from .models import Base, Events, RecorderRuns, States
+from .statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOURLY,
+    StatisticsCompiler,
+    write_statistics,
+)
 from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
@@ -57,9 +68,12 @@ SERVICE_PURGE_SCHEMA = vol.Schema(
 
 DEFAULT_URL = "sqlite:///{hass_config_path}"
 DEFAULT_DB_FILE = "home-assistant_v2.db"
+DEFAULT_SPILL_FILE = "home-assistant_v2.spill.jsonl"
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
+DEFAULT_PURGE_BATCH_SIZE = 10000
 KEEPALIVE_TIME = 30
+SNAPSHOT_INTERVAL = timedelta(hours=1)
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
@@ -67,8 +81,17 @@ CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
+CONF_PURGE_BATCH_SIZE = "purge_batch_size"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_BATCH_SIZE = "batch_size"
+CONF_STATISTICS_PERIODS = "statistics_periods"
+CONF_MAX_QUEUE_SIZE = "max_queue_size"
+CONF_QUEUE_OVERFLOW = "queue_overflow"
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_SPILL = "spill"
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -88,6 +111,9 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_PURGE_KEEP_DAYS, default=10): vol.All(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
+                    vol.Optional(
+                        CONF_PURGE_BATCH_SIZE, default=DEFAULT_PURGE_BATCH_SIZE
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): vol.All(
                         vol.Coerce(int), vol.Range(min=0)
                     ),
@@ -95,6 +121,16 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_COMMIT_INTERVAL, default=1): vol.All(
                         vol.Coerce(int), vol.Range(min=0)
                     ),
+                    vol.Optional(CONF_BATCH_SIZE, default=0): cv.positive_int,
+                    vol.Optional(
+                        CONF_STATISTICS_PERIODS, default=[PERIOD_HOURLY]
+                    ): vol.All(
+                        cv.ensure_list, [vol.In([PERIOD_HOURLY, PERIOD_5MINUTE])]
+                    ),
+                    vol.Optional(CONF_MAX_QUEUE_SIZE, default=0): cv.positive_int,
+                    vol.Optional(CONF_QUEUE_OVERFLOW, default=OVERFLOW_DROP): vol.In(
+                        [OVERFLOW_DROP, OVERFLOW_COALESCE, OVERFLOW_SPILL]
+                    ),
                     vol.Optional(
                         CONF_DB_MAX_RETRIES, default=DEFAULT_DB_MAX_RETRIES
                     ): cv.positive_int,
@@ -156,6 +192,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
+    batch_size = conf[CONF_BATCH_SIZE]
+    max_queue_size = conf[CONF_MAX_QUEUE_SIZE]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
 
@@ -168,16 +206,25 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         hass=hass,
         auto_purge=auto_purge,
         keep_days=keep_days,
+        purge_batch_size=conf[CONF_PURGE_BATCH_SIZE],
         commit_interval=commit_interval,
         uri=db_url,
         db_max_retries=db_max_retries,
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        batch_size=batch_size,
+        statistics_periods=conf[CONF_STATISTICS_PERIODS],
+        max_queue_size=max_queue_size,
+        queue_overflow=conf[CONF_QUEUE_OVERFLOW],
+        spill_path=hass.config.path(DEFAULT_SPILL_FILE),
     )
     instance.async_initialize()
     instance.start()
 
+    if max_queue_size:
+        hass.async_create_task(async_load_platform(hass, "sensor", DOMAIN, {}, config))
+
     async def async_handle_purge_service(service):
         """Handle calls to the purge service."""
         instance.do_adhoc_purge(**service.data)
@@ -206,6 +253,12 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
+        batch_size: int = 0,
+        purge_batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+        statistics_periods: Optional[List[str]] = None,
+        max_queue_size: int = 0,
+        queue_overflow: str = OVERFLOW_DROP,
+        spill_path: Optional[str] = None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -213,7 +266,16 @@ class Recorder(threading.Thread):
         self.hass = hass
         self.auto_purge = auto_purge
         self.keep_days = keep_days
+        self.purge_batch_size = purge_batch_size
+        self.purge_progress: Optional[purge.PurgeProgress] = None
         self.commit_interval = commit_interval
+        self.batch_size = batch_size
+        self.statistics: Optional[StatisticsCompiler] = None
+        if statistics_periods:
+            self.statistics = StatisticsCompiler(statistics_periods)
+        self.max_queue_size = max_queue_size
+        self.queue_overflow = queue_overflow
+        self.spill_path = spill_path
         self.queue: Any = queue.Queue()
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -228,7 +290,22 @@ class Recorder(threading.Thread):
 
         self._timechanges_seen = 0
         self._keepalive_count = 0
+        self._next_snapshot = dt_util.utcnow() + SNAPSHOT_INTERVAL
         self._old_state_ids = {}
+        # Events and states waiting to be written in batch mode
+        self._batch: List[Any] = []
+        # Events held back in the event loop while the queue is full
+        self._overflow: Dict[Any, Any] = OrderedDict()
+        self._overflow_seq = count()
+        # Keys of the held back events that are not state changes, oldest first
+        self._overflow_seqs: Deque[int] = deque()
+        self._overflowing = False
+        self._spill_buffer: List[str] = []
+        self._spill_writing = False
+        self.dropped_events = 0
+        self.coalesced_events = 0
+        self.spilled_events = 0
+        self.commit_latency: Optional[float] = None
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -294,6 +371,9 @@ class Recorder(threading.Thread):
                 """Shut down the Recorder."""
                 if not hass_started.done():
                     hass_started.set_result(shutdown_task)
+                run_callback_threadsafe(
+                    self.hass.loop, self._async_flush_overflow
+                ).result()
                 self.queue.put(None)
                 self.join()
 
@@ -333,6 +413,7 @@ class Recorder(threading.Thread):
             )
 
         self.event_session = self.get_session()
+        self._write_snapshot()
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
@@ -355,6 +436,8 @@ class Recorder(threading.Thread):
                 if self._keepalive_count >= KEEPALIVE_TIME:
                     self._keepalive_count = 0
                     self._send_keep_alive()
+                if dt_util.utcnow() >= self._next_snapshot:
+                    self._write_snapshot()
                 if self.commit_interval:
                     self._timechanges_seen += 1
                     if self._timechanges_seen >= self.commit_interval:
@@ -371,6 +454,14 @@ class Recorder(threading.Thread):
                     self.queue.task_done()
                     continue
 
+            if self.statistics is not None and event.event_type == EVENT_STATE_CHANGED:
+                self.statistics.add_event(event)
+
+            if self.batch_size:
+                self._add_to_batch(event)
+                self.queue.task_done()
+                continue
+
             try:
                 dbevent = Events.from_event(event)
                 if event.event_type == EVENT_STATE_CHANGED:
@@ -410,6 +501,97 @@ class Recorder(threading.Thread):
 
             self.queue.task_done()
 
+    def _add_to_batch(self, event):
+        """Add an event and its state change to the pending batch."""
+        try:
+            dbevent = Events.from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+
+        dbstate = None
+        if event.event_type == EVENT_STATE_CHANGED:
+            dbevent.event_data = "{}"
+            try:
+                dbstate = States.from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s", event.data.get("new_state"),
+                )
+
+        self._batch.append((dbevent, dbstate, "new_state" in event.data))
+
+        # If they do not have a commit interval than we commit right away,
+        # otherwise when the batch is full or the commit interval passed.
+        if not self.commit_interval or len(self._batch) >= self.batch_size:
+            self._commit_event_session_or_retry()
+
+    def _write_batch(self) -> Dict[str, Optional[int]]:
+        """Insert the pending batch with one statement per table.
+
+        The recorder thread is the only writer of events and states, so ids
+        are allocated from the current maximum instead of flushing every row
+        to learn its id. Returns the old state ids to remember once the
+        transaction is committed.
+        """
+        connection = self.event_session.connection()
+        event_id = connection.scalar(select([func.max(Events.event_id)])) or 0
+        state_id = connection.scalar(select([func.max(States.state_id)])) or 0
+        created = dt_util.utcnow()
+        old_state_ids: Dict[str, Optional[int]] = {}
+        event_rows = []
+        state_rows = []
+
+        for dbevent, dbstate, has_new_state in self._batch:
+            event_id += 1
+            dbevent.event_id = event_id
+            event_rows.append(_batch_row(dbevent, created))
+
+            if dbstate is None:
+                continue
+
+            state_id += 1
+            entity_id = dbstate.entity_id
+            dbstate.state_id = state_id
+            dbstate.event_id = event_id
+            if entity_id in old_state_ids:
+                dbstate.old_state_id = old_state_ids[entity_id]
+            else:
+                dbstate.old_state_id = self._old_state_ids.get(entity_id)
+            state_rows.append(_batch_row(dbstate, created))
+            old_state_ids[entity_id] = state_id if has_new_state else None
+
+        connection.execute(Events.__table__.insert(), event_rows)
+        if state_rows:
+            connection.execute(States.__table__.insert(), state_rows)
+
+        if connection.dialect.name == "postgresql":
+            # Explicit ids do not advance the serial sequences
+            for table, column, last_id in (
+                ("events", "event_id", event_id),
+                ("states", "state_id", state_id),
+            ):
+                connection.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                    f"GREATEST({last_id}, 1))"
+                )
+
+        return old_state_ids
+
+    def _write_snapshot(self):
+        """Write a snapshot of the latest states to speed up history queries."""
+        self._next_snapshot = dt_util.utcnow() + SNAPSHOT_INTERVAL
+        # Commit pending events first so a failure does not lose them
+        self._commit_event_session_or_retry()
+        try:
+            snapshot.write_snapshot(self.event_session, self.run_info.start)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error writing state snapshot: %s", err)
+            self._reopen_event_session()
+            return
+        self._commit_event_session_or_retry()
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -429,7 +611,9 @@ class Recorder(threading.Thread):
                 time.sleep(self.db_retry_wait)
 
             try:
+                start = time.monotonic()
                 self._commit_event_session()
+                self.commit_latency = time.monotonic() - start
                 return
             except (exc.InternalError, exc.OperationalError) as err:
                 if err.connection_invalidated:
@@ -451,6 +635,7 @@ class Recorder(threading.Thread):
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error saving events: %s", err)
+                self._batch.clear()
                 return
 
         _LOGGER.error(
@@ -460,6 +645,8 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
+        self._batch.clear()
+
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -479,21 +666,147 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error while creating new event session: %s", err)
 
     def _commit_event_session(self):
+        old_state_ids = None
+        statistics = None
+
         try:
+            if self._batch:
+                old_state_ids = self._write_batch()
+            if self.statistics is not None:
+                statistics = self.statistics.pop_finished(dt_util.utcnow())
+                write_statistics(self.event_session, statistics)
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            if statistics:
+                self.statistics.restore(statistics)
             raise
 
+        if old_state_ids is not None:
+            self._batch.clear()
+            for entity_id, state_id in old_state_ids.items():
+                if state_id is not None:
+                    self._old_state_ids[entity_id] = state_id
+                else:
+                    self._old_state_ids.pop(entity_id, None)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of events waiting to be recorded."""
+        return self.queue.qsize() + len(self._overflow)
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        if not self.max_queue_size:
+            self.queue.put(event)
+            return
+
+        if self._overflow:
+            self._async_drain_overflow()
+
+        if not self._overflow and self.queue.qsize() < self.max_queue_size:
+            if self._overflowing:
+                self._overflowing = False
+                _LOGGER.warning(
+                    "Recorder queue is no longer full (%s events dropped, "
+                    "%s coalesced, %s spilled so far)",
+                    self.dropped_events,
+                    self.coalesced_events,
+                    self.spilled_events,
+                )
+            self.queue.put(event)
+            return
+
+        if not self._overflowing:
+            self._overflowing = True
+            _LOGGER.warning(
+                "Recorder queue reached its maximum size of %s events, "
+                "the database is not keeping up. Applying the %s policy",
+                self.max_queue_size,
+                self.queue_overflow,
+            )
+
+        # Time changed events only trigger commits and keep alives
+        if event.event_type == EVENT_TIME_CHANGED:
+            return
+
+        if self.queue_overflow == OVERFLOW_COALESCE:
+            if event.event_type == EVENT_STATE_CHANGED:
+                key = event.data.get(ATTR_ENTITY_ID)
+                if key in self._overflow:
+                    self.coalesced_events += 1
+            else:
+                if len(self._overflow_seqs) >= self.max_queue_size:
+                    del self._overflow[self._overflow_seqs.popleft()]
+                    self.dropped_events += 1
+                key = next(self._overflow_seq)
+                self._overflow_seqs.append(key)
+            self._overflow[key] = event
+        elif self.queue_overflow == OVERFLOW_SPILL:
+            self._async_spill(event)
+        else:
+            self.dropped_events += 1
+
+    @callback
+    def _async_drain_overflow(self):
+        """Move held back events to the queue while there is room."""
+        while self._overflow and self.queue.qsize() < self.max_queue_size:
+            key, event = self._overflow.popitem(last=False)
+            if isinstance(key, int):
+                self._overflow_seqs.popleft()
+            self.queue.put(event)
+
+    @callback
+    def _async_flush_overflow(self):
+        """Move all held back events to the queue, even if it is full."""
+        while self._overflow:
+            self.queue.put(self._overflow.popitem(last=False)[1])
+        self._overflow_seqs.clear()
+
+    @callback
+    def _async_spill(self, event):
+        """Append an event that does not fit in the queue to the spill file."""
+        try:
+            line = json.dumps(event, cls=JSONEncoder)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            self.dropped_events += 1
+            return
+
+        self.spilled_events += 1
+        self._spill_buffer.append(line)
+
+        if not self._spill_writing:
+            self._spill_writing = True
+            self.hass.async_create_task(self._async_write_spill())
+
+    async def _async_write_spill(self):
+        """Write spilled events to the spill file in order."""
+        while self._spill_buffer:
+            lines, self._spill_buffer = self._spill_buffer, []
+            await self.hass.async_add_executor_job(self._write_spill, lines)
+
+        self._spill_writing = False
+
+    def _write_spill(self, lines):
+        """Append lines to the spill file."""
+        try:
+            with open(self.spill_path, "a") as spill_file:
+                spill_file.write("".join(f"{line}\n" for line in lines))
+        except OSError as err:
+            _LOGGER.error(
+                "Unable to write %s events to %s: %s", len(lines), self.spill_path, err
+            )
 
     def block_till_done(self):
-        """Block till all events processed."""
-        self.queue.join()
+        """Block till all events processed, including held back events."""
+        while True:
+            self.queue.join()
+            if not self._overflow:
+                return
+            run_callback_threadsafe(self.hass.loop, self._async_drain_overflow).result()
 
     def _setup_connection(self):
         """Ensure database is ready to fly."""
@@ -567,9 +880,18 @@ class Recorder(threading.Thread):
     def _close_run(self):
         """Save end time for current run."""
         if self.event_session is not None:
+            if self.statistics is not None:
+                self.statistics.close_all()
             self.run_info.end = dt_util.utcnow()
             self.event_session.add(self.run_info)
             self._commit_event_session_or_retry()
             self.event_session.close()
 
         self.run_info = None
+
+
+def _batch_row(dbobj, created):
+    """Return the column values of a model as a row to insert."""
+    row = {column.key: getattr(dbobj, column.key) for column in dbobj.__table__.c}
+    row["created"] = created
+    return row
@@ -98,6 +98,12 @@ def _create_index(engine, table_name, index_name):
     _LOGGER.debug("Finished creating %s", index_name)
 
 
+def _create_table(engine, table_name):
+    """Create a table including its indexes if it does not exist yet."""
+    _LOGGER.debug("Creating table %s", table_name)
+    Base.metadata.tables[table_name].create(engine, checkfirst=True)
+
+
 def _drop_index(engine, table_name, index_name):
     """Drop an index from a specified table.
 
@@ -287,6 +293,10 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "states", "ix_states_entity_id")
         _create_index(engine, "events", "ix_events_event_type_time_fired")
         _drop_index(engine, "events", "ix_events_event_type")
+    elif new_version == 10:
+        _create_table(engine, "statistics")
+    elif new_version == 11:
+        _create_table(engine, "state_snapshots")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
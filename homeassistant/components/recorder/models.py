@@ -6,6 +6,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -24,7 +25,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 9
+SCHEMA_VERSION = 11
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -150,6 +151,46 @@ class States(Base):  # type: ignore
             return None
 
 
+class Statistics(Base):  # type: ignore
+    """Long-term statistics of numeric states.
+
+    Rows are aggregated per entity and period by the recorder and are not
+    removed by the purge.
+    """
+
+    __tablename__ = "statistics"
+    id = Column(Integer, primary_key=True)
+    entity_id = Column(String(255))
+    period = Column(String(16))
+    start = Column(DateTime(timezone=True))
+    min = Column(Float)
+    max = Column(Float)
+    mean = Column(Float)
+    last = Column(Float)
+    count = Column(Integer)
+    created = Column(DateTime(timezone=True), default=dt_util.utcnow)
+
+    __table_args__ = (
+        # Used for fetching the statistics of entities in a time range
+        Index("ix_statistics_entity_id_period_start", "entity_id", "period", "start"),
+    )
+
+
+class StateSnapshots(Base):  # type: ignore
+    """Latest state of each entity in the current run at a checkpoint."""
+
+    __tablename__ = "state_snapshots"
+    snapshot_id = Column(Integer, primary_key=True)
+    checkpoint = Column(DateTime(timezone=True))
+    entity_id = Column(String(255))
+    state_id = Column(Integer)
+
+    __table_args__ = (
+        # Used for fetching the snapshot of the latest checkpoint
+        Index("ix_state_snapshots_checkpoint_entity_id", "checkpoint", "entity_id"),
+    )
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -1,65 +1,138 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
+from typing import Any, Dict, Optional
 
+import attr
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import Events, RecorderRuns, States, StateSnapshots
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@attr.s(slots=True)
+class PurgeProgress:
+    """Progress of a purge that is spread over several chunks."""
+
+    keep_days: int = attr.ib()
+    started: float = attr.ib(factory=time.monotonic)
+    chunks: int = attr.ib(default=0)
+    states_deleted: int = attr.ib(default=0)
+    events_deleted: int = attr.ib(default=0)
+    # Highest ids that were old enough to purge when the purge started
+    last_state_id: Optional[int] = attr.ib(default=None)
+    last_event_id: Optional[int] = attr.ib(default=None)
+    # Highest ids purged so far
+    purged_state_id: int = attr.ib(default=0)
+    purged_event_id: int = attr.ib(default=0)
+
+    @property
+    def rows_deleted(self) -> int:
+        """Return the number of rows deleted so far."""
+        return self.states_deleted + self.events_deleted
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of rows deleted per second."""
+        elapsed = time.monotonic() - self.started
+        return self.rows_deleted / elapsed if elapsed else 0.0
+
+    @property
+    def remaining_estimate(self) -> int:
+        """Return an estimate of the rows left to purge based on the ids."""
+        remaining = 0
+        if self.last_state_id is not None:
+            remaining += max(self.last_state_id - self.purged_state_id, 0)
+        if self.last_event_id is not None:
+            remaining += max(self.last_event_id - self.purged_event_id, 0)
+        return remaining
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the progress as a dict."""
+        return {
+            "keep_days": self.keep_days,
+            "chunks": self.chunks,
+            "states_deleted": self.states_deleted,
+            "events_deleted": self.events_deleted,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "remaining_estimate": self.remaining_estimate,
+        }
+
+
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Deletes at most instance.purge_batch_size states and events in one
+    transaction, using the primary key range of the oldest rows. Returns
+    False when there may be more rows to purge, so the recorder can write
+    pending events before the next chunk.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+    batch_size = instance.purge_batch_size
     _LOGGER.debug("Purging events before %s", purge_before)
 
+    progress = instance.purge_progress
+    if progress is None or progress.keep_days != purge_days:
+        progress = instance.purge_progress = PurgeProgress(purge_days)
+
     try:
         with session_scope(session=instance.get_session()) as session:
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-
-            states_purge_before = purge_before
-            if states:
-                states_purge_before = min(
-                    purge_before, states[0].last_updated + timedelta(hours=1)
-                )
-
-            deleted_rows_states = (
-                session.query(States)
-                .filter(States.last_updated < states_purge_before)
-                .delete(synchronize_session=False)
+            if progress.last_state_id is None:
+                progress.last_state_id = (
+                    session.query(func.max(States.state_id))
+                    .filter(States.last_updated < purge_before)
+                    .scalar()
+                ) or 0
+                progress.last_event_id = (
+                    session.query(func.max(Events.event_id))
+                    .filter(Events.time_fired < purge_before)
+                    .scalar()
+                ) or 0
+
+            deleted_rows_states, last_state_id = _purge_chunk(
+                session,
+                States,
+                States.state_id,
+                States.last_updated,
+                purge_before,
+                batch_size,
             )
             _LOGGER.debug("Deleted %s states", deleted_rows_states)
 
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-
-            events_purge_before = purge_before
-            if events:
-                events_purge_before = min(
-                    purge_before, events[0].time_fired + timedelta(hours=1)
-                )
-
-            deleted_rows_events = (
-                session.query(Events)
-                .filter(Events.time_fired < events_purge_before)
-                .delete(synchronize_session=False)
+            deleted_rows_events, last_event_id = _purge_chunk(
+                session,
+                Events,
+                Events.event_id,
+                Events.time_fired,
+                purge_before,
+                batch_size,
             )
             _LOGGER.debug("Deleted %s events", deleted_rows_events)
 
-            # If states or events purging isn't processing the purge_before yet,
+            progress.chunks += 1
+            progress.states_deleted += deleted_rows_states
+            progress.events_deleted += deleted_rows_events
+            if last_state_id is not None:
+                progress.purged_state_id = last_state_id
+            if last_event_id is not None:
+                progress.purged_event_id = last_event_id
+
+            # If a chunk used its whole budget there can be more rows to purge,
             # return false, as we are not done yet.
-            if (states_purge_before and states_purge_before != purge_before) or (
-                events_purge_before and events_purge_before != purge_before
-            ):
-                _LOGGER.debug("Purging hasn't fully completed yet.")
+            if deleted_rows_states >= batch_size or deleted_rows_events >= batch_size:
+                _LOGGER.debug(
+                    "Purging hasn't fully completed yet: %s rows deleted "
+                    "(%.1f rows/s), about %s rows remaining",
+                    progress.rows_deleted,
+                    progress.rows_per_second,
+                    progress.remaining_estimate,
+                )
                 return False
 
             # Recorder runs is small, no need to batch run it
@@ -70,6 +143,22 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+            deleted_rows = (
+                session.query(StateSnapshots)
+                .filter(StateSnapshots.checkpoint < purge_before)
+                .delete(synchronize_session=False)
+            )
+            _LOGGER.debug("Deleted %s state_snapshots", deleted_rows)
+
+        instance.purge_progress = None
+        _LOGGER.info(
+            "Purged %s states and %s events in %s chunks (%.1f rows/s)",
+            progress.states_deleted,
+            progress.events_deleted,
+            progress.chunks,
+            progress.rows_per_second,
+        )
+
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
             if instance.engine.driver in ("pysqlite", "postgresql"):
@@ -82,5 +171,33 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
 
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s.", err)
+        instance.purge_progress = None
 
     return True
+
+
+def _purge_chunk(session, table, id_column, time_column, purge_before, batch_size):
+    """Delete the oldest rows by primary key range.
+
+    Returns the number of deleted rows and the highest deleted id.
+    """
+    oldest_ids = (
+        session.query(id_column.label("id"))
+        .filter(time_column < purge_before)
+        .order_by(id_column)
+        .limit(batch_size)
+        .subquery()
+    )
+    first_id, last_id = session.query(
+        func.min(oldest_ids.c.id), func.max(oldest_ids.c.id)
+    ).one()
+
+    if last_id is None:
+        return 0, None
+
+    deleted_rows = (
+        session.query(table)
+        .filter(id_column.between(first_id, last_id), time_column < purge_before)
+        .delete(synchronize_session=False)
+    )
+    return deleted_rows, last_id
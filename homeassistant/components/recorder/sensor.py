@@ -0,0 +1,97 @@
+"""Sensors reporting the health of the recorder queue."""
+from datetime import timedelta
+
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_INSTANCE
+
+SCAN_INTERVAL = timedelta(seconds=10)
+
+ATTR_COALESCED_EVENTS = "coalesced_events"
+ATTR_DROPPED_EVENTS = "dropped_events"
+ATTR_MAX_QUEUE_SIZE = "max_queue_size"
+ATTR_QUEUE_OVERFLOW = "queue_overflow"
+ATTR_SPILLED_EVENTS = "spilled_events"
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the recorder sensors."""
+    if discovery_info is None:
+        return
+
+    async_add_entities([RecorderQueueSensor(), RecorderCommitLatencySensor()], True)
+
+
+class RecorderSensor(Entity):
+    """Base class for the recorder sensors."""
+
+    _name = None
+    _unit = None
+    _icon = None
+
+    def __init__(self):
+        """Initialize the sensor."""
+        self._state = None
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return self._name
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return self._unit
+
+    @property
+    def icon(self):
+        """Return the icon of the sensor."""
+        return self._icon
+
+    @property
+    def instance(self):
+        """Return the running recorder."""
+        return self.hass.data[DATA_INSTANCE]
+
+
+class RecorderQueueSensor(RecorderSensor):
+    """Report the number of events waiting to be recorded."""
+
+    _name = "Recorder queue depth"
+    _unit = "events"
+    _icon = "mdi:tray-full"
+
+    @property
+    def device_state_attributes(self):
+        """Return the overflow counters."""
+        instance = self.instance
+        return {
+            ATTR_MAX_QUEUE_SIZE: instance.max_queue_size,
+            ATTR_QUEUE_OVERFLOW: instance.queue_overflow,
+            ATTR_DROPPED_EVENTS: instance.dropped_events,
+            ATTR_COALESCED_EVENTS: instance.coalesced_events,
+            ATTR_SPILLED_EVENTS: instance.spilled_events,
+        }
+
+    async def async_update(self):
+        """Update the queue depth."""
+        self._state = self.instance.queue_depth
+
+
+class RecorderCommitLatencySensor(RecorderSensor):
+    """Report how long the last database commit took."""
+
+    _name = "Recorder commit latency"
+    _unit = TIME_MILLISECONDS
+    _icon = "mdi:timer-sand"
+
+    async def async_update(self):
+        """Update the commit latency."""
+        latency = self.instance.commit_latency
+        self._state = None if latency is None else round(latency * 1000, 1)
@@ -0,0 +1,140 @@
+"""Snapshots of the latest state of each entity."""
+import logging
+
+from sqlalchemy import and_, func, union_all
+
+from .models import States, StateSnapshots, process_timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def latest_state_ids(session, start_time, end_time, entity_ids=None, inclusive=False):
+    """Return a query for the id of the latest state of each entity in a window.
+
+    The window starts at start_time and ends before end_time, or at
+    end_time when inclusive is set. The column is labeled max_state_id.
+    """
+    if inclusive:
+        window = (States.last_updated >= start_time) & (States.last_updated <= end_time)
+    else:
+        window = (States.last_updated >= start_time) & (States.last_updated < end_time)
+
+    most_recent_states_by_date = session.query(
+        States.entity_id.label("max_entity_id"),
+        func.max(States.last_updated).label("max_last_updated"),
+    ).filter(window)
+
+    if entity_ids:
+        most_recent_states_by_date = most_recent_states_by_date.filter(
+            States.entity_id.in_(entity_ids)
+        )
+
+    most_recent_states_by_date = most_recent_states_by_date.group_by(
+        States.entity_id
+    ).subquery()
+
+    return (
+        session.query(func.max(States.state_id).label("max_state_id"))
+        .join(
+            most_recent_states_by_date,
+            and_(
+                States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                States.last_updated == most_recent_states_by_date.c.max_last_updated,
+            ),
+        )
+        .group_by(States.entity_id)
+    )
+
+
+def last_checkpoint(session, run_start, point_in_time):
+    """Return the latest checkpoint of a run before a point in time."""
+    return process_timestamp(
+        session.query(func.max(StateSnapshots.checkpoint))
+        .filter(
+            (StateSnapshots.checkpoint >= run_start)
+            & (StateSnapshots.checkpoint < point_in_time)
+        )
+        .scalar()
+    )
+
+
+def states_at_time_ids(session, run_start, point_in_time, entity_ids=None):
+    """Return a subquery of the latest state ids before a point in time.
+
+    Only states since run_start are taken into account. When there is a
+    snapshot of the run before the point in time, it is combined with the
+    states recorded after its checkpoint, otherwise all states of the run
+    are scanned. The column is labeled max_state_id.
+    """
+    checkpoint = last_checkpoint(session, run_start, point_in_time)
+    if checkpoint is None:
+        return latest_state_ids(
+            session, run_start, point_in_time, entity_ids
+        ).subquery()
+
+    delta_entity_ids = session.query(States.entity_id).filter(
+        (States.last_updated >= checkpoint) & (States.last_updated < point_in_time)
+    )
+    snapshot_ids = session.query(StateSnapshots.state_id.label("max_state_id")).filter(
+        (StateSnapshots.checkpoint == checkpoint)
+        & ~StateSnapshots.entity_id.in_(delta_entity_ids)
+    )
+    if entity_ids:
+        snapshot_ids = snapshot_ids.filter(StateSnapshots.entity_id.in_(entity_ids))
+
+    return union_all(
+        latest_state_ids(session, checkpoint, point_in_time, entity_ids).statement,
+        snapshot_ids.statement,
+    ).alias()
+
+
+def write_snapshot(session, run_start):
+    """Add a snapshot of the latest state of each entity in the run.
+
+    The checkpoint is the last_updated of the most recent recorded state, so
+    the snapshot covers all states up to and including the checkpoint. It is
+    computed from the previous snapshot of the run and the states recorded
+    since. Returns the checkpoint or None if nothing changed.
+    """
+    previous = (
+        session.query(func.max(StateSnapshots.checkpoint))
+        .filter(StateSnapshots.checkpoint >= run_start)
+        .scalar()
+    )
+    start_time = run_start if previous is None else previous
+
+    checkpoint = (
+        session.query(func.max(States.last_updated))
+        .filter(States.last_updated >= start_time)
+        .scalar()
+    )
+    if checkpoint is None or checkpoint == previous:
+        return None
+
+    latest_ids = latest_state_ids(
+        session, start_time, checkpoint, inclusive=True
+    ).subquery()
+    entries = dict(
+        session.query(States.entity_id, States.state_id).join(
+            latest_ids, States.state_id == latest_ids.c.max_state_id
+        )
+    )
+
+    if previous is not None:
+        for entity_id, state_id in session.query(
+            StateSnapshots.entity_id, StateSnapshots.state_id
+        ).filter(StateSnapshots.checkpoint == previous):
+            entries.setdefault(entity_id, state_id)
+
+    if not entries:
+        return None
+
+    session.execute(
+        StateSnapshots.__table__.insert(),
+        [
+            {"checkpoint": checkpoint, "entity_id": entity_id, "state_id": state_id}
+            for entity_id, state_id in entries.items()
+        ],
+    )
+    _LOGGER.debug("Wrote snapshot of %s states at %s", len(entries), checkpoint)
+    return process_timestamp(checkpoint)
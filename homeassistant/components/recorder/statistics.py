@@ -0,0 +1,188 @@
+"""Long-term statistics of numeric states."""
+from collections import defaultdict
+from datetime import datetime, timedelta
+import math
+from typing import Dict, Iterable, List, Tuple
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import Event
+import homeassistant.util.dt as dt_util
+
+from .models import Statistics, process_timestamp
+from .util import execute, session_scope
+
+PERIOD_HOURLY = "hourly"
+PERIOD_5MINUTE = "5minute"
+
+PERIODS = {
+    PERIOD_HOURLY: timedelta(hours=1),
+    PERIOD_5MINUTE: timedelta(minutes=5),
+}
+
+
+def period_start(period: str, point_in_time: datetime) -> datetime:
+    """Return the start of the period a point in time falls in."""
+    length = PERIODS[period].total_seconds()
+    timestamp = point_in_time.timestamp()
+    return dt_util.utc_from_timestamp(timestamp - timestamp % length)
+
+
+class _Bucket:
+    """Aggregate of the numeric states of an entity in one period."""
+
+    __slots__ = ("start", "end", "min", "max", "total", "count", "last")
+
+    def __init__(self, start: datetime, end: datetime, value: float) -> None:
+        """Initialize the bucket with its first value."""
+        self.start = start
+        self.end = end
+        self.min = value
+        self.max = value
+        self.total = value
+        self.count = 1
+        self.last = value
+
+    def add(self, value: float) -> None:
+        """Add a value to the bucket."""
+        if value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.total += value
+        self.count += 1
+        self.last = value
+
+
+class StatisticsCompiler:
+    """Compile statistics of numeric states while they are recorded.
+
+    Only entities with a unit of measurement and a numeric state are
+    aggregated. Buckets are kept in memory until their period is over and
+    are then written by the recorder with the next commit.
+    """
+
+    def __init__(self, periods: Iterable[str]) -> None:
+        """Initialize the compiler."""
+        self.periods = list(periods)
+        self._open: Dict[Tuple[str, str], _Bucket] = {}
+        self._finished: List[Tuple[str, str, _Bucket]] = []
+
+    def add_event(self, event: Event) -> None:
+        """Add the new state of a state_changed event."""
+        state = event.data.get("new_state")
+        if state is None or ATTR_UNIT_OF_MEASUREMENT not in state.attributes:
+            return
+
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+
+        if not math.isfinite(value):
+            return
+
+        for period in self.periods:
+            key = (state.entity_id, period)
+            bucket = self._open.get(key)
+            if bucket is not None and bucket.start <= state.last_updated < bucket.end:
+                bucket.add(value)
+                continue
+
+            if bucket is not None:
+                self._finished.append((state.entity_id, period, bucket))
+            start = period_start(period, state.last_updated)
+            self._open[key] = _Bucket(start, start + PERIODS[period], value)
+
+    def close_all(self) -> None:
+        """Finish all buckets, including the ones of periods not over yet."""
+        for (entity_id, period), bucket in self._open.items():
+            self._finished.append((entity_id, period, bucket))
+        self._open.clear()
+
+    def pop_finished(self, now: datetime) -> List[Tuple[str, str, _Bucket]]:
+        """Return and forget the buckets whose period is over."""
+        for key, bucket in list(self._open.items()):
+            if bucket.end <= now:
+                self._finished.append((key[0], key[1], bucket))
+                del self._open[key]
+
+        finished, self._finished = self._finished, []
+        return finished
+
+    def restore(self, finished: List[Tuple[str, str, _Bucket]]) -> None:
+        """Put back buckets that could not be written."""
+        self._finished[:0] = finished
+
+
+def write_statistics(session, finished: List[Tuple[str, str, _Bucket]]) -> None:
+    """Add finished buckets to a session.
+
+    A bucket is merged into an existing row for the same period, which
+    happens when Home Assistant restarted during the period.
+    """
+    for entity_id, period, bucket in finished:
+        row = (
+            session.query(Statistics)
+            .filter_by(entity_id=entity_id, period=period, start=bucket.start)
+            .first()
+        )
+        if row is None:
+            session.add(
+                Statistics(
+                    entity_id=entity_id,
+                    period=period,
+                    start=bucket.start,
+                    min=bucket.min,
+                    max=bucket.max,
+                    mean=bucket.total / bucket.count,
+                    last=bucket.last,
+                    count=bucket.count,
+                )
+            )
+            continue
+
+        count = row.count + bucket.count
+        row.mean = (row.mean * row.count + bucket.total) / count
+        row.min = min(row.min, bucket.min)
+        row.max = max(row.max, bucket.max)
+        row.last = bucket.last
+        row.count = count
+
+
+def statistics_during_period(
+    hass, start_time, end_time=None, entity_ids=None, period=PERIOD_HOURLY
+):
+    """Return the statistics of entities during UTC period start_time - end_time.
+
+    The result maps each entity_id to its statistics sorted by start.
+    A period is included when it starts before end_time and ends after
+    start_time.
+    """
+    with session_scope(hass=hass) as session:
+        query = session.query(Statistics).filter(
+            (Statistics.period == period)
+            & (Statistics.start > start_time - PERIODS[period])
+        )
+
+        if end_time is not None:
+            query = query.filter(Statistics.start < end_time)
+
+        if entity_ids is not None:
+            query = query.filter(Statistics.entity_id.in_(entity_ids))
+
+        rows = execute(query.order_by(Statistics.entity_id, Statistics.start))
+
+        result = defaultdict(list)
+        for row in rows:
+            result[row.entity_id].append(
+                {
+                    "start": process_timestamp(row.start),
+                    "min": row.min,
+                    "max": row.max,
+                    "mean": row.mean,
+                    "last": row.last,
+                    "count": row.count,
+                }
+            )
+
+        return dict(result)
@@ -1,7 +1,5 @@
 """Support for statistics for sensor values."""
-from collections import deque
 import logging
-import statistics
 
 import voluptuous as vol
 
@@ -25,6 +23,8 @@ from homeassistant.helpers.event import (
 )
 from homeassistant.util import dt as dt_util
 
+from .window import SlidingWindow
+
 _LOGGER = logging.getLogger(__name__)
 
 ATTR_AVERAGE_CHANGE = "average_change"
@@ -91,8 +91,7 @@ class StatisticsSensor(Entity):
         self._max_age = max_age
         self._precision = precision
         self._unit_of_measurement = None
-        self.states = deque(maxlen=self._sampling_size)
-        self.ages = deque(maxlen=self._sampling_size)
+        self.samples = SlidingWindow(self._sampling_size, numeric=not self.is_binary)
 
         self.count = 0
         self.mean = self.median = self.stdev = self.variance = None
@@ -139,11 +138,9 @@ class StatisticsSensor(Entity):
 
         try:
             if self.is_binary:
-                self.states.append(new_state.state)
+                self.samples.add(new_state.state, new_state.last_updated)
             else:
-                self.states.append(float(new_state.state))
-
-            self.ages.append(new_state.last_updated)
+                self.samples.add(float(new_state.state), new_state.last_updated)
         except ValueError:
             _LOGGER.error(
                 "%s: parsing error, expected number and received %s",
@@ -208,23 +205,17 @@ class StatisticsSensor(Entity):
             self._max_age,
         )
 
-        while self.ages and (now - self.ages[0]) > self._max_age:
-            _LOGGER.debug(
-                "%s: purging record with datetime %s(%s)",
-                self.entity_id,
-                dt_util.as_local(self.ages[0]),
-                (now - self.ages[0]),
-            )
-            self.ages.popleft()
-            self.states.popleft()
+        purged = self.samples.purge_older_than(now - self._max_age)
+        if purged:
+            _LOGGER.debug("%s: purged %s records", self.entity_id, purged)
 
     def _next_to_purge_timestamp(self):
         """Find the timestamp when the next purge would occur."""
-        if self.ages and self._max_age:
-            # Take the oldest entry from the ages list and add the configured max_age.
+        if self.samples and self._max_age:
+            # Take the oldest entry from the samples and add the configured max_age.
             # If executed after purging old states, the result is the next timestamp
             # in the future when the oldest state will expire.
-            return self.ages[0] + self._max_age
+            return self.samples.oldest_age + self._max_age
         return None
 
     async def async_update(self):
@@ -233,37 +224,38 @@ class StatisticsSensor(Entity):
         if self._max_age is not None:
             self._purge_old()
 
-        self.count = len(self.states)
+        samples = self.samples
+        self.count = len(samples)
 
         if not self.is_binary:
-            try:  # require only one data point
-                self.mean = round(statistics.mean(self.states), self._precision)
-                self.median = round(statistics.median(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if samples:
+                self.mean = round(samples.mean, self._precision)
+                self.median = round(samples.median, self._precision)
+            else:
+                _LOGGER.debug("%s: no data points", self.entity_id)
                 self.mean = self.median = STATE_UNKNOWN
 
-            try:  # require at least two data points
-                self.stdev = round(statistics.stdev(self.states), self._precision)
-                self.variance = round(statistics.variance(self.states), self._precision)
-            except statistics.StatisticsError as err:
-                _LOGGER.debug("%s: %s", self.entity_id, err)
+            if len(samples) > 1:
+                self.stdev = round(samples.stdev, self._precision)
+                self.variance = round(samples.variance, self._precision)
+            else:
+                _LOGGER.debug("%s: at least two data points needed", self.entity_id)
                 self.stdev = self.variance = STATE_UNKNOWN
 
-            if self.states:
-                self.total = round(sum(self.states), self._precision)
-                self.min = round(min(self.states), self._precision)
-                self.max = round(max(self.states), self._precision)
+            if samples:
+                self.total = round(samples.total, self._precision)
+                self.min = round(samples.min, self._precision)
+                self.max = round(samples.max, self._precision)
 
-                self.min_age = self.ages[0]
-                self.max_age = self.ages[-1]
+                self.min_age = samples.oldest_age
+                self.max_age = samples.newest_age
 
-                self.change = self.states[-1] - self.states[0]
+                self.change = samples.last - samples.first
                 self.average_change = self.change
                 self.change_rate = 0
 
-                if len(self.states) > 1:
-                    self.average_change /= len(self.states) - 1
+                if len(samples) > 1:
+                    self.average_change /= len(samples) - 1
 
                     time_diff = (self.max_age - self.min_age).total_seconds()
                     if time_diff > 0:
@@ -0,0 +1,190 @@
+"""Incrementally updated statistics over a sliding window of samples."""
+from collections import deque
+from datetime import datetime
+import math
+from typing import Any, Deque, Optional, Tuple
+
+from homeassistant.util.sliding_window import SlidingMedian
+
+
+class _MonotonicExtreme:
+    """Minimum or maximum of a window whose samples are removed oldest first.
+
+    Only samples that can still become the extreme are kept, so adding a
+    sample is amortized O(1) and reading the extreme is O(1).
+    """
+
+    __slots__ = ("_candidates", "_sign")
+
+    def __init__(self, maximum: bool) -> None:
+        """Initialize the extreme."""
+        self._candidates: Deque[Tuple[int, float]] = deque()
+        self._sign = -1 if maximum else 1
+
+    def add(self, value: float, seq: int) -> None:
+        """Add a sample."""
+        candidates = self._candidates
+        key = self._sign * value
+        while candidates and self._sign * candidates[-1][1] >= key:
+            candidates.pop()
+        candidates.append((seq, value))
+
+    def remove(self, seq: int) -> None:
+        """Remove the oldest sample."""
+        if self._candidates and self._candidates[0][0] == seq:
+            self._candidates.popleft()
+
+    @property
+    def value(self) -> float:
+        """Return the extreme of the samples."""
+        return self._candidates[0][1]
+
+
+class SlidingWindow:
+    """Samples of a sensor with statistics updated as they come and go.
+
+    Samples are removed oldest first, either when the window is full or
+    when they are too old. Mean and variance are kept with Welford's
+    algorithm, the minimum and maximum with monotonic queues and the median
+    with two heaps, so adding or removing a sample is O(log n). The running
+    sums are recomputed once for every max_size removals to stop rounding
+    errors from accumulating.
+
+    Windows that are not numeric only keep the samples.
+    """
+
+    def __init__(self, max_size: int, numeric: bool = True) -> None:
+        """Initialize the window."""
+        self.max_size = max_size
+        self.numeric = numeric
+        # (sequence number, value, age)
+        self._samples: Deque[Tuple[int, Any, datetime]] = deque()
+        self._seq = 0
+        self._removed = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._total = 0.0
+        self._median = SlidingMedian()
+        self._min = _MonotonicExtreme(maximum=False)
+        self._max = _MonotonicExtreme(maximum=True)
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self._samples)
+
+    def add(self, value: Any, age: datetime) -> None:
+        """Add a sample, removing the oldest one if the window is full."""
+        if len(self._samples) >= self.max_size:
+            self.pop_oldest()
+
+        seq = self._seq
+        self._seq += 1
+        self._samples.append((seq, value, age))
+
+        if not self.numeric:
+            return
+
+        count = len(self._samples)
+        delta = value - self._mean
+        self._mean += delta / count
+        self._m2 += delta * (value - self._mean)
+        self._total += value
+        self._median.add(value, seq)
+        self._min.add(value, seq)
+        self._max.add(value, seq)
+
+    def pop_oldest(self) -> Tuple[Any, datetime]:
+        """Remove the oldest sample and return its value and age."""
+        seq, value, age = self._samples.popleft()
+
+        if not self.numeric:
+            return value, age
+
+        count = len(self._samples)
+        self._median.remove(seq)
+        self._min.remove(seq)
+        self._max.remove(seq)
+
+        self._removed += 1
+        if not count:
+            self._mean = self._m2 = self._total = 0.0
+        elif self._removed >= self.max_size:
+            self._resync()
+        else:
+            delta = value - self._mean
+            self._mean -= delta / count
+            self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+            self._total -= value
+
+        return value, age
+
+    def purge_older_than(self, cutoff: datetime) -> int:
+        """Remove the samples older than cutoff and return how many were removed."""
+        purged = 0
+        while self._samples and self._samples[0][2] < cutoff:
+            self.pop_oldest()
+            purged += 1
+        return purged
+
+    def _resync(self) -> None:
+        """Recompute the running sums from the samples."""
+        self._removed = 0
+        values = [sample[1] for sample in self._samples]
+        self._total = math.fsum(values)
+        self._mean = self._total / len(values)
+        self._m2 = math.fsum((value - self._mean) ** 2 for value in values)
+
+    @property
+    def oldest_age(self) -> Optional[datetime]:
+        """Return the age of the oldest sample."""
+        return self._samples[0][2] if self._samples else None
+
+    @property
+    def newest_age(self) -> Optional[datetime]:
+        """Return the age of the newest sample."""
+        return self._samples[-1][2] if self._samples else None
+
+    @property
+    def first(self) -> Any:
+        """Return the value of the oldest sample."""
+        return self._samples[0][1]
+
+    @property
+    def last(self) -> Any:
+        """Return the value of the newest sample."""
+        return self._samples[-1][1]
+
+    @property
+    def mean(self) -> float:
+        """Return the mean of the samples."""
+        return self._mean
+
+    @property
+    def median(self) -> float:
+        """Return the median of the samples."""
+        return self._median.median
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance, which requires two samples."""
+        return self._m2 / (len(self._samples) - 1)
+
+    @property
+    def stdev(self) -> float:
+        """Return the sample standard deviation, which requires two samples."""
+        return math.sqrt(self.variance)
+
+    @property
+    def total(self) -> float:
+        """Return the sum of the samples."""
+        return self._total
+
+    @property
+    def min(self) -> float:
+        """Return the minimum of the samples."""
+        return self._min.value
+
+    @property
+    def max(self) -> float:
+        """Return the maximum of the samples."""
+        return self._max.value
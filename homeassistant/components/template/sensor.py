@@ -1,4 +1,5 @@
 """Allows the creation of a sensor that breaks out state_attributes."""
+from functools import partial
 import logging
 from typing import Optional
 
@@ -20,15 +21,17 @@ from homeassistant.const import (
     CONF_SENSORS,
     CONF_VALUE_TEMPLATE,
     EVENT_HOMEASSISTANT_START,
-    MATCH_ALL,
 )
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change,
+    async_track_template_result,
+)
 
-from . import extract_entities, initialise_templates
+from . import initialise_templates
 from .const import CONF_AVAILABILITY_TEMPLATE
 
 CONF_ATTRIBUTE_TEMPLATES = "attribute_templates"
@@ -81,13 +84,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         }
 
         initialise_templates(hass, templates, attribute_templates)
-        entity_ids = extract_entities(
-            device,
-            "sensor",
-            device_config.get(ATTR_ENTITY_ID),
-            templates,
-            attribute_templates,
-        )
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         sensors.append(
             SensorTemplate(
@@ -161,18 +158,63 @@ class SensorTemplate(Entity):
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_sensor_state_listener
+            if self._entities is not None:
+                # Track the configured entities for all templates
+                self.async_on_remove(
+                    async_track_state_change(
+                        self.hass, self._entities, template_sensor_state_listener
+                    )
                 )
+                self.async_schedule_update_ha_state(True)
+                return
 
-            self.async_schedule_update_ha_state(True)
+            # Track what each template accessed during its last render
+            for template, update in self._template_updaters():
+                self._async_track_template(template, update)
+            self.async_write_ha_state()
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, template_sensor_startup
         )
 
+    @callback
+    def _async_track_template(self, template, update):
+        """Update part of the sensor each time the result of a template changes."""
+        ready = False
+
+        @callback
+        def template_result_listener(event, result):
+            """Handle a new template result."""
+            update(result)
+            if ready:
+                self.async_write_ha_state()
+
+        tracker = async_track_template_result(
+            self.hass, template, template_result_listener
+        )
+        ready = True
+        self.async_on_remove(tracker.async_remove)
+
+    def _template_updaters(self):
+        """Return the templates of the sensor with the function applying a result."""
+        updaters = [(self._template, self._update_state)]
+
+        for key, template in self._attribute_templates.items():
+            updaters.append((template, partial(self._update_attribute, key)))
+
+        for property_name, template in (
+            ("_icon", self._icon_template),
+            ("_entity_picture", self._entity_picture_template),
+            ("_name", self._friendly_name_template),
+            ("_available", self._availability_template),
+        ):
+            if template is not None:
+                updaters.append(
+                    (template, partial(self._update_property, property_name))
+                )
+
+        return updaters
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -220,66 +262,69 @@ class SensorTemplate(Entity):
 
     async def async_update(self):
         """Update the state from the template."""
-        try:
-            self._state = self._template.async_render()
-            self._available = True
-        except TemplateError as ex:
-            self._available = False
-            if ex.args and ex.args[0].startswith(
-                "UndefinedError: 'None' has no attribute"
-            ):
-                # Common during HA startup - so just a warning
-                _LOGGER.warning(
-                    "Could not render template %s, the state is unknown.", self._name
-                )
-            else:
-                self._state = None
-                _LOGGER.error("Could not render template %s: %s", self._name, ex)
+        self._attributes = {}
 
-        attrs = {}
-        for key, value in self._attribute_templates.items():
+        for template, update in self._template_updaters():
             try:
-                attrs[key] = value.async_render()
-            except TemplateError as err:
-                _LOGGER.error("Error rendering attribute %s: %s", key, err)
-
-        self._attributes = attrs
-
-        templates = {
-            "_icon": self._icon_template,
-            "_entity_picture": self._entity_picture_template,
-            "_name": self._friendly_name_template,
-            "_available": self._availability_template,
-        }
+                result = template.async_render()
+            except TemplateError as ex:
+                result = ex
+            update(result)
 
-        for property_name, template in templates.items():
-            if template is None:
-                continue
+    def _update_state(self, result):
+        """Apply a result of the state template."""
+        if not isinstance(result, TemplateError):
+            self._state = result
+            self._available = True
+            return
+
+        self._available = False
+        if result.args and result.args[0].startswith(
+            "UndefinedError: 'None' has no attribute"
+        ):
+            # Common during HA startup - so just a warning
+            _LOGGER.warning(
+                "Could not render template %s, the state is unknown.", self._name
+            )
+        else:
+            self._state = None
+            _LOGGER.error("Could not render template %s: %s", self._name, result)
+
+    def _update_attribute(self, key, result):
+        """Apply a result of an attribute template."""
+        if isinstance(result, TemplateError):
+            _LOGGER.error("Error rendering attribute %s: %s", key, result)
+            self._attributes.pop(key, None)
+            return
+
+        self._attributes[key] = result
+
+    def _update_property(self, property_name, result):
+        """Apply a result of the icon, picture, name or availability template."""
+        if not isinstance(result, TemplateError):
+            if property_name == "_available":
+                result = result.lower() == "true"
+            setattr(self, property_name, result)
+            return
+
+        friendly_property_name = property_name[1:].replace("_", " ")
+        if result.args and result.args[0].startswith(
+            "UndefinedError: 'None' has no attribute"
+        ):
+            # Common during HA startup - so just a warning
+            _LOGGER.warning(
+                "Could not render %s template %s, the state is unknown.",
+                friendly_property_name,
+                self._name,
+            )
+            return
 
-            try:
-                value = template.async_render()
-                if property_name == "_available":
-                    value = value.lower() == "true"
-                setattr(self, property_name, value)
-            except TemplateError as ex:
-                friendly_property_name = property_name[1:].replace("_", " ")
-                if ex.args and ex.args[0].startswith(
-                    "UndefinedError: 'None' has no attribute"
-                ):
-                    # Common during HA startup - so just a warning
-                    _LOGGER.warning(
-                        "Could not render %s template %s, the state is unknown.",
-                        friendly_property_name,
-                        self._name,
-                    )
-                    continue
-
-                try:
-                    setattr(self, property_name, getattr(super(), property_name))
-                except AttributeError:
-                    _LOGGER.error(
-                        "Could not render %s template %s: %s",
-                        friendly_property_name,
-                        self._name,
-                        ex,
-                    )
+        try:
+            setattr(self, property_name, getattr(super(), property_name))
+        except AttributeError:
+            _LOGGER.error(
+                "Could not render %s template %s: %s",
+                friendly_property_name,
+                self._name,
+                result,
+            )
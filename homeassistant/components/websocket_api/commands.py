@@ -9,7 +9,10 @@ from homeassistant.core import DOMAIN as HASS_DOMAIN, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceNotFound, Unauthorized
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.exporter import async_get_hub
 from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.helpers.startup_trace import DATA_STARTUP_TRACE
+from homeassistant.helpers.template import cache_stats
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 
 from . import const, decorators, messages
@@ -24,12 +27,16 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_unsubscribe_events)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_get_services)
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_manifest_get)
+    async_reg(hass, handle_startup_trace)
+    async_reg(hass, handle_exporter_metrics)
+    async_reg(hass, handle_template_cache_stats)
 
 
 def pong_message(iden):
@@ -65,7 +72,9 @@ def handle_subscribe_events(hass, connection, msg):
             ):
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event))
+            connection.send_message(
+                messages.cached_event_message(hass, msg["id"], event)
+            )
 
     else:
 
@@ -75,7 +84,9 @@ def handle_subscribe_events(hass, connection, msg):
             if event.event_type == EVENT_TIME_CHANGED:
                 return
 
-            connection.send_message(messages.event_message(msg["id"], event.as_dict()))
+            connection.send_message(
+                messages.cached_event_message(hass, msg["id"], event)
+            )
 
     connection.subscriptions[msg["id"]] = hass.bus.async_listen(
         event_type, forward_events
@@ -161,17 +172,72 @@ async def handle_call_service(hass, connection, msg):
 @decorators.websocket_command({vol.Required("type"): "get_states"})
 def handle_get_states(hass, connection, msg):
     """Handle get states command."""
+    states = _async_get_allowed_states(hass, connection)
+    connection.send_message(messages.result_message(msg["id"], states))
+
+
+@callback
+def _async_get_allowed_states(hass, connection):
+    """Return the states the user of the connection may read."""
     if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
-    else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
+        return hass.states.async_all()
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities followed by the changes.
+    """
+    entity_ids = set(msg["entity_ids"]) if "entity_ids" in msg else None
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward entity state changes to websocket."""
+        entity_id = event.data["entity_id"]
+        if entity_ids is not None and entity_id not in entity_ids:
+            return
+
+        if not connection.user.permissions.check_entity(entity_id, POLICY_READ):
+            return
+
+        connection.send_message(
+            messages.cached_state_diff_message(hass, msg["id"], event)
+        )
+
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, forward_entity_changes
+    )
+    connection.send_message(messages.result_message(msg["id"]))
+
+    states = _async_get_allowed_states(hass, connection)
+    connection.send_message(
+        messages.message_to_json(
+            messages.entities_message(
+                msg["id"],
+                {
+                    messages.ENTITY_EVENT_ADD: {
+                        state.entity_id: messages.compressed_state_dict(state)
+                        for state in states
+                        if entity_ids is None or state.entity_id in entity_ids
+                    }
+                },
+            )
+        )
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -219,6 +285,39 @@ async def handle_manifest_get(hass, connection, msg):
         connection.send_error(msg["id"], const.ERR_NOT_FOUND, "Integration not found")
 
 
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "startup_trace"})
+def handle_startup_trace(hass, connection, msg):
+    """Handle startup trace command."""
+    trace = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is None:
+        connection.send_error(
+            msg["id"], const.ERR_NOT_FOUND, "Startup trace is not enabled"
+        )
+        return
+    connection.send_result(msg["id"], trace.as_chrome_trace())
+
+
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "exporter/metrics"})
+def handle_exporter_metrics(hass, connection, msg):
+    """Handle exporter metrics command."""
+    connection.send_result(
+        msg["id"],
+        {pipeline.name: pipeline.metrics for pipeline in async_get_hub(hass).pipelines},
+    )
+
+
+@callback
+@decorators.require_admin
+@decorators.websocket_command({vol.Required("type"): "template/cache_stats"})
+def handle_template_cache_stats(hass, connection, msg):
+    """Handle template cache stats command."""
+    connection.send_result(msg["id"], cache_stats())
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(hass, connection, msg):
@@ -42,5 +42,8 @@ SIGNAL_WEBSOCKET_DISCONNECTED = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS = f"{DOMAIN}.connections"
+# Serialized event messages shared by the subscriptions
+DATA_EVENT_CACHE = f"{DOMAIN}.event_cache"
+DATA_STATE_DIFF_CACHE = f"{DOMAIN}.state_diff_cache"
 
 JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
@@ -1,13 +1,44 @@
 """Message templates for websocket commands."""
+import logging
+from typing import Any, Callable, Dict, Tuple
 
 import voluptuous as vol
 
+from homeassistant.core import Event, HomeAssistant, State
 from homeassistant.helpers import config_validation as cv
+from homeassistant.util.json import (
+    find_paths_unserializable_data,
+    format_unserializable_data,
+)
 
 from . import const
 
 # mypy: allow-untyped-defs
 
+_LOGGER = logging.getLogger(__name__)
+
+# Number of serialized events kept for the subscriptions
+EVENT_CACHE_SIZE = 128
+
+IDEN_TEMPLATE = "__IDEN__"
+IDEN_JSON_TEMPLATE = f'"{IDEN_TEMPLATE}"'
+
+# Keys of compressed states
+COMPRESSED_STATE_STATE = "s"
+COMPRESSED_STATE_ATTRIBUTES = "a"
+COMPRESSED_STATE_CONTEXT = "c"
+COMPRESSED_STATE_LAST_CHANGED = "lc"
+COMPRESSED_STATE_LAST_UPDATED = "lu"
+
+# Keys of entity events
+ENTITY_EVENT_ADD = "a"
+ENTITY_EVENT_REMOVE = "r"
+ENTITY_EVENT_CHANGE = "c"
+
+# Keys of state diffs
+STATE_DIFF_ADDITIONS = "+"
+STATE_DIFF_REMOVALS = "-"
+
 # Minimal requirements of a message
 MINIMAL_MESSAGE_SCHEMA = vol.Schema(
     {vol.Required("id"): cv.positive_int, vol.Required("type"): cv.string},
@@ -36,3 +67,135 @@ def error_message(iden, code, message):
 def event_message(iden, event):
     """Return an event message."""
     return {"id": iden, "type": "event", "event": event}
+
+
+def cached_event_message(hass: HomeAssistant, iden: int, event: Event) -> str:
+    """Return an event message serialized to JSON.
+
+    The event is serialized once and shared by all subscriptions, which
+    only differ in the id of the message.
+    """
+    return _cached_message(hass, const.DATA_EVENT_CACHE, iden, event, event_message)
+
+
+def cached_state_diff_message(hass: HomeAssistant, iden: int, event: Event) -> str:
+    """Return the entity event of a state_changed event serialized to JSON."""
+    return _cached_message(
+        hass,
+        const.DATA_STATE_DIFF_CACHE,
+        iden,
+        event,
+        lambda iden, event: entities_message(iden, state_diff_event(event)),
+    )
+
+
+def _cached_message(
+    hass: HomeAssistant,
+    key: str,
+    iden: int,
+    event: Event,
+    build: Callable[[Any, Event], Dict[str, Any]],
+) -> str:
+    """Serialize a message built from an event once and set its id.
+
+    Events are not hashable, so they are cached by id and the event is kept
+    alongside the payload to make sure the id was not reused.
+    """
+    cache: Dict[int, Tuple[Event, str]] = hass.data.setdefault(key, {})
+    cached = cache.get(id(event))
+    if cached is None or cached[0] is not event:
+        if len(cache) >= EVENT_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cached = cache[id(event)] = (
+            event,
+            message_to_json(build(IDEN_TEMPLATE, event)),
+        )
+
+    return cached[1].replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+def entities_message(iden, entities_event):
+    """Return an entities event message."""
+    return {"id": iden, "type": "event", "event": entities_event}
+
+
+def compressed_state_dict(state: State) -> Dict[str, Any]:
+    """Return a compact representation of a state.
+
+    Timestamps are seconds since the epoch. The last updated time is left
+    out when it is the same as the last changed time.
+    """
+    compressed = {
+        COMPRESSED_STATE_STATE: state.state,
+        COMPRESSED_STATE_ATTRIBUTES: dict(state.attributes),
+        COMPRESSED_STATE_CONTEXT: state.context.id,
+        COMPRESSED_STATE_LAST_CHANGED: state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed[COMPRESSED_STATE_LAST_UPDATED] = state.last_updated.timestamp()
+    return compressed
+
+
+def state_diff_event(event: Event) -> Dict[str, Any]:
+    """Return the entity event for a state_changed event.
+
+    New entities are sent as compressed states and removed entities by
+    their entity_id. Changed entities are sent as the keys that were added
+    or changed, and the attributes that were removed. A changed last
+    changed time also resets the last updated time.
+    """
+    entity_id = event.data["entity_id"]
+    new_state = event.data["new_state"]
+    old_state = event.data["old_state"]
+
+    if new_state is None:
+        return {ENTITY_EVENT_REMOVE: [entity_id]}
+    if old_state is None:
+        return {ENTITY_EVENT_ADD: {entity_id: compressed_state_dict(new_state)}}
+
+    additions: Dict[str, Any] = {}
+    if old_state.state != new_state.state:
+        additions[COMPRESSED_STATE_STATE] = new_state.state
+    if old_state.last_changed != new_state.last_changed:
+        additions[COMPRESSED_STATE_LAST_CHANGED] = new_state.last_changed.timestamp()
+    elif old_state.last_updated != new_state.last_updated:
+        additions[COMPRESSED_STATE_LAST_UPDATED] = new_state.last_updated.timestamp()
+    if old_state.context.id != new_state.context.id:
+        additions[COMPRESSED_STATE_CONTEXT] = new_state.context.id
+
+    old_attributes = old_state.attributes
+    new_attributes = new_state.attributes
+    changed_attributes = {
+        key: value
+        for key, value in new_attributes.items()
+        if key not in old_attributes or old_attributes[key] != value
+    }
+    if changed_attributes:
+        additions[COMPRESSED_STATE_ATTRIBUTES] = changed_attributes
+
+    diff: Dict[str, Any] = {}
+    if additions:
+        diff[STATE_DIFF_ADDITIONS] = additions
+    removed_attributes = [key for key in old_attributes if key not in new_attributes]
+    if removed_attributes:
+        diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed_attributes}
+
+    return {ENTITY_EVENT_CHANGE: {entity_id: diff}}
+
+
+def message_to_json(message: Dict[str, Any]) -> str:
+    """Serialize a websocket message to JSON."""
+    try:
+        return const.JSON_DUMP(message)
+    except (ValueError, TypeError):
+        _LOGGER.error(
+            "Unable to serialize to JSON. Bad data found at %s",
+            format_unserializable_data(
+                find_paths_unserializable_data(message, dump=const.JSON_DUMP)
+            ),
+        )
+        return const.JSON_DUMP(
+            error_message(
+                message["id"], const.ERR_UNKNOWN_ERROR, "Invalid JSON in response"
+            )
+        )
@@ -172,6 +172,51 @@ class CoreState(enum.Enum):
         return self.value  # type: ignore
 
 
+class HassJobType(enum.Enum):
+    """Represent a job type."""
+
+    Coroutine = 1
+    Coroutinefunction = 2
+    Callback = 3
+    Executor = 4
+
+
+class HassJob:
+    """Represent a job to be run later.
+
+    We check the callable type in advance
+    so we can avoid checking it every time
+    we run the job.
+    """
+
+    __slots__ = ("job_type", "target")
+
+    def __init__(self, target: Callable):
+        """Create a job object."""
+        self.target = target
+        self.job_type = _get_callable_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the job."""
+        return f"<Job {self.job_type} {self.target}>"
+
+
+def _get_callable_job_type(target: Callable) -> HassJobType:
+    """Determine the job type from the callable."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if asyncio.iscoroutine(check_target):
+        return HassJobType.Coroutine
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.Coroutinefunction
+    if is_callback(check_target):
+        return HassJobType.Callback
+    return HassJobType.Executor
+
+
 class HomeAssistant:
     """Root object of the Home Assistant home automation."""
 
@@ -342,6 +387,34 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Add a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Coroutine:
+            task = self.loop.create_task(hassjob.target)  # type: ignore
+        elif hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(hassjob.target(*args))
+        elif hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(hassjob.target, *args)
+            return None
+        else:
+            task = self.loop.run_in_executor(  # type: ignore
+                None, hassjob.target, *args
+            )
+
+        # If a task is scheduled
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
     @callback
     def async_create_task(self, target: Coroutine) -> asyncio.tasks.Task:
         """Create a task from within the eventloop.
@@ -548,12 +621,35 @@ class Event:
         )
 
 
+@attr.s(slots=True)
+class EventMetrics:
+    """Dispatch metrics of an event type."""
+
+    fires = attr.ib(type=int, default=0)
+    # Seconds spent dispatching the event and running its callbacks
+    dispatch_time = attr.ib(type=float, default=0.0)
+
+
+def _run_measured_callback(
+    metrics: EventMetrics, target: Callable, event: Event
+) -> None:
+    """Run an event listener callback and record how long it took."""
+    start = monotonic()
+    try:
+        target(event)
+    finally:
+        metrics.dispatch_time += monotonic() - start
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[Callable]] = {}
+        # Jobs to run per event type, rebuilt when listeners change
+        self._dispatch: Dict[str, List[HassJob]] = {}
+        self._metrics: Optional[Dict[str, EventMetrics]] = None
         self._hass = hass
 
     @callback
@@ -591,6 +687,29 @@ class EventBus:
     ) -> None:
         """Fire an event.
 
+        This method must be run in the event loop.
+        """
+        jobs = self._dispatch.get(event_type)
+
+        if jobs is None:
+            jobs = self._async_build_dispatch(event_type)
+
+        event = Event(event_type, event_data, origin, None, context)
+
+        if event_type != EVENT_TIME_CHANGED:
+            _LOGGER.debug("Bus:Handling %s", event)
+
+        if self._metrics is not None:
+            self._async_dispatch_measured(event, jobs)
+            return
+
+        for job in jobs:
+            self._hass.async_add_hass_job(job, event)
+
+    @callback
+    def _async_build_dispatch(self, event_type: str) -> List[HassJob]:
+        """Build and cache the jobs to run for an event type.
+
         This method must be run in the event loop.
         """
         listeners = self._listeners.get(event_type, [])
@@ -600,16 +719,80 @@ class EventBus:
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
 
-        event = Event(event_type, event_data, origin, None, context)
+        jobs = self._dispatch[event_type] = [HassJob(func) for func in listeners]
+        return jobs
 
-        if event_type != EVENT_TIME_CHANGED:
-            _LOGGER.debug("Bus:Handling %s", event)
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop cached jobs affected by a listener change of event_type.
 
-        if not listeners:
-            return
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+    @callback
+    def _async_dispatch_measured(self, event: Event, jobs: List[HassJob]) -> None:
+        """Dispatch an event and record the time it takes.
+
+        Callbacks are measured while they run, coroutine and executor
+        jobs only for the time it takes to schedule them.
+
+        This method must be run in the event loop.
+        """
+        assert self._metrics is not None
+        metrics = self._metrics.get(event.event_type)
+
+        if metrics is None:
+            metrics = self._metrics[event.event_type] = EventMetrics()
+
+        metrics.fires += 1
+        start = monotonic()
+
+        for job in jobs:
+            if job.job_type == HassJobType.Callback:
+                self._hass.loop.call_soon(
+                    _run_measured_callback, metrics, job.target, event
+                )
+            else:
+                self._hass.async_add_hass_job(job, event)
+
+        metrics.dispatch_time += monotonic() - start
+
+    @property
+    def metrics_enabled(self) -> bool:
+        """Return if dispatch metrics are recorded."""
+        return self._metrics is not None
+
+    @callback
+    def async_set_metrics_enabled(self, enabled: bool) -> None:
+        """Enable or disable recording dispatch metrics per event type.
+
+        Enabling resets previously recorded metrics.
+
+        This method must be run in the event loop.
+        """
+        self._metrics = {} if enabled else None
+
+    @callback
+    def async_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return the recorded dispatch metrics per event type.
+
+        This method must be run in the event loop.
+        """
+        if self._metrics is None:
+            return {}
+
+        return {
+            event_type: {
+                "fires": metrics.fires,
+                "listener_count": len(self._listeners.get(event_type, [])),
+                "dispatch_time": metrics.dispatch_time,
+            }
+            for event_type, metrics in self._metrics.items()
+        }
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -641,6 +824,8 @@ class EventBus:
         else:
             self._listeners[event_type] = [listener]
 
+        self._async_invalidate_dispatch(event_type)
+
         def remove_listener() -> None:
             """Remove the listener."""
             self._async_remove_listener(event_type, listener)
@@ -705,6 +890,8 @@ class EventBus:
             # delete event_type list if empty
             if not self._listeners[event_type]:
                 self._listeners.pop(event_type)
+
+            self._async_invalidate_dispatch(event_type)
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
@@ -1,7 +1,8 @@
 """Provide a way to connect entities belonging to one device."""
-from collections import OrderedDict
+from collections import UserDict
+from itertools import count
 import logging
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 import uuid
 
 import attr
@@ -77,6 +78,134 @@ class DeviceEntry:
     is_new: bool = attr.ib(default=False)
 
 
+class DeviceRegistryItems(UserDict):
+    """Container for device registry items, maps device id -> entry.
+
+    Maintains indexes on identifiers and connections, which are updated
+    whenever an entry is added, replaced or removed. Deleted devices are
+    kept in the same kind of container.
+    """
+
+    def __init__(
+        self,
+        entries: Optional[Dict[str, Union["DeviceEntry", "DeletedDeviceEntry"]]] = None,
+    ) -> None:
+        """Initialize the container."""
+        # Dicts are used as ordered sets of device ids, a value can be shared
+        self._identifier_index: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._connection_index: Dict[Tuple[str, str], Dict[str, None]] = {}
+        # Registration order of the entries, lookups prefer the earliest
+        self._order: Dict[str, int] = {}
+        self._next_order = count()
+        super().__init__(entries)
+
+    def __setitem__(
+        self, key: str, entry: Union["DeviceEntry", "DeletedDeviceEntry"]
+    ) -> None:
+        """Add or replace an entry."""
+        old = self.data.get(key)
+        self.data[key] = entry
+
+        if old is not None:
+            self._unindex(key, old)
+        else:
+            self._order[key] = next(self._next_order)
+        for identifier in entry.identifiers:
+            self._identifier_index.setdefault(identifier, {})[key] = None
+        for connection in entry.connections:
+            self._connection_index.setdefault(connection, {})[key] = None
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an entry."""
+        self._unindex(key, self.data.pop(key))
+        del self._order[key]
+
+    def _unindex(self, key: str, entry: Union["DeviceEntry", "DeletedDeviceEntry"]):
+        """Remove the identifiers and connections of an entry from the indexes."""
+        for index, values in (
+            (self._identifier_index, entry.identifiers),
+            (self._connection_index, entry.connections),
+        ):
+            for value in values:
+                _remove_from_index(index, value, key)
+
+    def get_entry(
+        self,
+        identifiers: Iterable[Tuple[str, str]],
+        connections: Iterable[Tuple[str, str]],
+    ) -> Optional[Union["DeviceEntry", "DeletedDeviceEntry"]]:
+        """Return the earliest entry matching any identifier or connection."""
+        keys = {
+            key
+            for index, values in (
+                (self._identifier_index, identifiers),
+                (self._connection_index, connections),
+            )
+            for value in values
+            for key in index.get(value, ())
+        }
+        if not keys:
+            return None
+        return self.data[min(keys, key=self._order.__getitem__)]
+
+
+class ActiveDeviceRegistryItems(DeviceRegistryItems):
+    """Container for device registry items with config entry and area indexes."""
+
+    def __init__(self, entries: Optional[Dict[str, "DeviceEntry"]] = None) -> None:
+        """Initialize the container."""
+        # Dicts are used as ordered sets of device ids
+        self._config_entry_index: Dict[str, Dict[str, None]] = {}
+        self._area_index: Dict[str, Dict[str, None]] = {}
+        super().__init__(entries)  # type: ignore
+
+    def __setitem__(self, key: str, entry: "DeviceEntry") -> None:  # type: ignore
+        """Add or replace an entry."""
+        old = self.data.get(key)
+        super().__setitem__(key, entry)
+
+        if old is not None:
+            for config_entry_id in old.config_entries - entry.config_entries:
+                _remove_from_index(self._config_entry_index, config_entry_id, key)
+            if old.area_id != entry.area_id:
+                _remove_from_index(self._area_index, old.area_id, key)
+
+        for config_entry_id in entry.config_entries:
+            self._config_entry_index.setdefault(config_entry_id, {})[key] = None
+        if entry.area_id is not None:
+            self._area_index.setdefault(entry.area_id, {})[key] = None
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an entry."""
+        entry = self.data[key]
+        super().__delitem__(key)
+        for config_entry_id in entry.config_entries:
+            _remove_from_index(self._config_entry_index, config_entry_id, key)
+        _remove_from_index(self._area_index, entry.area_id, key)
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> List["DeviceEntry"]:
+        """Return the entries of a config entry."""
+        return [
+            self.data[key] for key in self._config_entry_index.get(config_entry_id, ())
+        ]
+
+    def get_entries_for_area_id(self, area_id: str) -> List["DeviceEntry"]:
+        """Return the entries of an area."""
+        return [self.data[key] for key in self._area_index.get(area_id, ())]
+
+
+def _remove_from_index(index: Dict[Any, Dict[str, None]], value: Any, key: str) -> None:
+    """Remove a key from the keys indexed under a value."""
+    keys = index.get(value)
+    if keys is None:
+        return
+    keys.pop(key, None)
+    if not keys:
+        del index[value]
+
+
 def format_mac(mac: str) -> str:
     """Format the mac address string for entry into dev reg."""
     to_test = mac
@@ -100,8 +229,8 @@ def format_mac(mac: str) -> str:
 class DeviceRegistry:
     """Class to hold a registry of devices."""
 
-    devices: Dict[str, DeviceEntry]
-    deleted_devices: Dict[str, DeletedDeviceEntry]
+    devices: ActiveDeviceRegistryItems
+    deleted_devices: DeviceRegistryItems
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -118,24 +247,16 @@ class DeviceRegistry:
         self, identifiers: set, connections: set
     ) -> Optional[DeviceEntry]:
         """Check if device is registered."""
-        for device in self.devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or any(
-                conn in device.connections for conn in connections
-            ):
-                return device
-        return None
+        return self.devices.get_entry(identifiers, connections)  # type: ignore
 
     @callback
     def _async_get_deleted_device(
         self, identifiers: set, connections: set
     ) -> Optional[DeletedDeviceEntry]:
         """Check if device has previously been registered."""
-        for device in self.deleted_devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or any(
-                conn in device.connections for conn in connections
-            ):
-                return device
-        return None
+        return self.deleted_devices.get_entry(  # type: ignore
+            identifiers, connections
+        )
 
     @callback
     def async_get_or_create(
@@ -339,8 +460,8 @@ class DeviceRegistry:
 
         data = await self._store.async_load()
 
-        devices = OrderedDict()
-        deleted_devices = OrderedDict()
+        devices = ActiveDeviceRegistryItems()
+        deleted_devices = DeviceRegistryItems()
 
         if data is not None:
             for device in data["devices"]:
@@ -418,7 +539,7 @@ class DeviceRegistry:
     @callback
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
-        for device in list(self.devices.values()):
+        for device in self.devices.get_entries_for_config_entry_id(config_entry_id):
             self._async_update_device(device.id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
@@ -437,9 +558,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for device in self.devices.get_entries_for_area_id(area_id):
+            self._async_update_device(device.id, area_id=None)
 
 
 @singleton(DATA_REGISTRY)
@@ -453,7 +573,7 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    return registry.devices.get_entries_for_area_id(area_id)
 
 
 @callback
@@ -461,11 +581,7 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
-    return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
-    ]
+    return registry.devices.get_entries_for_config_entry_id(config_entry_id)
 
 
 @callback
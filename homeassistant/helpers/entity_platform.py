@@ -9,7 +9,7 @@ from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
 from homeassistant.const import DEVICE_DEFAULT_NAME
 from homeassistant.core import CALLBACK_TYPE, callback, split_entity_id, valid_entity_id
 from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
-from homeassistant.helpers import config_validation as cv, service
+from homeassistant.helpers import config_validation as cv, service, startup_trace
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
 
@@ -173,9 +173,10 @@ class EntityPlatform:
         )
 
         try:
-            task = async_create_setup_task()
+            with startup_trace.async_span(hass, full_name, "setup") as span:
+                task = span.timed(async_create_setup_task())
 
-            await asyncio.wait_for(asyncio.shield(task), SLOW_SETUP_MAX_WAIT)
+                await asyncio.wait_for(asyncio.shield(task), SLOW_SETUP_MAX_WAIT)
 
             # Block till all entities are done
             if self._tasks:
@@ -289,7 +290,13 @@ class EntityPlatform:
         if not tasks:
             return
 
-        await asyncio.gather(*tasks)
+        with startup_trace.async_span(
+            hass,
+            f"{self.domain}.{self.platform_name}",
+            "add_entities",
+            entities=len(tasks),
+        ) as span:
+            await asyncio.gather(*(span.timed(task) for task in tasks))
 
         if self._async_unsub_polling is not None or not any(
             entity.should_poll for entity in self.entities.values()
@@ -449,6 +456,13 @@ class EntityPlatform:
         await entity.async_added_to_hass()
 
         entity.async_write_ha_state()
+        startup_trace.async_mark(
+            self.hass,
+            f"{self.domain}.{self.platform_name}",
+            "first_state",
+            once=True,
+            entity_id=entity_id,
+        )
 
     async def async_reset(self) -> None:
         """Remove all entities and reset data.
@@ -7,7 +7,7 @@ The Entity Registry will persist itself 10 seconds after a new entity is
 registered. Registering a new entity while a timer is in progress resets the
 timer.
 """
-from collections import OrderedDict
+from collections import UserDict
 import logging
 from typing import (
     TYPE_CHECKING,
@@ -118,13 +118,106 @@ class RegistryEntry:
         return self.disabled_by is not None
 
 
+class EntityRegistryItems(UserDict):
+    """Container for entity registry items, maps entity_id -> entry.
+
+    Maintains indexes on the (domain, platform, unique_id) key, the device id
+    and the config entry id, which are updated whenever an entry is added,
+    replaced or removed.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, RegistryEntry]] = None) -> None:
+        """Initialize the container."""
+        self._unique_id_index: Dict[Tuple[str, str, str], str] = {}
+        # Dicts are used as ordered sets of entity ids
+        self._device_id_index: Dict[str, Dict[str, None]] = {}
+        self._config_entry_id_index: Dict[str, Dict[str, None]] = {}
+        super().__init__(entries)
+
+    def __setitem__(self, key: str, entry: RegistryEntry) -> None:
+        """Add or replace an entry."""
+        old = self.data.get(key)
+        self.data[key] = entry
+
+        if old is not None:
+            if _unique_id_key(old) != _unique_id_key(entry):
+                self._remove_unique_id(key, old)
+            if old.device_id != entry.device_id:
+                _remove_from_index(self._device_id_index, old.device_id, key)
+            if old.config_entry_id != entry.config_entry_id:
+                _remove_from_index(
+                    self._config_entry_id_index, old.config_entry_id, key
+                )
+
+        self._unique_id_index.setdefault(_unique_id_key(entry), key)
+        _add_to_index(self._device_id_index, entry.device_id, key)
+        _add_to_index(self._config_entry_id_index, entry.config_entry_id, key)
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an entry."""
+        entry = self.data.pop(key)
+        self._remove_unique_id(key, entry)
+        _remove_from_index(self._device_id_index, entry.device_id, key)
+        _remove_from_index(self._config_entry_id_index, entry.config_entry_id, key)
+
+    def _remove_unique_id(self, key: str, entry: RegistryEntry) -> None:
+        """Remove an entry from the unique id index."""
+        unique_id_key = _unique_id_key(entry)
+        if self._unique_id_index.get(unique_id_key) == key:
+            del self._unique_id_index[unique_id_key]
+
+    def get_entity_id(
+        self, domain: str, platform: str, unique_id: str
+    ) -> Optional[str]:
+        """Return the entity_id registered for a unique id."""
+        return self._unique_id_index.get((domain, platform, unique_id))
+
+    def get_entries_for_device_id(self, device_id: str) -> List[RegistryEntry]:
+        """Return the entries of a device."""
+        return [self.data[key] for key in self._device_id_index.get(device_id, ())]
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> List[RegistryEntry]:
+        """Return the entries of a config entry."""
+        return [
+            self.data[key]
+            for key in self._config_entry_id_index.get(config_entry_id, ())
+        ]
+
+
+def _unique_id_key(entry: RegistryEntry) -> Tuple[str, str, str]:
+    """Return the key an entry is indexed by in the unique id index."""
+    return (entry.domain, entry.platform, entry.unique_id)
+
+
+def _add_to_index(
+    index: Dict[str, Dict[str, None]], value: Optional[str], key: str
+) -> None:
+    """Add a key to the keys indexed under a value."""
+    if value is not None:
+        index.setdefault(value, {})[key] = None
+
+
+def _remove_from_index(
+    index: Dict[str, Dict[str, None]], value: Optional[str], key: str
+) -> None:
+    """Remove a key from the keys indexed under a value."""
+    keys = index.get(value)  # type: ignore
+    if keys is None:
+        return
+    keys.pop(key, None)
+    if not keys:
+        del index[value]  # type: ignore
+
+
 class EntityRegistry:
     """Class to hold a registry of entities."""
 
     def __init__(self, hass: HomeAssistantType):
         """Initialize the registry."""
         self.hass = hass
-        self.entities: Dict[str, RegistryEntry]
+        self.entities: EntityRegistryItems
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_removed
@@ -161,14 +254,7 @@ class EntityRegistry:
         self, domain: str, platform: str, unique_id: str
     ) -> Optional[str]:
         """Check if an entity_id is currently registered."""
-        for entity in self.entities.values():
-            if (
-                entity.domain == domain
-                and entity.platform == platform
-                and entity.unique_id == unique_id
-            ):
-                return entity.entity_id
-        return None
+        return self.entities.get_entity_id(domain, platform, unique_id)
 
     @callback
     def async_generate_entity_id(
@@ -381,20 +467,13 @@ class EntityRegistry:
             entity_id = changes["entity_id"] = new_entity_id
 
         if new_unique_id is not _UNDEF:
-            conflict = next(
-                (
-                    entity
-                    for entity in self.entities.values()
-                    if entity.unique_id == new_unique_id
-                    and entity.domain == old.domain
-                    and entity.platform == old.platform
-                ),
-                None,
+            conflict_entity_id = self.async_get_entity_id(
+                old.domain, old.platform, new_unique_id
             )
-            if conflict:
+            if conflict_entity_id:
                 raise ValueError(
                     f"Unique id '{new_unique_id}' is already in use by "
-                    f"'{conflict.entity_id}'"
+                    f"'{conflict_entity_id}'"
                 )
             changes["unique_id"] = new_unique_id
 
@@ -424,7 +503,7 @@ class EntityRegistry:
             old_conf_load_func=load_yaml,
             old_conf_migrate_func=_async_migrate,
         )
-        entities: Dict[str, RegistryEntry] = OrderedDict()
+        entities = EntityRegistryItems()
 
         if data is not None:
             for entity in data["entities"]:
@@ -488,12 +567,8 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in self.entities.get_entries_for_config_entry_id(config_entry):
+            self.async_remove(entry.entity_id)
 
 
 @singleton(DATA_REGISTRY)
@@ -509,9 +584,7 @@ def async_entries_for_device(
     registry: EntityRegistry, device_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [
-        entry for entry in registry.entities.values() if entry.device_id == device_id
-    ]
+    return registry.entities.get_entries_for_device_id(device_id)
 
 
 @callback
@@ -519,11 +592,7 @@ def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> List[RegistryEntry]:
     """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    return registry.entities.get_entries_for_config_entry_id(config_entry_id)
 
 
 async def _async_migrate(entities: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
@@ -604,10 +673,7 @@ async def async_migrate_entries(
     """Migrator of unique IDs."""
     ent_reg = await async_get_registry(hass)
 
-    for entry in ent_reg.entities.values():
-        if entry.config_entry_id != config_entry_id:
-            continue
-
+    for entry in ent_reg.entities.get_entries_for_config_entry_id(config_entry_id):
         updates = entry_callback(entry)
 
         if updates is not None:
@@ -1,8 +1,20 @@
 """Helpers for listening to events."""
 from datetime import datetime, timedelta
 import functools as ft
+from heapq import heapify, heappop, heappush
+from itertools import count
 import logging
-from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 import attr
 
@@ -15,15 +27,34 @@ from homeassistant.const import (
     SUN_EVENT_SUNRISE,
     SUN_EVENT_SUNSET,
 )
-from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+    split_entity_id,
+)
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.sun import get_astral_event_next
-from homeassistant.helpers.template import Template
+from homeassistant.helpers.template import RenderInfo, Template
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
 TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
 TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
+TRACK_STATE_LIFECYCLE_CALLBACKS = "track_state_lifecycle_callbacks"
+TRACK_STATE_LIFECYCLE_LISTENER = "track_state_lifecycle_listener"
+TRACK_POINT_IN_TIME_SCHEDULER = "track_point_in_time_scheduler"
+TRACK_TIME_PATTERN_SCHEDULER = "track_time_pattern_scheduler"
+
+# Rebuild the heap once it holds more cancelled than pending listeners
+# and at least this many of them.
+SCHEDULER_COMPACT_THRESHOLD = 64
+
+# Templates iterating all states are rendered at most once per this period
+ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -228,6 +259,217 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+@bind_hass
+def async_track_state_lifecycle(
+    hass: HomeAssistant,
+    domains: Union[str, Iterable[str]],
+    action: Callable[[Event], None],
+) -> Callable[[], None]:
+    """Track entities being added to or removed from the state machine.
+
+    Domains can be MATCH_ALL to track the entities of all domains. Like
+    async_track_state_change_event, a single listener routes the events
+    by domain.
+    """
+    domain_callbacks = hass.data.setdefault(TRACK_STATE_LIFECYCLE_CALLBACKS, {})
+
+    if TRACK_STATE_LIFECYCLE_LISTENER not in hass.data:
+
+        @callback
+        def _async_state_lifecycle_dispatcher(event: Event) -> None:
+            """Dispatch entities added or removed by domain."""
+            if (
+                event.data.get("old_state") is not None
+                and event.data.get("new_state") is not None
+            ):
+                return
+
+            domain = split_entity_id(event.data["entity_id"])[0]
+
+            for key in (domain, MATCH_ALL):
+                for action in domain_callbacks.get(key, ()):
+                    try:
+                        hass.async_run_job(action, event)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception(
+                            "Error while processing state lifecycle for %s", domain
+                        )
+
+        hass.data[TRACK_STATE_LIFECYCLE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_lifecycle_dispatcher
+        )
+
+    if isinstance(domains, str):
+        domains = [domains]
+    domains = [domain.lower() for domain in domains]
+
+    for domain in domains:
+        domain_callbacks.setdefault(domain, []).append(action)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove state lifecycle listener."""
+        for domain in domains:
+            domain_callbacks[domain].remove(action)
+            if not domain_callbacks[domain]:
+                del domain_callbacks[domain]
+
+        if not domain_callbacks:
+            hass.data.pop(TRACK_STATE_LIFECYCLE_LISTENER)()
+
+    return remove_listener
+
+
+class TrackTemplateResultInfo:
+    """Track the result of a template using the info of its last render.
+
+    After every render the listeners are updated to the entities the render
+    accessed, and to entities being added or removed in the domains it
+    iterated. Templates iterating all states are rendered at most once per
+    ALL_STATES_RATE_LIMIT.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        template: Template,
+        action: Callable[[Optional[Event], Any], None],
+        variables: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.template = template
+        self._action = action
+        self._variables = variables
+        self._info: Optional[RenderInfo] = None
+        self._last_result: Any = None
+        self._last_render: Optional[datetime] = None
+        self._entities: FrozenSet[str] = frozenset()
+        self._lifecycle_domains: Any = frozenset()
+        self._unsub_entities: Optional[CALLBACK_TYPE] = None
+        self._unsub_lifecycle: Optional[CALLBACK_TYPE] = None
+        self._unsub_rate_limit: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def entities(self) -> FrozenSet[str]:
+        """Return the entities tracked."""
+        return self._entities
+
+    @property
+    def lifecycle_domains(self) -> Any:
+        """Return the domains, or MATCH_ALL, tracked for added or removed entities."""
+        return self._lifecycle_domains
+
+    @callback
+    def async_refresh(self) -> None:
+        """Render the template now and call the action if the result changed."""
+        self._async_render(None)
+
+    @callback
+    def async_remove(self) -> None:
+        """Remove all listeners."""
+        for unsub in (
+            self._unsub_entities,
+            self._unsub_lifecycle,
+            self._unsub_rate_limit,
+        ):
+            if unsub is not None:
+                unsub()
+        self._unsub_entities = self._unsub_lifecycle = self._unsub_rate_limit = None
+        self._entities = self._lifecycle_domains = frozenset()
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Render the template when a tracked entity changes."""
+        if self._unsub_rate_limit is not None:
+            # A render is already scheduled
+            return
+
+        if (
+            self._info is not None
+            and self._info.all_states
+            and self._last_render is not None
+        ):
+            next_render = self._last_render + ALL_STATES_RATE_LIMIT
+            if next_render > dt_util.utcnow():
+                self._unsub_rate_limit = async_track_point_in_utc_time(
+                    self.hass, self._async_rate_limit_done, next_render
+                )
+                return
+
+        self._async_render(event)
+
+    @callback
+    def _async_rate_limit_done(self, now: datetime) -> None:
+        """Render the template after changes were held back."""
+        self._unsub_rate_limit = None
+        self._async_render(None)
+
+    @callback
+    def _async_render(self, event: Optional[Event]) -> None:
+        """Render the template and update the listeners."""
+        info = self._info = self.template.async_render_to_info(self._variables)
+        self._last_render = dt_util.utcnow()
+        self._async_update_listeners(info)
+
+        try:
+            result = info.result
+        except TemplateError as ex:
+            result = ex
+
+        if not isinstance(result, TemplateError) and result == self._last_result:
+            return
+
+        self._last_result = result
+        self.hass.async_run_job(self._action, event, result)
+
+    @callback
+    def _async_update_listeners(self, info: RenderInfo) -> None:
+        """Track the entities and domains of the last render."""
+        entities = info.entities
+        if entities != self._entities:
+            if self._unsub_entities is not None:
+                self._unsub_entities()
+                self._unsub_entities = None
+            if entities:
+                self._unsub_entities = async_track_state_change_event(
+                    self.hass, entities, self._async_state_changed
+                )
+            self._entities = entities
+
+        domains = MATCH_ALL if info.all_states else info.domains
+        if domains != self._lifecycle_domains:
+            if self._unsub_lifecycle is not None:
+                self._unsub_lifecycle()
+                self._unsub_lifecycle = None
+            if domains:
+                self._unsub_lifecycle = async_track_state_lifecycle(
+                    self.hass, domains, self._async_state_changed
+                )
+            self._lifecycle_domains = domains
+
+
+@callback
+@bind_hass
+def async_track_template_result(
+    hass: HomeAssistant,
+    template: Template,
+    action: Callable[[Optional[Event], Any], None],
+    variables: Optional[Dict[str, Any]] = None,
+) -> TrackTemplateResultInfo:
+    """Render a template and call action each time its result changes.
+
+    The action is called with the state changed event that caused the new
+    render, or None, and the result, which is a TemplateError when the
+    render failed. The template is rendered once right away.
+
+    Call async_remove on the returned tracker to stop tracking.
+    """
+    tracker = TrackTemplateResultInfo(hass, template, action, variables)
+    tracker.async_refresh()
+    return tracker
+
+
 @callback
 @bind_hass
 def async_track_same_state(
@@ -306,6 +548,129 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class PointInTimeScheduler:
+    """Run point in time listeners from a single time changed listener.
+
+    Listeners are kept in a heap ordered by their point in time, so a
+    time changed event only has to look at the listeners that are due
+    instead of running a job per listener every second.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        # Entries are [point_in_time, sequence, action]. The action is set to
+        # None once the entry has run or was cancelled.
+        self._heap: List[List[Any]] = []
+        self._sequence = count()
+        self._pending = 0
+        self._unsub_time: Optional[CALLBACK_TYPE] = None
+        self.last_lateness: Optional[timedelta] = None
+        self.max_lateness = timedelta(0)
+
+    @property
+    def pending(self) -> int:
+        """Return the number of listeners that still have to fire."""
+        return self._pending
+
+    @callback
+    def async_schedule(
+        self, action: Callable[..., Any], point_in_time: datetime
+    ) -> CALLBACK_TYPE:
+        """Schedule action to run once at point_in_time (UTC)."""
+        entry = [point_in_time, next(self._sequence), action]
+        heappush(self._heap, entry)
+        self._pending += 1
+
+        if self._unsub_time is None:
+            self._unsub_time = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def cancel() -> None:
+            """Cancel the scheduled action."""
+            if entry[2] is None:
+                return
+            entry[2] = None
+            self._pending -= 1
+            if self._pending:
+                self._async_compact()
+            else:
+                self._async_check_idle()
+
+        return cancel
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop cancelled entries when they make up most of the heap."""
+        cancelled = len(self._heap) - self._pending
+        if cancelled < SCHEDULER_COMPACT_THRESHOLD or cancelled < self._pending:
+            return
+
+        self._heap = [entry for entry in self._heap if entry[2] is not None]
+        heapify(self._heap)
+
+    @callback
+    def _async_check_idle(self) -> None:
+        """Stop listening for time changes when nothing is scheduled."""
+        if self._pending or self._unsub_time is None:
+            return
+
+        self._unsub_time()
+        self._unsub_time = None
+        self._heap = []
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run all listeners that are due."""
+        now = event.data[ATTR_NOW]
+        heap = self._heap
+        due = []
+
+        # Collect due entries before running them, so listeners scheduled by
+        # the actions only run on the next time changed event.
+        while heap and heap[0][0] <= now:
+            due.append(heappop(heap))
+
+        for entry in due:
+            point_in_time, _, action = entry
+            # Entry could have been cancelled by an action that ran before it
+            if action is None:
+                continue
+
+            entry[2] = None
+            self._pending -= 1
+
+            lateness = now - point_in_time
+            self.last_lateness = lateness
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+
+            try:
+                self.hass.async_run_job(action, now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running point in time listener %s", action)
+
+        self._async_check_idle()
+
+
+@callback
+@bind_hass
+def async_get_point_in_time_scheduler(hass: HomeAssistant) -> PointInTimeScheduler:
+    """Return the point in time scheduler, creating it if needed."""
+    scheduler: Optional[PointInTimeScheduler] = hass.data.get(
+        TRACK_POINT_IN_TIME_SCHEDULER
+    )
+
+    if scheduler is None:
+        scheduler = hass.data[TRACK_POINT_IN_TIME_SCHEDULER] = PointInTimeScheduler(
+            hass
+        )
+
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -315,27 +680,7 @@ def async_track_point_in_utc_time(
     # Ensure point_in_time is UTC
     point_in_time = dt_util.as_utc(point_in_time)
 
-    @callback
-    def point_in_time_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, "run"):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        setattr(point_in_time_listener, "run", True)
-        async_unsub()
-
-        hass.async_run_job(action, now)
-
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED, point_in_time_listener)
-
-    return async_unsub
+    return async_get_point_in_time_scheduler(hass).async_schedule(action, point_in_time)
 
 
 track_point_in_utc_time = threaded_listener_factory(async_track_point_in_utc_time)
@@ -476,6 +821,169 @@ def async_track_sunset(
 track_sunset = threaded_listener_factory(async_track_sunset)
 
 
+@attr.s(slots=True)
+class _TimePattern:
+    """A time pattern tracked by the time pattern scheduler."""
+
+    action: Callable[..., None] = attr.ib()
+    seconds: List[int] = attr.ib()
+    minutes: List[int] = attr.ib()
+    hours: List[int] = attr.ib()
+    local: bool = attr.ib()
+    cancelled: bool = attr.ib(default=False)
+
+    def next_fire(self, now: datetime) -> datetime:
+        """Return the first time at or after now that matches the pattern."""
+        localized_now = dt_util.as_local(now) if self.local else now
+        return dt_util.find_next_time_expression_time(
+            localized_now, self.seconds, self.minutes, self.hours
+        )
+
+
+class TimePatternScheduler:
+    """Run time pattern listeners from a single time changed listener.
+
+    The next fire time of every pattern is kept in a heap, so a time changed
+    event only has to look at the patterns that are due.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        # Entries are [next_fire, sequence, pattern]
+        self._heap: List[List[Any]] = []
+        # Patterns that calculate their next fire time on the next event
+        self._new: List[_TimePattern] = []
+        self._sequence = count()
+        self._tracked = 0
+        # Make sure rolling back the clock doesn't prevent the patterns from
+        # triggering.
+        self._last_now: Optional[datetime] = None
+        self._unsub_time: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def tracked(self) -> int:
+        """Return the number of tracked patterns."""
+        return self._tracked
+
+    @callback
+    def async_track(self, pattern: _TimePattern) -> CALLBACK_TYPE:
+        """Track a time pattern."""
+        # The next fire time is calculated from the time of the first event
+        # we receive, not from the current time.
+        self._new.append(pattern)
+        self._tracked += 1
+
+        if self._unsub_time is None:
+            self._unsub_time = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed
+            )
+
+        @callback
+        def cancel() -> None:
+            """Stop tracking the time pattern."""
+            if pattern.cancelled:
+                return
+            pattern.cancelled = True
+            self._tracked -= 1
+            if self._tracked:
+                self._async_compact()
+            else:
+                self._async_check_idle()
+
+        return cancel
+
+    @callback
+    def _async_push(self, pattern: _TimePattern, now: datetime) -> None:
+        """Add a pattern to the heap with its next fire time from now."""
+        heappush(self._heap, [pattern.next_fire(now), next(self._sequence), pattern])
+
+    @callback
+    def _async_compact(self) -> None:
+        """Drop cancelled patterns when they make up most of the heap."""
+        cancelled = len(self._heap) + len(self._new) - self._tracked
+        if cancelled < SCHEDULER_COMPACT_THRESHOLD or cancelled < self._tracked:
+            return
+
+        self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+        heapify(self._heap)
+        self._new = [pattern for pattern in self._new if not pattern.cancelled]
+
+    @callback
+    def _async_check_idle(self) -> None:
+        """Stop listening for time changes when no patterns are tracked."""
+        if self._tracked or self._unsub_time is None:
+            return
+
+        self._unsub_time()
+        self._unsub_time = None
+        self._heap = []
+        self._new = []
+        self._last_now = None
+
+    @callback
+    def _async_time_changed(self, event: Event) -> None:
+        """Run all patterns that are due."""
+        now = event.data[ATTR_NOW]
+
+        if self._last_now is not None and now < self._last_now:
+            # Time rolled back, recalculate all next fire times
+            patterns = [entry[2] for entry in self._heap if not entry[2].cancelled]
+            self._heap = []
+            for pattern in patterns:
+                self._async_push(pattern, now)
+
+        self._last_now = now
+
+        new, self._new = self._new, []
+        for pattern in new:
+            if not pattern.cancelled:
+                self._async_push(pattern, now)
+
+        heap = self._heap
+        due = []
+
+        while heap and heap[0][0] <= now:
+            due.append(heappop(heap)[2])
+
+        if not due:
+            return
+
+        fire_now = dt_util.as_local(now)
+        next_now = now + timedelta(seconds=1)
+
+        for pattern in due:
+            # Pattern could have been cancelled by an action that ran before it
+            if pattern.cancelled:
+                continue
+
+            try:
+                self.hass.async_run_job(
+                    pattern.action, fire_now if pattern.local else now
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running time pattern listener %s", pattern)
+
+            if not pattern.cancelled:
+                self._async_push(pattern, next_now)
+
+        self._async_check_idle()
+
+
+@callback
+@bind_hass
+def async_get_time_pattern_scheduler(hass: HomeAssistant) -> TimePatternScheduler:
+    """Return the time pattern scheduler, creating it if needed."""
+    scheduler: Optional[TimePatternScheduler] = hass.data.get(
+        TRACK_TIME_PATTERN_SCHEDULER
+    )
+
+    if scheduler is None:
+        scheduler = hass.data[TRACK_TIME_PATTERN_SCHEDULER] = TimePatternScheduler(hass)
+
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -502,42 +1010,9 @@ def async_track_utc_time_change(
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    next_time = None
-
-    def calculate_next(now: datetime) -> None:
-        """Calculate and set the next time the trigger should fire."""
-        nonlocal next_time
-
-        localized_now = dt_util.as_local(now) if local else now
-        next_time = dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
-        )
-
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now: Optional[datetime] = None
-
-    @callback
-    def pattern_time_change_listener(event: Event) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
-
-        now = event.data[ATTR_NOW]
-
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
-            calculate_next(now)
-
-        last_now = now
-
-        if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
-            calculate_next(now + timedelta(seconds=1))
-
-    # We can't use async_track_point_in_utc_time here because it would
-    # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED, pattern_time_change_listener)
+    return async_get_time_pattern_scheduler(hass).async_track(
+        _TimePattern(action, matching_seconds, matching_minutes, matching_hours, local)
+    )
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
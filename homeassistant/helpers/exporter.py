@@ -0,0 +1,376 @@
+"""Helper to export state changes to external systems in batches.
+
+All exporters share one state_changed listener. Each event is wrapped in
+one ExportEvent that is passed to every pipeline.
+"""
+import asyncio
+from collections import deque
+from logging import Logger
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+import voluptuous as vol
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+
+DATA_EXPORT_HUB = "export_hub"
+
+CONF_BATCH_SIZE = "batch_size"
+CONF_LINGER = "linger"
+CONF_MAX_IN_FLIGHT = "max_in_flight"
+CONF_MAX_BACKLOG = "max_backlog"
+CONF_DROP_POLICY = "drop_policy"
+
+DROP_OLDEST = "oldest"
+DROP_NEWEST = "newest"
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_LINGER = 1.0
+DEFAULT_MAX_IN_FLIGHT = 1
+DEFAULT_MAX_BACKLOG = 10000
+DEFAULT_RETRY_DELAY = 20
+
+# Weight of the last batch in the throughput metric
+THROUGHPUT_SMOOTHING = 0.2
+
+EXPORTER_SCHEMA = {
+    vol.Optional(CONF_BATCH_SIZE, default=DEFAULT_BATCH_SIZE): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+    vol.Optional(CONF_LINGER, default=DEFAULT_LINGER): vol.All(
+        vol.Coerce(float), vol.Range(min=0)
+    ),
+    vol.Optional(CONF_MAX_IN_FLIGHT, default=DEFAULT_MAX_IN_FLIGHT): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+    vol.Optional(CONF_MAX_BACKLOG, default=DEFAULT_MAX_BACKLOG): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+    vol.Optional(CONF_DROP_POLICY, default=DROP_OLDEST): vol.In(
+        [DROP_OLDEST, DROP_NEWEST]
+    ),
+}
+
+
+class ExportError(HomeAssistantError):
+    """Error writing a batch which is worth retrying."""
+
+
+class ExportEvent:
+    """A state_changed event waiting to be exported."""
+
+    __slots__ = ("event", "received")
+
+    def __init__(self, event: Event) -> None:
+        """Initialize the export event."""
+        self.event = event
+        self.received = time.monotonic()
+
+    @property
+    def state(self) -> Optional[State]:
+        """Return the new state."""
+        return self.event.data.get("new_state")
+
+    @property
+    def entity_id(self) -> Optional[str]:
+        """Return the entity_id of the state that changed."""
+        state = self.state
+        if state is not None:
+            return state.entity_id
+        return self.event.data.get("entity_id")
+
+
+class ExportHub:
+    """Dispatch state changes to the export pipelines."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.pipelines: List["ExportPipeline"] = []
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_register(self, pipeline: "ExportPipeline") -> CALLBACK_TYPE:
+        """Register a pipeline and return a function to unregister it."""
+        if not self.pipelines:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self.async_dispatch
+            )
+        self.pipelines.append(pipeline)
+
+        @callback
+        def unregister() -> None:
+            """Unregister the pipeline."""
+            self.pipelines.remove(pipeline)
+            if not self.pipelines and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return unregister
+
+    @callback
+    def async_dispatch(self, event: Event) -> None:
+        """Pass a state change to all pipelines."""
+        export_event = ExportEvent(event)
+        for pipeline in self.pipelines:
+            pipeline.async_add(export_event)
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> ExportHub:
+    """Return the export hub."""
+    hub = hass.data.get(DATA_EXPORT_HUB)
+    if hub is None:
+        hub = hass.data[DATA_EXPORT_HUB] = ExportHub(hass)
+    return hub
+
+
+class ExportPipeline:
+    """Filter, batch and write the state changes for one exporter.
+
+    Events wait in a bounded backlog. When the backlog is full either the
+    oldest event or the new event is dropped. A batch is written when
+    batch_size events are waiting or when the oldest waiting event has
+    lingered for linger seconds, with at most max_in_flight writes at the
+    same time. Events that waited longer than max_age are dropped before
+    they are converted.
+
+    convert turns an event into the record to write, or None to skip it.
+    write sends a list of records and raises ExportError when the write
+    should be retried.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Logger,
+        name: str,
+        convert: Callable[[ExportEvent], Any],
+        write: Callable[[List[Any]], Awaitable[None]],
+        *,
+        entity_filter: Optional[Callable[[str], bool]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        linger: float = DEFAULT_LINGER,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_backlog: int = DEFAULT_MAX_BACKLOG,
+        drop_policy: str = DROP_OLDEST,
+        max_age: Optional[float] = None,
+        max_retries: int = 0,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ) -> None:
+        """Initialize the pipeline."""
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.convert = convert
+        self.write = write
+        self.entity_filter = entity_filter
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_in_flight = max_in_flight
+        self.max_backlog = max_backlog
+        self.drop_policy = drop_policy
+        self.max_age = max_age
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self._backlog: Deque[ExportEvent] = deque()
+        self._in_flight = 0
+        self._writes: Set[asyncio.Future] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing = False
+        self._unsub: Optional[CALLBACK_TYPE] = None
+        # Events lost since the last successful write
+        self._write_errors = 0
+        self._last_write: Optional[float] = None
+
+        self.received = 0
+        self.filtered = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self.lag: Optional[float] = None
+        self.throughput: Optional[float] = None
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return the counters, lag and throughput of the pipeline."""
+        return {
+            "received": self.received,
+            "filtered": self.filtered,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "retries": self.retries,
+            "batches": self.batches,
+            "backlog": len(self._backlog),
+            "in_flight": self._in_flight,
+            "lag": self.lag,
+            "throughput": self.throughput,
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Start receiving state changes."""
+        if self._unsub is None:
+            self._unsub = async_get_hub(self.hass).async_register(self)
+
+    async def async_stop(self) -> None:
+        """Stop receiving state changes and write the events waiting."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write all waiting events without waiting for a full batch."""
+        self._flushing = True
+        try:
+            while self._backlog or self._writes:
+                self._async_process()
+                if self._writes:
+                    await asyncio.wait(list(self._writes))
+        finally:
+            self._flushing = False
+
+    @callback
+    def async_add(self, export_event: ExportEvent) -> None:
+        """Add a state change to the backlog."""
+        self.received += 1
+
+        if self.entity_filter is not None:
+            entity_id = export_event.entity_id
+            if entity_id is None or not self.entity_filter(entity_id):
+                self.filtered += 1
+                return
+
+        backlog = self._backlog
+        if len(backlog) >= self.max_backlog:
+            self.dropped += 1
+            if self.drop_policy == DROP_NEWEST:
+                return
+            backlog.popleft()
+
+        backlog.append(export_event)
+        if self._timer is None or len(backlog) >= self.batch_size:
+            self._async_process()
+
+    @callback
+    def _async_process(self) -> None:
+        """Start writing batches and schedule the next partial batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        backlog = self._backlog
+        now = time.monotonic()
+
+        while backlog and self._in_flight < self.max_in_flight:
+            if (
+                len(backlog) < self.batch_size
+                and not self._flushing
+                and backlog[0].received + self.linger > now
+            ):
+                break
+
+            batch = [
+                backlog.popleft() for _ in range(min(self.batch_size, len(backlog)))
+            ]
+            self._in_flight += 1
+            task = self.hass.async_create_task(self._async_write_batch(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+        if backlog and self._in_flight < self.max_in_flight:
+            # A partial batch waits until its oldest event has lingered
+            self._timer = self.hass.loop.call_later(
+                backlog[0].received + self.linger - now, self._async_timer_done
+            )
+
+    @callback
+    def _async_timer_done(self) -> None:
+        """Write the partial batch whose events have lingered."""
+        self._timer = None
+        self._async_process()
+
+    async def _async_write_batch(self, batch: List[ExportEvent]) -> None:
+        """Convert and write a batch."""
+        try:
+            if self.max_age is not None:
+                now = time.monotonic()
+                fresh = [
+                    event for event in batch if now - event.received < self.max_age
+                ]
+                if len(fresh) < len(batch):
+                    self.dropped += len(batch) - len(fresh)
+                    self.logger.warning(
+                        "Catching up, dropped %d old events", len(batch) - len(fresh)
+                    )
+                batch = fresh
+
+            records = []
+            for export_event in batch:
+                try:
+                    record = self.convert(export_event)
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception("Error converting %s", export_event.event)
+                    continue
+                if record is not None:
+                    records.append(record)
+
+            if records and await self._async_write_records(records):
+                self._update_metrics(batch[0], len(records))
+        finally:
+            self._in_flight -= 1
+            self._async_process()
+
+    async def _async_write_records(self, records: List[Any]) -> bool:
+        """Write records, with retry, and return if they were written."""
+        for retry in range(self.max_retries + 1):
+            try:
+                await self.write(records)
+            except ExportError as err:
+                if retry < self.max_retries:
+                    self.retries += 1
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+                if not self._write_errors:
+                    self.logger.error("Write error: %s", err)
+                self._write_errors += len(records)
+                self.failed += len(records)
+                return False
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception(
+                    "Unexpected error writing %d events", len(records)
+                )
+                self._write_errors += len(records)
+                self.failed += len(records)
+                return False
+
+            if self._write_errors:
+                self.logger.error("Resumed, lost %d events", self._write_errors)
+                self._write_errors = 0
+
+            self.logger.debug("Wrote %d events", len(records))
+            return True
+
+        return False
+
+    def _update_metrics(self, oldest: ExportEvent, count: int) -> None:
+        """Update the metrics after a batch was written."""
+        now = time.monotonic()
+        self.written += count
+        self.batches += 1
+        self.lag = now - oldest.received
+
+        if self._last_write is not None and now > self._last_write:
+            rate = count / (now - self._last_write)
+            if self.throughput is None:
+                self.throughput = rate
+            else:
+                self.throughput += THROUGHPUT_SMOOTHING * (rate - self.throughput)
+        self._last_write = now
@@ -34,6 +34,9 @@ from homeassistant.exceptions import (
 )
 from homeassistant.helpers import template
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType, TemplateVarsType
 from homeassistant.loader import async_get_integration, bind_hass
 from homeassistant.util.yaml import load_yaml
@@ -52,6 +55,8 @@ CONF_SERVICE_DATA_TEMPLATE = "data_template"
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_DESCRIPTION_CACHE = "service_description_cache"
+DATA_TARGET_CACHE = "service_target_cache"
+TARGET_CACHE_SIZE = 256
 
 
 @bind_hass
@@ -199,17 +204,145 @@ async def async_extract_entity_ids(
     """Extract a list of entity ids from a service call.
 
     Will convert group entity ids to the entity ids it represents.
+    The result of expanding groups and areas is cached.
+    """
+    return set(await _async_extract_target_ids(hass, service_call, expand_group))
+
+
+async def _async_extract_target_ids(
+    hass: HomeAssistantType, service_call: ha.ServiceCall, expand_group: bool
+) -> Dict[str, None]:
+    """Extract the entity ids of a service call in the order they are targeted.
+
+    A dict is used as an ordered set.
     """
     entity_ids = service_call.data.get(ATTR_ENTITY_ID)
     area_ids = service_call.data.get(ATTR_AREA_ID)
 
-    extracted: Set[str] = set()
-
     if entity_ids in (None, ENTITY_MATCH_NONE) and area_ids in (
         None,
         ENTITY_MATCH_NONE,
     ):
-        return extracted
+        return {}
+
+    if not expand_group and not area_ids:
+        return await _async_resolve_entity_ids(hass, entity_ids, area_ids, False)
+
+    cache = hass.data.get(DATA_TARGET_CACHE)
+    if cache is None:
+        cache = hass.data[DATA_TARGET_CACHE] = _TargetCache(hass)
+
+    try:
+        key = (_freeze(entity_ids), _freeze(area_ids), expand_group)
+        extracted = cache.get(key)
+    except TypeError:
+        # Unhashable data can't be cached
+        return await _async_resolve_entity_ids(hass, entity_ids, area_ids, expand_group)
+
+    if extracted is None:
+        extracted = tuple(
+            await _async_resolve_entity_ids(hass, entity_ids, area_ids, expand_group)
+        )
+        cache.set(key, extracted, entity_ids if expand_group else None)
+
+    return dict.fromkeys(extracted)
+
+
+def _freeze(value: Any) -> Any:
+    """Return a service call target as a cache key."""
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+class _TargetCache:
+    """Cache of entity ids resolved from group and area targets.
+
+    The cache is cleared when a registry changes, or when a group used by
+    a cached target is added, removed or changes its members.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._entries: Dict[Any, Tuple[str, ...]] = {}
+        # Groups used by the cached targets, and how to stop tracking them
+        self._groups: Dict[str, ha.CALLBACK_TYPE] = {}
+        hass.bus.async_listen(EVENT_ENTITY_REGISTRY_UPDATED, self._async_clear)
+        hass.bus.async_listen(EVENT_DEVICE_REGISTRY_UPDATED, self._async_clear)
+
+    def get(self, key: Any) -> Optional[Tuple[str, ...]]:
+        """Return the cached entity ids of a target."""
+        return self._entries.get(key)
+
+    def set(self, key: Any, entity_ids: Tuple[str, ...], targets: Any) -> None:
+        """Cache the entity ids of a target and track the groups it used."""
+        if len(self._entries) >= TARGET_CACHE_SIZE:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = entity_ids
+
+        groups = [
+            group
+            for group in _referenced_groups(self.hass, targets)
+            if group not in self._groups
+        ]
+        for group in groups:
+            self._groups[group] = async_track_state_change_event(
+                self.hass, [group], self._async_group_changed
+            )
+
+    @ha.callback
+    def _async_clear(self, event: Optional[ha.Event] = None) -> None:
+        """Clear the cache and stop tracking groups."""
+        self._entries.clear()
+        groups, self._groups = self._groups, {}
+        for remove in groups.values():
+            remove()
+
+    @ha.callback
+    def _async_group_changed(self, event: ha.Event) -> None:
+        """Clear the cache when a group is added, removed or changes members."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (
+            old_state is None
+            or new_state is None
+            or old_state.attributes.get(ATTR_ENTITY_ID)
+            != new_state.attributes.get(ATTR_ENTITY_ID)
+        ):
+            self._async_clear()
+
+
+def _referenced_groups(hass: HomeAssistantType, targets: Any) -> Set[str]:
+    """Return the groups, including nested groups, a target refers to."""
+    if not targets or targets == ENTITY_MATCH_NONE:
+        return set()
+    if isinstance(targets, str):
+        targets = [targets]
+
+    groups: Set[str] = set()
+    to_visit = list(targets)
+    while to_visit:
+        entity_id = to_visit.pop()
+        if not isinstance(entity_id, str):
+            continue
+        entity_id = entity_id.lower()
+        if not entity_id.startswith("group.") or entity_id in groups:
+            continue
+
+        groups.add(entity_id)
+        state = hass.states.get(entity_id)
+        if state is not None:
+            to_visit.extend(state.attributes.get(ATTR_ENTITY_ID) or ())
+
+    return groups
+
+
+async def _async_resolve_entity_ids(
+    hass: HomeAssistantType, entity_ids: Any, area_ids: Any, expand_group: bool
+) -> Dict[str, None]:
+    """Return the entity ids referenced by entity and area targets."""
+    extracted: Dict[str, None] = {}
 
     if entity_ids and entity_ids != ENTITY_MATCH_NONE:
         # Entity ID attr can be a list or a string
@@ -219,7 +352,7 @@ async def async_extract_entity_ids(
         if expand_group:
             entity_ids = hass.components.group.expand_entity_ids(entity_ids)
 
-        extracted.update(entity_ids)
+        extracted.update(dict.fromkeys(entity_ids))
 
     if area_ids and area_ids != ENTITY_MATCH_NONE:
         if isinstance(area_ids, str):
@@ -237,7 +370,7 @@ async def async_extract_entity_ids(
             )
         ]
         extracted.update(
-            entry.entity_id
+            (entry.entity_id, None)
             for device in devices
             for entry in hass.helpers.entity_registry.async_entries_for_device(
                 ent_reg, device.id
@@ -351,8 +484,8 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     target_all_entities = call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL
 
     if not target_all_entities:
-        # A set of entities we're trying to target.
-        entity_ids = await async_extract_entity_ids(hass, call, True)
+        # The entities we're trying to target, in the order they are targeted.
+        entity_ids = await _async_extract_target_ids(hass, call, True)
 
     # If the service function is a string, we'll pass it the service call data
     if isinstance(func, str):
@@ -370,53 +503,48 @@ async def entity_service_call(hass, platforms, func, call, required_features=Non
     # A list with entities to call the service on.
     entity_candidates = []
 
-    if entity_perms is None:
+    if target_all_entities:
         for platform in platforms:
-            if target_all_entities:
+            if entity_perms is None:
                 entity_candidates.extend(platform.entities.values())
             else:
+                # If we target all entities, we will select all entities the
+                # user is allowed to control.
                 entity_candidates.extend(
                     [
                         entity
                         for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
+                        if entity_perms(entity.entity_id, POLICY_CONTROL)
                     ]
                 )
 
-    elif target_all_entities:
-        # If we target all entities, we will select all entities the user
-        # is allowed to control.
-        for platform in platforms:
-            entity_candidates.extend(
-                [
-                    entity
-                    for entity in platform.entities.values()
-                    if entity_perms(entity.entity_id, POLICY_CONTROL)
-                ]
-            )
-
     else:
+        # Platform entities are keyed by entity_id, so look up the targets
+        # instead of walking all entities of all platforms.
         for platform in platforms:
-            platform_entities = []
-            for entity in platform.entities.values():
+            if not entity_ids:
+                break
 
-                if entity.entity_id not in entity_ids:
-                    continue
+            platform_entities = platform.entities
+            found = [
+                platform_entities[entity_id]
+                for entity_id in entity_ids
+                if entity_id in platform_entities
+            ]
+
+            for entity in found:
+                del entity_ids[entity.entity_id]
 
-                if not entity_perms(entity.entity_id, POLICY_CONTROL):
+                if entity_perms is not None and not entity_perms(
+                    entity.entity_id, POLICY_CONTROL
+                ):
                     raise Unauthorized(
                         context=call.context,
                         entity_id=entity.entity_id,
                         permission=POLICY_CONTROL,
                     )
 
-                platform_entities.append(entity)
-
-            entity_candidates.extend(platform_entities)
-
-    if not target_all_entities:
-        for entity in entity_candidates:
-            entity_ids.remove(entity.entity_id)
+            entity_candidates.extend(found)
 
         if entity_ids:
             _LOGGER.warning(
@@ -0,0 +1,242 @@
+"""Record a timeline of the startup of Home Assistant.
+
+Tracing is opt-in with the --trace-startup command line option. While
+Home Assistant starts, bootstrap, setup, config entries and entity
+platforms record the phases of setting up every integration and platform.
+Each phase records the time it took and, where it can be measured, how
+long it blocked the event loop. The timeline is exported in the Chrome
+trace event format, which can be loaded in chrome://tracing or Perfetto.
+"""
+from contextlib import contextmanager
+import logging
+import time
+from typing import Any, Awaitable, Dict, Generator, Iterator, List, Optional, Union
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import save_json
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STARTUP_TRACE = "startup_trace"
+TRACE_FILE = "startup_trace.json"
+
+LANE_BOOTSTRAP = "bootstrap"
+
+
+class Span:
+    """A phase of the startup that is being recorded."""
+
+    __slots__ = ("blocking", "measured")
+
+    def __init__(self) -> None:
+        """Initialize the span."""
+        self.blocking = 0.0
+        self.measured = False
+
+    def timed(self, awaitable: Awaitable) -> Awaitable:
+        """Return the awaitable, adding the time its steps block the loop."""
+        if not hasattr(awaitable, "send"):
+            return awaitable
+        self.measured = True
+        return _TimedCoroutine(awaitable, self)
+
+
+class _NullSpan(Span):
+    """Span used when the startup is not traced."""
+
+    def timed(self, awaitable: Awaitable) -> Awaitable:
+        """Return the awaitable."""
+        return awaitable
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _TimedCoroutine:
+    """Run a coroutine, adding the time spent in each of its steps to a span.
+
+    Only the coroutine itself is measured, not the tasks it creates.
+    """
+
+    __slots__ = ("_coro", "_span")
+
+    def __init__(self, coro: Any, span: Span) -> None:
+        """Initialize the timed coroutine."""
+        self._coro = coro
+        self._span = span
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        """Step through the coroutine."""
+        coro = self._coro
+        span = self._span
+        value: Any = None
+        error: Optional[BaseException] = None
+
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is None:
+                    future = coro.send(value)
+                else:
+                    future = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                span.blocking += time.perf_counter() - start
+
+            try:
+                value = yield future
+                error = None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as err:  # pylint: disable=broad-except
+                value = None
+                error = err
+
+
+class StartupTrace:
+    """Timeline of the startup in the Chrome trace event format.
+
+    Every integration and platform gets its own lane, which is shown as a
+    thread in the trace viewers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self._origin = time.perf_counter()
+        self._lanes: Dict[str, int] = {}
+        self._marks: set = set()
+        self.events: List[Dict[str, Any]] = []
+        self.finished = False
+
+    def _timestamp(self, moment: float) -> float:
+        """Return microseconds since the start of the trace."""
+        return round((moment - self._origin) * 1e6, 1)
+
+    def _lane(self, lane: str) -> int:
+        """Return the thread id of a lane."""
+        tid = self._lanes.get(lane)
+        if tid is None:
+            tid = self._lanes[lane] = len(self._lanes) + 1
+        return tid
+
+    @contextmanager
+    def span(
+        self, lane: str, name: str, blocking: bool = False, **args: Any
+    ) -> Iterator[Span]:
+        """Record a phase.
+
+        Synchronous phases block the loop for their whole duration.
+        Asynchronous phases measure the coroutines passed to Span.timed.
+        """
+        span = Span()
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            end = time.perf_counter()
+            if blocking:
+                span.blocking = end - start
+                span.measured = True
+            if span.measured:
+                args["blocking_ms"] = round(span.blocking * 1000, 3)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": "startup",
+                    "ph": "X",
+                    "ts": self._timestamp(start),
+                    "dur": round((end - start) * 1e6, 1),
+                    "pid": 1,
+                    "tid": self._lane(lane),
+                    "args": args,
+                }
+            )
+
+    def mark(self, lane: str, name: str, once: bool = False, **args: Any) -> None:
+        """Record a moment."""
+        if once:
+            if (lane, name) in self._marks:
+                return
+            self._marks.add((lane, name))
+
+        self.events.append(
+            {
+                "name": name,
+                "cat": "startup",
+                "ph": "i",
+                "s": "t",
+                "ts": self._timestamp(time.perf_counter()),
+                "pid": 1,
+                "tid": self._lane(lane),
+                "args": args,
+            }
+        )
+
+    def as_chrome_trace(self) -> Dict[str, Any]:
+        """Return the trace in the Chrome trace event format."""
+        lanes = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": tid,
+                "args": {"name": lane},
+            }
+            for lane, tid in self._lanes.items()
+        ]
+        return {"traceEvents": lanes + self.events, "displayTimeUnit": "ms"}
+
+
+@callback
+def async_enable(hass: HomeAssistant) -> StartupTrace:
+    """Start tracing the startup."""
+    trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    return trace
+
+
+@callback
+def async_get_trace(hass: HomeAssistant) -> Optional[StartupTrace]:
+    """Return the trace if the startup is being traced."""
+    trace: Optional[StartupTrace] = hass.data.get(DATA_STARTUP_TRACE)
+    if trace is None or trace.finished:
+        return None
+    return trace
+
+
+@contextmanager
+def async_span(
+    hass: HomeAssistant, lane: str, name: str, blocking: bool = False, **args: Any
+) -> Iterator[Span]:
+    """Record a phase if the startup is being traced."""
+    trace = async_get_trace(hass)
+    if trace is None:
+        yield NULL_SPAN
+        return
+
+    with trace.span(lane, name, blocking, **args) as span:
+        yield span
+
+
+@callback
+def async_mark(
+    hass: HomeAssistant, lane: str, name: str, once: bool = False, **args: Any
+) -> None:
+    """Record a moment if the startup is being traced."""
+    trace = async_get_trace(hass)
+    if trace is not None:
+        trace.mark(lane, name, once, **args)
+
+
+async def async_finish(hass: HomeAssistant) -> Union[str, None]:
+    """Stop tracing and write the trace to the config directory."""
+    trace = async_get_trace(hass)
+    if trace is None:
+        return None
+
+    trace.finished = True
+    path = hass.config.path(TRACE_FILE)
+    await hass.async_add_executor_job(save_json, path, trace.as_chrome_trace())
+    _LOGGER.info("Startup trace written to %s", path)
+    return path
@@ -1,5 +1,6 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 import base64
+import collections
 import collections.abc
 from datetime import datetime
 from functools import wraps
@@ -8,12 +9,12 @@ import logging
 import math
 import random
 import re
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Union
 
 import jinja2
-from jinja2 import contextfilter, contextfunction
+from jinja2 import contextfilter, contextfunction, nodes
 from jinja2.sandbox import ImmutableSandboxedEnvironment
-from jinja2.utils import Namespace  # type: ignore
+from jinja2.utils import LRUCache, Namespace  # type: ignore
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -50,6 +51,48 @@ _RE_GET_ENTITIES = re.compile(
 )
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{")
 
+# Compiled code is shared by all templates with the same source
+COMPILE_CACHE_SIZE = 512
+# Results of templates that only depend on value and value_json
+RENDER_CACHE_SIZE = 1024
+JSON_CACHE_SIZE = 128
+
+# Names a template may use and still be a function of value and value_json only
+_PURE_NAMES = {
+    "value",
+    "value_json",
+    "acos",
+    "as_timestamp",
+    "asin",
+    "atan",
+    "atan2",
+    "cos",
+    "dict",
+    "e",
+    "float",
+    "log",
+    "namespace",
+    "pi",
+    "range",
+    "sin",
+    "sqrt",
+    "strptime",
+    "tan",
+    "tau",
+}
+# Filters that read state or configuration, like the time zone, besides their input
+_IMPURE_FILTERS = {
+    "closest",
+    "expand",
+    "random",
+    "timestamp_custom",
+    "timestamp_local",
+}
+
+_COMPILE_CACHE = LRUCache(COMPILE_CACHE_SIZE)
+_JSON_CACHE = LRUCache(JSON_CACHE_SIZE)
+_CACHE_STATS: Dict[str, int] = collections.Counter()
+
 
 @bind_hass
 def attach(hass: HomeAssistantType, obj: Any) -> None:
@@ -117,6 +160,54 @@ def extract_entities(
     return MATCH_ALL
 
 
+def cache_stats() -> Dict[str, int]:
+    """Return the hits and misses of the template caches."""
+    return {
+        f"{cache}_{kind}": _CACHE_STATS[f"{cache}_{kind}"]
+        for cache in ("compile", "render", "json")
+        for kind in ("hits", "misses")
+    }
+
+
+def _is_pure(source: nodes.Template) -> bool:
+    """Return if a parsed template only depends on value and value_json."""
+    loaded = set()
+    stored = set()
+    for node in source.find_all(nodes.Name):
+        (stored if node.ctx in ("store", "param") else loaded).add(node.name)
+    if not loaded <= _PURE_NAMES | stored:
+        return False
+    return not any(
+        node.name in _IMPURE_FILTERS for node in source.find_all(nodes.Filter)
+    )
+
+
+def _parse_json(value: Any) -> Any:
+    """Return the JSON a value contains or _SENTINEL if it is not valid JSON.
+
+    Strings are parsed once for all templates rendered with the same value.
+    Templates can't modify the parsed objects, so they are safe to share.
+    """
+    if not isinstance(value, str):
+        try:
+            return json.loads(value)
+        except (ValueError, TypeError):
+            return _SENTINEL
+
+    parsed = _JSON_CACHE.get(value, _JSON_CACHE)
+    if parsed is not _JSON_CACHE:
+        _CACHE_STATS["json_hits"] += 1
+        return parsed
+
+    _CACHE_STATS["json_misses"] += 1
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        parsed = _SENTINEL
+    _JSON_CACHE[value] = parsed
+    return parsed
+
+
 def _true(arg: Any) -> bool:
     return True
 
@@ -146,6 +237,21 @@ class RenderInfo:
             or entity_id in self._entities
         )
 
+    @property
+    def all_states(self) -> bool:
+        """Return if the render iterated all states."""
+        return self._all_states
+
+    @property
+    def domains(self) -> FrozenSet[str]:
+        """Return the domains whose states the render iterated."""
+        return getattr(self, "_domains", frozenset())
+
+    @property
+    def entities(self) -> FrozenSet[str]:
+        """Return the entities whose state the render accessed."""
+        return frozenset(self._entities)
+
     @property
     def result(self) -> str:
         """Results of the template computation."""
@@ -177,6 +283,7 @@ class Template:
         self.template: str = template
         self._compiled_code = None
         self._compiled = None
+        self._pure = False
         self.hass = hass
 
     @property
@@ -193,11 +300,24 @@ class Template:
         if self._compiled_code is not None:
             return
 
+        entry = _COMPILE_CACHE.get(self.template)
+        if entry is not None:
+            _CACHE_STATS["compile_hits"] += 1
+            self._compiled_code, self._pure = entry
+            return
+
+        _CACHE_STATS["compile_misses"] += 1
+        env = self._env
         try:
-            self._compiled_code = self._env.compile(self.template)
+            source = env.parse(self.template)
+            pure = _is_pure(source)
+            entry = (env.compile(source), pure)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
+        _COMPILE_CACHE[self.template] = entry
+        self._compiled_code, self._pure = entry
+
     def extract_entities(
         self, variables: Optional[Dict[str, Any]] = None
     ) -> Union[str, List[str]]:
@@ -266,21 +386,33 @@ class Template:
 
         If valid JSON will expose value_json too.
 
+        Results of templates that only depend on value and value_json are
+        cached, so templates with the same source render a value once.
+
         This method must be run in the event loop.
         """
         if self._compiled is None:
             self._ensure_compiled()
 
+        render_cache = None
+        if self._pure and not variables and isinstance(value, str):
+            render_cache = self._env.render_cache
+            key = (self.template, value)
+            result = render_cache.get(key)
+            if result is not None:
+                _CACHE_STATS["render_hits"] += 1
+                return result
+            _CACHE_STATS["render_misses"] += 1
+
         variables = dict(variables or {})
         variables["value"] = value
 
-        try:
-            variables["value_json"] = json.loads(value)
-        except (ValueError, TypeError):
-            pass
+        value_json = _parse_json(value)
+        if value_json is not _SENTINEL:
+            variables["value_json"] = value_json
 
         try:
-            return self._compiled.render(variables).strip()
+            result = self._compiled.render(variables).strip()
         except jinja2.TemplateError as ex:
             if error_value is _SENTINEL:
                 _LOGGER.error(
@@ -291,6 +423,10 @@ class Template:
                 )
             return value if error_value is _SENTINEL else error_value
 
+        if render_cache is not None:
+            render_cache[key] = result
+        return result
+
     def _ensure_compiled(self):
         """Bind a template to a specific hass instance."""
         self.ensure_valid()
@@ -299,9 +435,12 @@ class Template:
 
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        compiled = env.template_cache.get(self.template)
+        if compiled is None:
+            compiled = env.template_cache[self.template] = jinja2.Template.from_code(
+                env, self._compiled_code, env.globals, None
+            )
+        self._compiled = compiled
 
         return self._compiled
 
@@ -952,6 +1091,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__()
         self.hass = hass
+        self.template_cache = LRUCache(COMPILE_CACHE_SIZE)
+        self.render_cache = LRUCache(RENDER_CACHE_SIZE)
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
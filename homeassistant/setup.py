@@ -9,6 +9,7 @@ from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
 from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_trace
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.util import dt as dt_util
 
@@ -121,15 +122,16 @@ async def _async_setup_component(
         _LOGGER.error("Setup failed for %s: %s", domain, msg)
         async_notify_setup_error(hass, domain, link)
 
-    try:
-        integration = await loader.async_get_integration(hass, domain)
-    except loader.IntegrationNotFound:
-        log_error("Integration not found.")
-        return False
+    with startup_trace.async_span(hass, domain, "resolve") as span:
+        try:
+            integration = await span.timed(loader.async_get_integration(hass, domain))
+        except loader.IntegrationNotFound:
+            log_error("Integration not found.")
+            return False
 
-    # Validate all dependencies exist and there are no circular dependencies
-    if not await integration.resolve_dependencies():
-        return False
+        # Validate all dependencies exist and there are no circular dependencies
+        if not await span.timed(integration.resolve_dependencies()):
+            return False
 
     # Process requirements as soon as possible, so we can import the component
     # without requiring imports to be in functions.
@@ -142,7 +144,8 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with startup_trace.async_span(hass, domain, "import", blocking=True):
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -150,9 +153,10 @@ async def _async_setup_component(
         _LOGGER.exception("Setup failed for %s: unknown error", domain)
         return False
 
-    processed_config = await conf_util.async_process_component_config(
-        hass, config, integration
-    )
+    with startup_trace.async_span(hass, domain, "config") as span:
+        processed_config = await span.timed(
+            conf_util.async_process_component_config(hass, config, integration)
+        )
 
     if processed_config is None:
         log_error("Invalid config.", integration.documentation)
@@ -190,7 +194,8 @@ async def _async_setup_component(
             hass.data[DATA_SETUP_STARTED].pop(domain)
             return False
 
-        result = await asyncio.wait_for(task, SLOW_SETUP_MAX_WAIT)
+        with startup_trace.async_span(hass, domain, "setup") as span:
+            result = await asyncio.wait_for(span.timed(task), SLOW_SETUP_MAX_WAIT)
     except asyncio.TimeoutError:
         _LOGGER.error(
             "Setup of %s is taking longer than %s seconds."
@@ -315,13 +320,17 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
-    if not await _async_process_dependencies(hass, config, integration):
-        raise HomeAssistantError("Could not set up all dependencies.")
+    with startup_trace.async_span(hass, integration.domain, "dependencies"):
+        if not await _async_process_dependencies(hass, config, integration):
+            raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        await requirements.async_get_integration_with_requirements(
-            hass, integration.domain
-        )
+        with startup_trace.async_span(hass, integration.domain, "requirements") as span:
+            await span.timed(
+                requirements.async_get_integration_with_requirements(
+                    hass, integration.domain
+                )
+            )
 
     processed.add(integration.domain)
 
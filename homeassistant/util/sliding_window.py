@@ -0,0 +1,190 @@
+"""Incrementally updated aggregates of sliding windows of samples."""
+from collections import deque
+from datetime import datetime
+import heapq
+import math
+from typing import Deque, Dict, Hashable, List, Optional, Tuple
+
+# Rebuild a heap once it holds this many times more entries than samples
+_HEAP_COMPACT_FACTOR = 2
+
+
+class SlidingMedian:
+    """Median of a window using two heaps with lazy deletion.
+
+    Every sample is added with a unique key which is used to remove it
+    again, so samples can leave the window in any order. The low heap is a
+    max heap holding the smaller half of the samples, the high heap a min
+    heap holding the larger half. Removed samples stay in their heap until
+    they reach the top or the heap is compacted. Adding or removing a
+    sample is O(log n), reading the median O(1).
+    """
+
+    __slots__ = ("_low", "_high", "_in_low", "_low_size", "_high_size")
+
+    def __init__(self) -> None:
+        """Initialize the median."""
+        self._low: List[Tuple[float, Hashable]] = []
+        self._high: List[Tuple[float, Hashable]] = []
+        # Key of each sample in the window -> if it is in the low heap
+        self._in_low: Dict[Hashable, bool] = {}
+        self._low_size = 0
+        self._high_size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self._in_low)
+
+    def add(self, value: float, key: Hashable) -> None:
+        """Add a sample."""
+        if self._low_size and value <= -self._low[0][0]:
+            heapq.heappush(self._low, (-value, key))
+            self._in_low[key] = True
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, (value, key))
+            self._in_low[key] = False
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a sample."""
+        if self._in_low.pop(key):
+            self._low_size -= 1
+        else:
+            self._high_size -= 1
+        self._rebalance()
+
+    @property
+    def median(self) -> float:
+        """Return the median of the samples, the window must not be empty."""
+        if self._low_size > self._high_size:
+            return -self._low[0][0]
+        return (-self._low[0][0] + self._high[0][0]) / 2
+
+    def _rebalance(self) -> None:
+        """Keep the halves balanced and valid samples at the top of the heaps."""
+        self._prune()
+        while self._low_size > self._high_size + 1:
+            value, key = heapq.heappop(self._low)
+            heapq.heappush(self._high, (-value, key))
+            self._in_low[key] = False
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune()
+        while self._high_size > self._low_size:
+            value, key = heapq.heappop(self._high)
+            heapq.heappush(self._low, (-value, key))
+            self._in_low[key] = True
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune()
+
+        if len(self._low) > _HEAP_COMPACT_FACTOR * self._low_size + 16:
+            self._low = self._compact(self._low, True)
+        if len(self._high) > _HEAP_COMPACT_FACTOR * self._high_size + 16:
+            self._high = self._compact(self._high, False)
+
+    def _prune(self) -> None:
+        """Pop removed or moved samples from the top of both heaps."""
+        low, high, in_low = self._low, self._high, self._in_low
+        while low and in_low.get(low[0][1]) is not True:
+            heapq.heappop(low)
+        while high and in_low.get(high[0][1]) is not False:
+            heapq.heappop(high)
+
+    def _compact(
+        self, heap: List[Tuple[float, Hashable]], is_low: bool
+    ) -> List[Tuple[float, Hashable]]:
+        """Return the heap without the entries of removed or moved samples."""
+        in_low = self._in_low
+        heap = [entry for entry in heap if in_low.get(entry[1]) is is_low]
+        heapq.heapify(heap)
+        return heap
+
+
+class TimeWeightedSum:
+    """Time weighted sum of a window of samples removed oldest first.
+
+    Each sample holds its value until the next sample, so the sum is the
+    integral of that step function from the oldest to the newest sample.
+    Adding or removing a sample is O(1). The sum is recomputed once for
+    every removal of as many samples as the window holds, to stop rounding
+    errors from accumulating.
+    """
+
+    __slots__ = ("_samples", "_sum", "_removed")
+
+    def __init__(self) -> None:
+        """Initialize the sum."""
+        self._samples: Deque[Tuple[datetime, float]] = deque()
+        self._sum = 0.0
+        self._removed = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self._samples)
+
+    def add(self, timestamp: datetime, value: float) -> None:
+        """Add a sample that is not older than the newest one."""
+        if self._samples:
+            last_timestamp, last_value = self._samples[-1]
+            self._sum += (timestamp - last_timestamp).total_seconds() * last_value
+        self._samples.append((timestamp, value))
+
+    def pop_oldest(self) -> Tuple[datetime, float]:
+        """Remove the oldest sample and return its timestamp and value."""
+        timestamp, value = self._samples.popleft()
+        if not self._samples:
+            self._sum = 0.0
+            self._removed = 0
+        else:
+            self._removed += 1
+            if self._removed >= len(self._samples):
+                self._resync()
+            else:
+                next_timestamp = self._samples[0][0]
+                self._sum -= (next_timestamp - timestamp).total_seconds() * value
+        return timestamp, value
+
+    def _resync(self) -> None:
+        """Recompute the sum from the samples."""
+        self._removed = 0
+        samples = list(self._samples)
+        self._sum = math.fsum(
+            (next_sample[0] - sample[0]).total_seconds() * sample[1]
+            for sample, next_sample in zip(samples, samples[1:])
+        )
+
+    @property
+    def oldest(self) -> Tuple[datetime, float]:
+        """Return the timestamp and value of the oldest sample."""
+        return self._samples[0]
+
+    @property
+    def total(self) -> float:
+        """Return the time weighted sum in value seconds."""
+        return self._sum
+
+
+class ExponentialMovingState:
+    """Exponential moving average of a stream of values.
+
+    The first value is taken as is, every next value moves the average by
+    weight times the difference.
+    """
+
+    __slots__ = ("weight", "state")
+
+    def __init__(self, weight: float) -> None:
+        """Initialize the moving state."""
+        self.weight = weight
+        self.state: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        """Add a value and return the new average."""
+        if self.state is None:
+            self.state = value
+        else:
+            self.state = (1.0 - self.weight) * self.state + self.weight * value
+        return self.state
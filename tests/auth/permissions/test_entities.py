@@ -215,3 +215,40 @@ def test_entities_areas_area_true(hass):
     assert compiled("light.kitchen", "control") is True
     assert compiled("light.kitchen", "edit") is False
     assert compiled("switch.kitchen", "read") is False
+
+
+def test_entities_table_invalidate(hass):
+    """Test the outcome for an entity is kept until it is invalidated."""
+    entity_registry = mock_registry(
+        hass,
+        {
+            "light.kitchen": RegistryEntry(
+                entity_id="light.kitchen",
+                unique_id="1234",
+                platform="test_platform",
+                device_id="mock-dev-id",
+            )
+        },
+    )
+    device_registry = mock_device_registry(
+        hass, {"mock-dev-id": DeviceEntry(id="mock-dev-id", area_id="mock-area-id")}
+    )
+    perm_lookup = PermissionLookup(entity_registry, device_registry)
+
+    policy = {"area_ids": {"mock-area-id": True}}
+    compiled = compile_entities(policy, perm_lookup)
+    assert compiled("light.kitchen", "read") is True
+
+    device_registry.devices["mock-dev-id"] = DeviceEntry(
+        id="mock-dev-id", area_id="other-area-id"
+    )
+    assert compiled("light.kitchen", "read") is True
+
+    perm_lookup.async_invalidate("light.kitchen")
+    assert compiled("light.kitchen", "read") is False
+
+    device_registry.devices["mock-dev-id"] = DeviceEntry(
+        id="mock-dev-id", area_id="mock-area-id"
+    )
+    perm_lookup.async_invalidate()
+    assert compiled("light.kitchen", "read") is True
@@ -2,8 +2,10 @@
 import asyncio
 
 from homeassistant.auth import auth_store
+from homeassistant.auth.permissions.entities import compile_entities
 
 from tests.async_mock import patch
+from tests.common import mock_device_registry, mock_registry
 
 
 async def test_loading_no_group_data_format(hass, hass_storage):
@@ -187,6 +189,20 @@ async def test_loading_all_access_group_data_format(hass, hass_storage):
     system_token = list(system.refresh_tokens.values())[0]
     assert system_token.id == "system-token-id"
 
+    # Both tokens share their token, the last one loaded is found
+    assert await store.async_get_refresh_token("user-token-id") is owner_token
+    assert await store.async_get_refresh_token_by_token("some-token") is system_token
+    assert await store.async_get_refresh_token_by_token("unknown-token") is None
+
+    await store.async_remove_refresh_token(owner_token)
+    assert await store.async_get_refresh_token("user-token-id") is None
+    assert await store.async_get_refresh_token_by_token("some-token") is system_token
+    assert owner.refresh_tokens == {}
+
+    await store.async_remove_user(system)
+    assert await store.async_get_refresh_token("system-token-id") is None
+    assert await store.async_get_refresh_token_by_token("some-token") is None
+
 
 async def test_loading_empty_data(hass, hass_storage):
     """Test we correctly load with no existing data."""
@@ -242,3 +258,24 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_registry_changes_invalidate_permissions(hass):
+    """Test registry updates invalidate the compiled entity permissions."""
+    entity_registry = mock_registry(hass)
+    device_registry = mock_device_registry(hass)
+    entity_registry.async_get_or_create(
+        "light", "test", "1234", suggested_object_id="kitchen"
+    )
+    device = device_registry.async_get_or_create(
+        config_entry_id="mock-entry", connections={("mac", "12:34:56:ab:cd:ef")}
+    )
+
+    store = auth_store.AuthStore(hass)
+    await store._async_load()
+    compiled = compile_entities({"device_ids": {device.id: True}}, store._perm_lookup)
+    assert compiled("light.kitchen", "read") is False
+
+    entity_registry.async_get_or_create("light", "test", "1234", device_id=device.id)
+    await hass.async_block_till_done()
+    assert compiled("light.kitchen", "read") is True
@@ -474,6 +474,43 @@ async def test_remove_refresh_token(mock_hass):
     assert await manager.async_validate_access_token(access_token) is None
 
 
+async def test_validate_access_token_cached(mock_hass):
+    """Test verified access tokens are cached until invalidated."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+    other_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    other_access_token = manager.async_create_access_token(other_token)
+
+    with patch("homeassistant.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        assert mock_decode.call_count == 2
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        assert mock_decode.call_count == 2
+
+        # Cached tokens are verified again after the TTL
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=dt_util.utcnow()
+            + auth_const.ACCESS_TOKEN_CACHE_TTL
+            + timedelta(seconds=1),
+        ):
+            assert (
+                await manager.async_validate_access_token(access_token) is refresh_token
+            )
+        assert mock_decode.call_count == 4
+
+    assert await manager.async_validate_access_token(other_access_token) is other_token
+
+    await manager.async_remove_refresh_token(refresh_token)
+    assert await manager.async_validate_access_token(access_token) is None
+    assert await manager.async_validate_access_token(other_access_token) is other_token
+
+    await manager.async_deactivate_user(user)
+    assert await manager.async_validate_access_token(other_access_token) is None
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
@@ -336,7 +336,7 @@ def mock_component(hass, component):
 def mock_registry(hass, mock_entries=None):
     """Mock the Entity Registry."""
     registry = entity_registry.EntityRegistry(hass)
-    registry.entities = mock_entries or OrderedDict()
+    registry.entities = entity_registry.EntityRegistryItems(mock_entries)
 
     hass.data[entity_registry.DATA_REGISTRY] = registry
     return registry
@@ -354,8 +354,8 @@ def mock_area_registry(hass, mock_entries=None):
 def mock_device_registry(hass, mock_entries=None, mock_deleted_entries=None):
     """Mock the Device Registry."""
     registry = device_registry.DeviceRegistry(hass)
-    registry.devices = mock_entries or OrderedDict()
-    registry.deleted_devices = mock_deleted_entries or OrderedDict()
+    registry.devices = device_registry.ActiveDeviceRegistryItems(mock_entries)
+    registry.deleted_devices = device_registry.DeviceRegistryItems(mock_deleted_entries)
 
     hass.data[device_registry.DATA_REGISTRY] = registry
     return registry
@@ -238,6 +238,35 @@ async def test_api_get_event_listeners(hass, mock_api_client):
     assert len(local) == 0
 
 
+async def test_api_event_metrics(hass, mock_api_client):
+    """Test enabling and reading event dispatch metrics."""
+    resp = await mock_api_client.get("/api/event_metrics")
+    assert resp.status == 200
+    assert await resp.json() == {"enabled": False, "events": []}
+
+    resp = await mock_api_client.post("/api/event_metrics", json={"enabled": "yes"})
+    assert resp.status == 400
+
+    resp = await mock_api_client.post("/api/event_metrics", json={"enabled": True})
+    assert resp.status == 200
+    assert hass.bus.metrics_enabled
+
+    hass.bus.async_listen("test_event", ha.callback(lambda event: None))
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    resp = await mock_api_client.get("/api/event_metrics")
+    data = await resp.json()
+    assert data["enabled"] is True
+    metrics = {item["event"]: item for item in data["events"]}
+    assert metrics["test_event"]["fires"] == 1
+    assert metrics["test_event"]["listener_count"] == 1
+
+    resp = await mock_api_client.post("/api/event_metrics", json={"enabled": False})
+    assert resp.status == 200
+    assert not hass.bus.metrics_enabled
+
+
 async def test_api_get_services(hass, mock_api_client):
     """Test if we can get a dict describing current services."""
     resp = await mock_api_client.get(const.URL_API_SERVICES)
@@ -0,0 +1,104 @@
+"""The tests for sharing camera frames."""
+import asyncio
+
+from homeassistant.components.camera.frame_cache import FrameCache, FrameFanout
+
+
+async def test_concurrent_requests_share_fetch(hass):
+    """Test concurrent requests wait for the same fetch."""
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch():
+        calls.append(None)
+        await release.wait()
+        return b"frame"
+
+    cache = FrameCache(hass, fetch)
+    requests = [hass.async_create_task(cache.async_get()) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*requests) == [b"frame"] * 5
+    assert len(calls) == 1
+
+    # Without a TTL every request after the fetch fetches again
+    assert await cache.async_get() == b"frame"
+    assert len(calls) == 2
+
+
+async def test_fetch_survives_cancelled_request(hass):
+    """Test cancelling the request that started a fetch keeps the fetch."""
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return b"frame"
+
+    cache = FrameCache(hass, fetch)
+    first = hass.async_create_task(cache.async_get())
+    await asyncio.sleep(0)
+    first.cancel()
+
+    second = hass.async_create_task(cache.async_get())
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == b"frame"
+
+
+async def test_ttl(hass):
+    """Test frames younger than the TTL are reused."""
+    frames = iter([b"one", b"two"])
+
+    async def fetch():
+        return next(frames)
+
+    cache = FrameCache(hass, fetch)
+    assert await cache.async_get(60) == b"one"
+    assert await cache.async_get(60) == b"one"
+
+    cache.fetched_at -= 60
+    assert await cache.async_get(60) == b"two"
+
+
+async def test_fanout_distinct_frames(hass):
+    """Test subscribers share one producer and only get changed frames."""
+    frames = [b"one", b"one", b"two", b"two", b"three", None]
+    fetched = []
+    idle = []
+
+    async def fetch():
+        fetched.append(None)
+        return frames.pop(0)
+
+    fanout = FrameFanout(hass, fetch, 0, lambda: idle.append(None))
+
+    async def collect():
+        return [frame async for frame in fanout.async_frames()]
+
+    first = hass.async_create_task(collect())
+    second = hass.async_create_task(collect())
+    assert await first == [b"one", b"two", b"three"]
+    assert await second == [b"one", b"two", b"three"]
+
+    assert len(fetched) == 6
+    assert idle == [None]
+    assert fanout.subscribers == 0
+
+
+async def test_fanout_stops_without_subscribers(hass):
+    """Test the producer stops when the last subscriber leaves."""
+    idle = []
+
+    async def fetch():
+        return b"frame"
+
+    fanout = FrameFanout(hass, fetch, 0, lambda: idle.append(None))
+    frames = fanout.async_frames()
+    assert await frames.__anext__() == b"frame"
+    await frames.aclose()
+    assert fanout.subscribers == 0
+
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert idle == [None]
@@ -6,7 +6,11 @@ import io
 import pytest
 
 from homeassistant.components import camera
-from homeassistant.components.camera.const import DOMAIN, PREF_PRELOAD_STREAM
+from homeassistant.components.camera.const import (
+    DOMAIN,
+    PREF_FRAME_CACHE_TTL,
+    PREF_PRELOAD_STREAM,
+)
 from homeassistant.components.camera.prefs import CameraEntityPreferences
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 from homeassistant.config import async_process_ha_core_config
@@ -240,6 +244,64 @@ async def test_websocket_update_prefs(
     )
 
 
+async def test_websocket_update_frame_cache_ttl(hass, hass_ws_client, mock_camera):
+    """Test sharing images between requests with a frame cache TTL."""
+    client = await hass_ws_client(hass)
+    await client.send_json(
+        {
+            "id": 8,
+            "type": "camera/update_prefs",
+            "entity_id": "camera.demo_camera",
+            "frame_cache_ttl": 30,
+        }
+    )
+    response = await client.receive_json()
+
+    assert response["success"]
+    assert response["result"][PREF_FRAME_CACHE_TTL] == 30
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=b"Test",
+    ) as mock_image:
+        for _ in range(3):
+            image = await camera.async_get_image(hass, "camera.demo_camera")
+            assert image.content == b"Test"
+
+    assert mock_image.call_count == 1
+
+
+async def test_camera_proxy_shares_fetch(hass, aiohttp_client, mock_camera):
+    """Test concurrent camera proxy requests share one image fetch."""
+    calls = []
+    release = asyncio.Event()
+
+    async def camera_image(self):
+        calls.append(None)
+        await release.wait()
+        return b"Test"
+
+    client = await aiohttp_client(hass.http.app)
+    entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    url = f"/api/camera_proxy/camera.demo_camera?token={entity.access_tokens[-1]}"
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        camera_image,
+    ):
+        requests = [hass.async_create_task(client.get(url)) for _ in range(3)]
+        while not calls:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+    for response in responses:
+        assert response.status == 200
+        assert await response.read() == b"Test"
+    assert len(calls) == 1
+
+
 async def test_play_stream_service_no_source(hass, mock_camera, mock_stream):
     """Test camera play_stream service."""
     data = {
@@ -1,5 +1,7 @@
 """The test for the data filter sensor platform."""
 from datetime import timedelta
+import random
+import statistics
 import unittest
 
 from homeassistant.components.filter.sensor import (
@@ -206,6 +208,21 @@ class TestFilterSensor(unittest.TestCase):
             filtered = filt.filter_state(state)
         assert 22 == filtered.state
 
+    def test_outlier_long_run(self):
+        """Test the outlier filter against the median of its window."""
+        rnd = random.Random(1)
+        filt = OutlierFilter(window_size=7, precision=2, entity=None, radius=3.0)
+        window = []
+        timestamp = dt_util.utcnow()
+        for _ in range(300):
+            value = float(rnd.randint(0, 10))
+            expected = value
+            if len(window) == 7 and abs(value - statistics.median(window)) > 3.0:
+                expected = round(statistics.median(window), 2)
+            state = ha.State("sensor.test_monitored", value, last_updated=timestamp)
+            assert filt.filter_state(state).state == expected
+            window = (window + [value])[-7:]
+
     def test_initial_outlier(self):
         """Test issue #13363."""
         filt = OutlierFilter(window_size=3, precision=2, entity=None, radius=4.0)
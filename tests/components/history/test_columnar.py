@@ -0,0 +1,102 @@
+"""The tests for the columnar history series."""
+from homeassistant.components.history.columnar import (
+    ColumnarSeries,
+    LttbSeries,
+    MeanSeries,
+    series_factory,
+    state_to_float,
+)
+
+
+def test_state_to_float():
+    """Test only finite numeric states are converted."""
+    assert state_to_float("1.5") == 1.5
+    assert state_to_float("on") is None
+    assert state_to_float("nan") is None
+    assert state_to_float("inf") is None
+    assert state_to_float(None) is None
+
+
+def test_columnar_series():
+    """Test every state is kept in the columnar series."""
+    series = ColumnarSeries()
+    assert not series
+
+    series.add(9, "unknown")
+    assert not series
+
+    series.add(10.12345, "1")
+    series.add(11, "unknown")
+    series.finish()
+
+    assert series
+    assert series.as_dict("sensor.test") == {
+        "entity_id": "sensor.test",
+        "timestamps": [9, 10.123, 11],
+        "values": [None, 1, None],
+    }
+
+
+def test_mean_series():
+    """Test the min, max and mean of each bucket."""
+    series = MeanSeries(0, 100, 4)
+    for timestamp, state in (
+        (-5, "3"),
+        (1, "1"),
+        (10, "5"),
+        (20, "unavailable"),
+        (60, "2"),
+        (70, "4"),
+        (120, "9"),
+    ):
+        series.add(timestamp, state)
+    series.finish()
+
+    assert series.as_dict("sensor.test") == {
+        "entity_id": "sensor.test",
+        "timestamps": [0, 50, 75],
+        "min": [1, 2, 9],
+        "max": [5, 4, 9],
+        "mean": [3, 3, 9],
+    }
+
+
+def test_lttb_series():
+    """Test LTTB keeps the end points and the extremes."""
+    series = LttbSeries(0, 100, 5)
+    for timestamp in range(100):
+        value = 50 if timestamp == 30 else -50 if timestamp == 70 else 0
+        series.add(timestamp, str(value))
+    series.finish()
+
+    assert series.timestamps[0] == 0
+    assert series.timestamps[-1] == 99
+    assert 30 in series.timestamps
+    assert 70 in series.timestamps
+    assert series.values[series.timestamps.index(30)] == 50
+    assert series.values[series.timestamps.index(70)] == -50
+    assert len(series.timestamps) <= 7
+
+
+def test_lttb_series_few_points():
+    """Test LTTB with fewer points than buckets."""
+    series = LttbSeries(0, 100, 50)
+    assert not series
+
+    series.add(10, "1")
+    series.finish()
+    assert series.as_dict("sensor.test")["values"] == [1]
+
+    series = LttbSeries(0, 100, 50)
+    series.add(10, "1")
+    series.add(20, "2")
+    series.add(30, "3")
+    series.finish()
+    assert series.timestamps == [10, 20, 30]
+
+
+def test_series_factory():
+    """Test the series type depends on the downsampling."""
+    assert isinstance(series_factory(0, 10, None, "mean")(), ColumnarSeries)
+    assert isinstance(series_factory(0, 10, 5, "mean")(), MeanSeries)
+    assert isinstance(series_factory(0, 10, 5, "lttb")(), LttbSeries)
@@ -2,6 +2,7 @@
 # pylint: disable=protected-access,invalid-name
 from copy import copy
 from datetime import timedelta
+from functools import partial
 import json
 import unittest
 
@@ -18,7 +19,7 @@ from tests.common import (
     init_recorder_component,
     mock_state_change_event,
 )
-from tests.components.recorder.common import wait_recording_done
+from tests.components.recorder.common import trigger_db_commit, wait_recording_done
 
 
 class TestComponentHistory(unittest.TestCase):
@@ -824,3 +825,192 @@ async def test_fetch_period_api_with_include_order(hass, hass_client):
         params={"filter_entity_id": "non.existing,something.else"},
     )
     assert response.status == 200
+
+
+async def _async_record_power_states(hass, start):
+    """Record numeric states of a power sensor, one per minute after start."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    values = ["1", "5", "unavailable", "2", "8", "3"]
+    for minute, value in enumerate(values):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=start + timedelta(minutes=minute, seconds=30),
+        ):
+            hass.states.async_set("sensor.power", value, {"unit_of_measurement": "W"})
+            hass.states.async_set("sensor.name", f"name {minute}")
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+
+async def test_fetch_period_api_columnar(hass, hass_client):
+    """Test the fetch period view for history in columnar format."""
+    start = dt_util.utcnow() - timedelta(hours=1)
+    await _async_record_power_states(hass, start)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"format": "columnar", "filter_entity_id": "sensor.power"},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert len(result) == 1
+    assert result[0]["entity_id"] == "sensor.power"
+    assert result[0]["values"] == [1, 5, None, 2, 8, 3]
+    assert result[0]["timestamps"] == [
+        round((start + timedelta(minutes=minute, seconds=30)).timestamp(), 3)
+        for minute in range(6)
+    ]
+
+    # Non numeric entities are left out
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}", params={"format": "columnar"}
+    )
+    result = await response.json()
+    assert [series["entity_id"] for series in result] == ["sensor.power"]
+
+
+async def test_fetch_period_api_columnar_downsampled(hass, hass_client):
+    """Test the fetch period view for history with downsampling."""
+    start = dt_util.utcnow() - timedelta(hours=1)
+    await _async_record_power_states(hass, start)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={
+            "format": "columnar",
+            "filter_entity_id": "sensor.power",
+            "end_time": (start + timedelta(minutes=6)).isoformat(),
+            "buckets": 2,
+        },
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert result == [
+        {
+            "entity_id": "sensor.power",
+            "timestamps": [
+                round(start.timestamp(), 3),
+                round((start + timedelta(minutes=3)).timestamp(), 3),
+            ],
+            "min": [1, 2],
+            "max": [5, 8],
+            "mean": [3, 13 / 3],
+        }
+    ]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={
+            "format": "columnar",
+            "filter_entity_id": "sensor.power",
+            "end_time": (start + timedelta(minutes=6)).isoformat(),
+            "buckets": 3,
+            "downsample": "lttb",
+        },
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert result[0]["values"][0] == 1
+    assert result[0]["values"][-1] == 3
+    assert len(result[0]["values"]) <= 5
+
+
+async def test_fetch_period_api_columnar_invalid(hass, hass_client):
+    """Test the fetch period view rejects invalid downsampling parameters."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    client = await hass_client()
+
+    for params in (
+        {"buckets": "0"},
+        {"buckets": "many"},
+        {"buckets": "100000"},
+        {"buckets": "10", "downsample": "median"},
+    ):
+        response = await client.get(
+            "/api/history/period", params={"format": "columnar", **params}
+        )
+        assert response.status == 400
+
+
+async def test_fetch_statistics_api(hass, hass_client):
+    """Test the statistics view for history."""
+    start = dt_util.utcnow() - timedelta(hours=3)
+    await _async_record_power_states(hass, start)
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_job(instance.statistics.close_all)
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(instance.block_till_done)
+    client = await hass_client()
+
+    response = await client.get(
+        f"/api/history/statistics/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.power"},
+    )
+    assert response.status == 200
+    result = await response.json()
+    assert len(result) == 1
+    assert result[0]["entity_id"] == "sensor.power"
+    assert sum(result[0]["min"]) <= sum(result[0]["max"])
+    assert result[0]["last"][-1] == 3
+
+    response = await client.get("/api/history/statistics", params={"period": "daily"})
+    assert response.status == 400
+    response = await client.get("/api/history/statistics/not-a-date")
+    assert response.status == 400
+
+
+async def test_fetch_period_api_streamed(hass, hass_client):
+    """Test the streamed period view matches the significant states."""
+    start = dt_util.utcnow() - timedelta(hours=1)
+    await _async_record_power_states(hass, start)
+    hass.states.async_set("script.can_cancel", "off", {"can_cancel": True})
+    hass.states.async_set("script.cannot_cancel", "off", {"can_cancel": False})
+    await hass.async_add_job(partial(trigger_db_commit, hass))
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+
+    for params, entity_ids, minimal_response in (
+        ({}, None, False),
+        ({"minimal_response": ""}, None, True),
+        (
+            {"filter_entity_id": "sensor.power,sensor.name,sensor.missing"},
+            ["sensor.power", "sensor.name", "sensor.missing"],
+            False,
+        ),
+        (
+            {"filter_entity_id": "sensor.name,sensor.power", "minimal_response": ""},
+            ["sensor.name", "sensor.power"],
+            True,
+        ),
+    ):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params=params
+        )
+        assert response.status == 200
+        result = await response.json()
+
+        expected = await hass.async_add_executor_job(
+            partial(
+                history.get_significant_states,
+                hass,
+                start,
+                start + timedelta(days=1),
+                entity_ids,
+                filters=history.Filters(),
+                minimal_response=minimal_response,
+            )
+        )
+        expected = json.loads(json.dumps(list(expected.values()), cls=JSONEncoder))
+        if entity_ids is None:
+            expected.sort(key=lambda states: states[0]["entity_id"])
+        assert result == expected
+        assert len(result) >= 2
@@ -1,4 +1,5 @@
 """Tests for Home Assistant View."""
+from aiohttp import ClientPayloadError, web
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -8,6 +9,7 @@ import pytest
 import voluptuous as vol
 
 from homeassistant.components.http.view import (
+    STREAM_CHUNK_SIZE,
     HomeAssistantView,
     request_handler_factory,
 )
@@ -69,3 +71,69 @@ async def test_not_running(mock_request_with_stopping):
         Mock(requires_auth=False), AsyncMock(side_effect=Unauthorized)
     )(mock_request_with_stopping)
     assert response.status == 503
+
+
+def _stream_app(hass, generate):
+    """Return an app streaming the items of generate."""
+    view = HomeAssistantView()
+
+    async def handler(request):
+        """Stream the items."""
+        return await view.json_stream(request, generate)
+
+    app = web.Application()
+    app["hass"] = hass
+    app.router.add_get("/", handler)
+    return app
+
+
+async def test_json_stream(hass, aiohttp_client):
+    """Test streaming a JSON list with nested iterators."""
+
+    def generate():
+        """Generate more than one chunk of items."""
+        for idx in range(STREAM_CHUNK_SIZE // 10):
+            yield {"idx": idx}
+        yield iter([1, iter([2, 3]), iter([])])
+
+    client = await aiohttp_client(_stream_app(hass, generate))
+    response = await client.get("/")
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "application/json"
+    result = await response.json()
+    assert len(result) == STREAM_CHUNK_SIZE // 10 + 1
+    assert result[0] == {"idx": 0}
+    assert result[-1] == [1, [2, 3], []]
+
+
+async def test_json_stream_empty(hass, aiohttp_client):
+    """Test streaming an empty JSON list."""
+    client = await aiohttp_client(_stream_app(hass, lambda: []))
+    response = await client.get("/")
+    assert response.status == 200
+    assert await response.json() == []
+
+
+async def test_json_stream_invalid(hass, aiohttp_client, caplog):
+    """Test an error before anything is sent results in a server error."""
+    client = await aiohttp_client(_stream_app(hass, lambda: [float("NaN")]))
+    response = await client.get("/")
+    assert response.status == 500
+    assert "Unable to serialize to JSON" in caplog.text
+
+
+async def test_json_stream_error(hass, aiohttp_client, caplog):
+    """Test an error after the first chunk was sent closes the connection."""
+
+    def generate():
+        """Fail after more than one chunk of items."""
+        for idx in range(STREAM_CHUNK_SIZE // 10):
+            yield {"idx": idx}
+        raise ValueError("broken")
+
+    client = await aiohttp_client(_stream_app(hass, generate))
+    response = await client.get("/")
+    assert response.status == 200
+    with pytest.raises(ClientPayloadError):
+        await response.read()
+    assert "Error streaming JSON response" in caplog.text
@@ -5,17 +5,12 @@ import datetime
 import pytest
 
 import homeassistant.components.influxdb as influxdb
-from homeassistant.const import (
-    EVENT_STATE_CHANGED,
-    STATE_OFF,
-    STATE_ON,
-    STATE_STANDBY,
-    UNIT_PERCENTAGE,
-)
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_STANDBY, UNIT_PERCENTAGE
 from homeassistant.core import split_entity_id
+from homeassistant.helpers.exporter import async_get_hub
 from homeassistant.setup import async_setup_component
 
-from tests.async_mock import MagicMock, Mock, call, patch
+from tests.async_mock import MagicMock, call, patch
 
 BASE_V1_CONFIG = {}
 BASE_V2_CONFIG = {
@@ -33,16 +28,6 @@ class FilterTest:
     should_pass: bool
 
 
-@pytest.fixture(autouse=True)
-def mock_batch_timeout(hass, monkeypatch):
-    """Mock the event bus listener and the batch timeout for tests."""
-    hass.bus.listen = MagicMock()
-    monkeypatch.setattr(
-        "homeassistant.components.influxdb.InfluxThread.batch_timeout",
-        Mock(return_value=0),
-    )
-
-
 @pytest.fixture(name="mock_client")
 def mock_client_fixture(request):
     """Patch the InfluxDBClient object with mock for version under test."""
@@ -115,8 +100,7 @@ async def test_setup_config_full(hass, mock_client, config_ext, get_write_api):
 
     assert await async_setup_component(hass, influxdb.DOMAIN, config)
     await hass.async_block_till_done()
-    assert hass.bus.listen.called
-    assert EVENT_STATE_CHANGED == hass.bus.listen.call_args_list[0][0][0]
+    assert async_get_hub(hass).pipelines == [hass.data[influxdb.DOMAIN]]
     assert get_write_api(mock_client).call_count == 1
 
 
@@ -135,8 +119,7 @@ async def test_setup_minimal_config(hass, mock_client, config_ext, get_write_api
 
     assert await async_setup_component(hass, influxdb.DOMAIN, config)
     await hass.async_block_till_done()
-    assert hass.bus.listen.called
-    assert EVENT_STATE_CHANGED == hass.bus.listen.call_args_list[0][0][0]
+    assert async_get_hub(hass).pipelines == [hass.data[influxdb.DOMAIN]]
     assert get_write_api(mock_client).call_count == 1
 
 
@@ -186,7 +169,7 @@ async def _setup(hass, mock_influx_client, config_ext, get_write_api):
     # A call is made to the write API during setup to test the connection.
     # Therefore we reset the write API mock here before the test begins.
     get_write_api(mock_influx_client).reset_mock()
-    return hass.bus.listen.call_args_list[0][0][1]
+    return async_get_hub(hass).async_dispatch
 
 
 @pytest.mark.parametrize(
@@ -267,7 +250,7 @@ async def test_event_listener(
             body[0]["fields"]["value"] = out[1]
 
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         write_api = get_write_api(mock_client)
         assert write_api.call_count == 1
@@ -321,7 +304,7 @@ async def test_event_listener_no_units(
             }
         ]
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         write_api = get_write_api(mock_client)
         assert write_api.call_count == 1
@@ -371,7 +354,7 @@ async def test_event_listener_inf(
         }
     ]
     handler_method(event)
-    hass.data[influxdb.DOMAIN].block_till_done()
+    await hass.data[influxdb.DOMAIN].async_flush()
 
     write_api = get_write_api(mock_client)
     assert write_api.call_count == 1
@@ -420,7 +403,7 @@ async def test_event_listener_states(
             }
         ]
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         write_api = get_write_api(mock_client)
         if state_state == 1:
@@ -431,7 +414,7 @@ async def test_event_listener_states(
         write_api.reset_mock()
 
 
-def execute_filter_test(hass, tests, handler_method, write_api, get_mock_call):
+async def execute_filter_test(hass, tests, handler_method, write_api, get_mock_call):
     """Execute all tests for a given filtering test."""
     for test in tests:
         domain, entity_id = split_entity_id(test.id)
@@ -452,7 +435,7 @@ def execute_filter_test(hass, tests, handler_method, write_api, get_mock_call):
             }
         ]
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         if test.should_pass:
             write_api.assert_called_once()
@@ -493,7 +476,7 @@ async def test_event_listener_denylist(
         FilterTest("fake.ok", True),
         FilterTest("fake.denylisted", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -527,7 +510,7 @@ async def test_event_listener_denylist_domain(
         FilterTest("fake.ok", True),
         FilterTest("another_fake.denylisted", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -561,7 +544,7 @@ async def test_event_listener_denylist_glob(
         FilterTest("fake.ok", True),
         FilterTest("fake.excluded_entity", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -595,7 +578,7 @@ async def test_event_listener_allowlist(
         FilterTest("fake.included", True),
         FilterTest("fake.excluded", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -629,7 +612,7 @@ async def test_event_listener_allowlist_domain(
         FilterTest("fake.ok", True),
         FilterTest("another_fake.excluded", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -663,7 +646,7 @@ async def test_event_listener_allowlist_glob(
         FilterTest("fake.included_entity", True),
         FilterTest("fake.denied", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -713,7 +696,7 @@ async def test_event_listener_filtered_allowlist(
         FilterTest("fake.excluded_entity", False),
         FilterTest("another_fake.included_entity", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -753,7 +736,7 @@ async def test_event_listener_filtered_denylist(
         FilterTest("another_fake.denied", False),
         FilterTest("fake.excluded_entity", False),
     ]
-    execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
+    await execute_filter_test(hass, tests, handler_method, write_api, get_mock_call)
 
 
 @pytest.mark.parametrize(
@@ -822,7 +805,7 @@ async def test_event_listener_invalid_type(
             body[0]["fields"]["value"] = out[1]
 
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         write_api = get_write_api(mock_client)
         assert write_api.call_count == 1
@@ -869,7 +852,7 @@ async def test_event_listener_default_measurement(
         }
     ]
     handler_method(event)
-    hass.data[influxdb.DOMAIN].block_till_done()
+    await hass.data[influxdb.DOMAIN].async_flush()
 
     write_api = get_write_api(mock_client)
     assert write_api.call_count == 1
@@ -920,7 +903,7 @@ async def test_event_listener_unit_of_measurement_field(
         }
     ]
     handler_method(event)
-    hass.data[influxdb.DOMAIN].block_till_done()
+    await hass.data[influxdb.DOMAIN].async_flush()
 
     write_api = get_write_api(mock_client)
     assert write_api.call_count == 1
@@ -975,7 +958,7 @@ async def test_event_listener_tags_attributes(
         }
     ]
     handler_method(event)
-    hass.data[influxdb.DOMAIN].block_till_done()
+    await hass.data[influxdb.DOMAIN].async_flush()
 
     write_api = get_write_api(mock_client)
     assert write_api.call_count == 1
@@ -1040,7 +1023,7 @@ async def test_event_listener_component_override_measurement(
             }
         ]
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         write_api = get_write_api(mock_client)
         assert write_api.call_count == 1
@@ -1084,21 +1067,23 @@ async def test_event_listener_scheduled_write(
     event = MagicMock(data={"new_state": state}, time_fired=12345)
     write_api = get_write_api(mock_client)
     write_api.side_effect = IOError("foo")
+    pipeline = hass.data[influxdb.DOMAIN]
+    pipeline.retry_delay = 0
 
     # Write fails
-    with patch.object(influxdb.time, "sleep") as mock_sleep:
-        handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
-        assert mock_sleep.called
+    handler_method(event)
+    await pipeline.async_flush()
     assert write_api.call_count == 2
+    assert pipeline.metrics["retries"] == 1
+    assert pipeline.metrics["failed"] == 1
 
     # Write works again
     write_api.side_effect = None
-    with patch.object(influxdb.time, "sleep") as mock_sleep:
-        handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
-        assert not mock_sleep.called
+    handler_method(event)
+    await pipeline.async_flush()
     assert write_api.call_count == 3
+    assert pipeline.metrics["retries"] == 1
+    assert pipeline.metrics["written"] == 1
 
 
 @pytest.mark.parametrize(
@@ -1142,8 +1127,8 @@ async def test_event_listener_backlog_full(
         monotonic_time += 60
         return monotonic_time
 
-    with patch("homeassistant.components.influxdb.time.monotonic", new=fast_monotonic):
+    with patch("homeassistant.helpers.exporter.time.monotonic", new=fast_monotonic):
         handler_method(event)
-        hass.data[influxdb.DOMAIN].block_till_done()
+        await hass.data[influxdb.DOMAIN].async_flush()
 
         assert get_write_api(mock_client).call_count == 0
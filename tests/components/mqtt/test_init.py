@@ -1,4 +1,5 @@
 """The tests for the MQTT component."""
+import asyncio
 from datetime import datetime, timedelta
 import json
 import ssl
@@ -312,6 +313,79 @@ async def test_all_subscriptions_run_when_decode_fails(
     assert len(calls) == 1
 
 
+async def test_subscriptions_receive_payload_in_their_encoding(
+    hass, mqtt_mock, calls, record_calls
+):
+    """Test subscriptions sharing a message get the payload in their encoding."""
+    await mqtt.async_subscribe(hass, "test-topic/+", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic/#", record_calls, encoding=None)
+    await mqtt.async_subscribe(hass, "test-topic/state", record_calls)
+
+    async_fire_mqtt_message(hass, "test-topic/state", "\u00b0C")
+
+    await hass.async_block_till_done()
+    payloads = {call[0].subscribed_topic: call[0].payload for call in calls}
+    assert payloads == {
+        "test-topic/+": "\u00b0C",
+        "test-topic/#": "\u00b0C".encode(),
+        "test-topic/state": "\u00b0C",
+    }
+
+
+async def test_subscribe_coalesce(hass, mqtt_mock, calls, record_calls):
+    """Test the latest message wins during a coalescing window."""
+    await mqtt.async_subscribe(hass, "meter/+", record_calls, coalesce=0.05)
+    await mqtt.async_subscribe(hass, "meter/power", lambda msg: None)
+
+    for payload in ("1", "2", "3"):
+        async_fire_mqtt_message(hass, "meter/power", payload)
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["1"]
+
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["1", "3"]
+
+    topic_stats = hass.data["mqtt"].topic_stats
+    stats = topic_stats.get("meter/+")
+    assert (stats.received, stats.coalesced, stats.dispatched) == (3, 1, 2)
+    stats = topic_stats.get("meter/power")
+    assert (stats.received, stats.coalesced, stats.dispatched) == (3, 0, 3)
+
+
+async def test_unsubscribe_coalesce(hass, mqtt_mock, calls, record_calls):
+    """Test a held back message is dropped on unsubscribe."""
+    unsub = await mqtt.async_subscribe(hass, "meter", record_calls, coalesce=0.05)
+
+    async_fire_mqtt_message(hass, "meter", "1")
+    async_fire_mqtt_message(hass, "meter", "2")
+    unsub()
+
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["1"]
+
+
+async def test_ingest_batches_messages(hass, mqtt_mock, calls, record_calls):
+    """Test messages from the paho thread are handled in one job."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    mqtt_client = hass.data["mqtt"]
+
+    with patch.object(hass, "add_job") as mock_add_job:
+        for payload in (b"1", b"2", b"3"):
+            await hass.async_add_executor_job(
+                mqtt_client._mqtt_on_message,
+                None,
+                None,
+                mqtt.Message("test-topic", payload, 0, False),
+            )
+
+    assert mock_add_job.call_count == 1
+    mock_add_job.call_args[0][0]()
+    await hass.async_block_till_done()
+    assert [call[0].payload for call in calls] == ["1", "2", "3"]
+
+
 async def test_subscribe_topic(hass, mqtt_mock, calls, record_calls):
     """Test the subscription of a topic."""
     unsub = await mqtt.async_subscribe(hass, "test-topic", record_calls)
@@ -831,6 +905,42 @@ async def test_mqtt_ws_subscription(hass, hass_ws_client, mqtt_mock):
     assert response["success"]
 
 
+async def test_mqtt_ws_topic_stats(hass, hass_ws_client, mqtt_mock):
+    """Test MQTT websocket topic stats."""
+    await mqtt.async_subscribe(hass, "test-topic", lambda msg: None)
+    async_fire_mqtt_message(hass, "test-topic", "test1")
+    async_fire_mqtt_message(hass, "other-topic", "test2")
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/topic_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "test-topic": {"received": 1, "coalesced": 0, "dispatched": 1}
+    }
+
+
+async def test_topic_stats_per_filter(hass, mqtt_mock):
+    """Test counters are kept per subscribed topic filter."""
+    unsub = await mqtt.async_subscribe(hass, "test-topic/#", lambda msg: None)
+    unsub_twice = await mqtt.async_subscribe(hass, "test-topic/#", lambda msg: None)
+    await mqtt.async_subscribe(hass, "test-topic/kept", lambda msg: None)
+    for topic in ("test-topic/a", "test-topic/b", "test-topic/kept", "other-topic"):
+        async_fire_mqtt_message(hass, topic, "test")
+    await hass.async_block_till_done()
+
+    topic_stats = hass.data["mqtt"].topic_stats
+    assert set(topic_stats.keys()) == {"test-topic/#", "test-topic/kept"}
+    assert topic_stats.get("test-topic/#").received == 3
+    assert topic_stats.get("test-topic/#").dispatched == 6
+
+    unsub()
+    assert set(topic_stats.keys()) == {"test-topic/#", "test-topic/kept"}
+    unsub_twice()
+    assert set(topic_stats.keys()) == {"test-topic/kept"}
+
+
 async def test_dump_service(hass, mqtt_mock):
     """Test that we can dump a topic."""
     mopen = mock_open()
@@ -0,0 +1,73 @@
+"""The tests for the MQTT topic matcher."""
+import pytest
+
+from homeassistant.components.mqtt.matcher import TopicMatcher
+
+
+def _matches(matcher, topic):
+    """Return the sorted values matching a topic."""
+    return sorted(matcher.iter_match(topic))
+
+
+def test_match_wildcards():
+    """Test matching filters with and without wildcards."""
+    matcher = TopicMatcher()
+    for topic_filter in (
+        "home/kitchen/temperature",
+        "home/+/temperature",
+        "home/#",
+        "home/kitchen/+",
+        "#",
+        "+/+",
+        "office/#",
+    ):
+        matcher.add(topic_filter, topic_filter)
+
+    assert _matches(matcher, "home/kitchen/temperature") == [
+        "#",
+        "home/#",
+        "home/+/temperature",
+        "home/kitchen/+",
+        "home/kitchen/temperature",
+    ]
+    assert _matches(matcher, "home/kitchen") == ["#", "+/+", "home/#"]
+    assert _matches(matcher, "home") == ["#", "home/#"]
+    assert _matches(matcher, "office") == ["#", "office/#"]
+    assert _matches(matcher, "garden/light/state") == ["#"]
+
+
+def test_match_sys_topics():
+    """Test wildcards on the first level don't match $ topics."""
+    matcher = TopicMatcher()
+    for topic_filter in ("#", "+/info", "$SYS/#", "$SYS/+"):
+        matcher.add(topic_filter, topic_filter)
+
+    assert _matches(matcher, "$SYS/info") == ["$SYS/#", "$SYS/+"]
+    assert _matches(matcher, "sys/info") == ["#", "+/info"]
+
+
+def test_add_remove():
+    """Test values are kept per filter and nodes are pruned."""
+    matcher = TopicMatcher()
+    matcher.add("a/+/c", 1)
+    matcher.add("a/+/c", 2)
+    matcher.add("a/b", 3)
+
+    assert _matches(matcher, "a/b/c") == [1, 2]
+    assert matcher.has_filter("a/+/c")
+    assert not matcher.has_filter("a/+")
+
+    matcher.remove("a/+/c", 1)
+    assert _matches(matcher, "a/b/c") == [2]
+    assert matcher.has_filter("a/+/c")
+
+    matcher.remove("a/+/c", 2)
+    assert _matches(matcher, "a/b/c") == []
+    assert not matcher.has_filter("a/+/c")
+    assert "+" not in matcher._root.children["a"].children
+    assert _matches(matcher, "a/b") == [3]
+
+    with pytest.raises(KeyError):
+        matcher.remove("a/+/c", 2)
+    with pytest.raises(KeyError):
+        matcher.remove("x/y", 1)
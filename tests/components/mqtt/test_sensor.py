@@ -1,4 +1,5 @@
 """The tests for the MQTT sensor platform."""
+import asyncio
 from datetime import datetime, timedelta
 import json
 
@@ -139,6 +140,33 @@ async def test_setting_sensor_value_expires(hass, mqtt_mock, caplog):
     assert state.state == "unknown"
 
 
+async def test_setting_sensor_value_coalesced(hass, mqtt_mock):
+    """Test only the latest value of a coalescing window is applied."""
+    assert await async_setup_component(
+        hass,
+        sensor.DOMAIN,
+        {
+            sensor.DOMAIN: {
+                "platform": "mqtt",
+                "name": "test",
+                "state_topic": "test-topic",
+                "value_template": "{{ value_json.val }}",
+                "coalesce": 0.05,
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    for value in ("100", "101", "102"):
+        async_fire_mqtt_message(hass, "test-topic", f'{{ "val": "{value}" }}')
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "100"
+
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.test").state == "102"
+
+
 async def test_setting_sensor_value_via_mqtt_json_message(hass, mqtt_mock):
     """Test the setting of the value via MQTT with JSON payload."""
     assert await async_setup_component(
@@ -162,6 +162,31 @@ async def test_qos_encoding_custom(hass, mqtt_mock, caplog):
     )
 
 
+async def test_coalesce(hass, mqtt_mock, caplog):
+    """Test coalescing is passed on when set."""
+
+    @callback
+    def msg_callback(*args):
+        """Do nothing."""
+        pass
+
+    sub_state = None
+    sub_state = await async_subscribe_topics(
+        hass,
+        sub_state,
+        {
+            "test_topic1": {
+                "topic": "test-topic1",
+                "msg_callback": msg_callback,
+                "coalesce": 0.5,
+            }
+        },
+    )
+    mqtt_mock.async_subscribe.assert_called_once_with(
+        "test-topic1", mock.ANY, 0, "utf-8", coalesce=0.5
+    )
+
+
 async def test_no_change(hass, mqtt_mock, caplog):
     """Test subscription to topics without change."""
 
@@ -1,6 +1,7 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
 from datetime import datetime, timedelta
+import json
 import unittest
 
 import pytest
@@ -16,8 +17,8 @@ from homeassistant.components.recorder import (
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import Events, RecorderRuns, States
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import MATCH_ALL
-from homeassistant.core import ATTR_NOW, EVENT_TIME_CHANGED, Context, callback
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.core import ATTR_NOW, EVENT_TIME_CHANGED, Context, Event, callback
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
 
@@ -286,6 +287,165 @@ def test_recorder_setup_failure():
     hass.stop()
 
 
+def _queue_limited_recorder(hass, queue_overflow, spill_path=None):
+    """Create a recorder that is not running with a queue of two events."""
+    return Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=7,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=10,
+        db_retry_wait=3,
+        entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
+        exclude_t=[],
+        max_queue_size=2,
+        queue_overflow=queue_overflow,
+        spill_path=spill_path,
+    )
+
+
+def _state_changed_event(entity_id, state):
+    """Return a minimal state changed event."""
+    return Event(EVENT_STATE_CHANGED, {"entity_id": entity_id, "new_state": state})
+
+
+async def test_queue_overflow_drop(hass, caplog):
+    """Test events are dropped when the queue is full."""
+    rec = _queue_limited_recorder(hass, "drop")
+
+    for state in ("a", "b", "c", "d"):
+        rec.event_listener(_state_changed_event("test.one", state))
+    rec.event_listener(Event(EVENT_TIME_CHANGED))
+
+    assert rec.queue_depth == 2
+    assert rec.dropped_events == 2
+    assert "Recorder queue reached its maximum size" in caplog.text
+
+    rec.queue.get_nowait()
+    rec.queue.get_nowait()
+    rec.event_listener(_state_changed_event("test.one", "e"))
+
+    assert rec.queue.get_nowait().data["new_state"] == "e"
+    assert "Recorder queue is no longer full" in caplog.text
+
+
+async def test_queue_overflow_coalesce(hass):
+    """Test state changes for the same entity are coalesced when the queue is full."""
+    rec = _queue_limited_recorder(hass, "coalesce")
+
+    rec.event_listener(_state_changed_event("test.one", "a"))
+    rec.event_listener(_state_changed_event("test.one", "b"))
+    rec.event_listener(_state_changed_event("test.one", "c"))
+    rec.event_listener(_state_changed_event("test.two", "a"))
+    rec.event_listener(_state_changed_event("test.one", "d"))
+    rec.event_listener(Event("custom_event"))
+    rec.event_listener(Event(EVENT_TIME_CHANGED))
+
+    assert rec.queue_depth == 5
+    assert rec.coalesced_events == 1
+    assert rec.dropped_events == 0
+
+    rec.queue.get_nowait()
+    rec.queue.get_nowait()
+    rec.event_listener(Event(EVENT_TIME_CHANGED))
+
+    assert rec.queue.get_nowait().data["new_state"] == "d"
+    assert rec.queue.get_nowait().data["new_state"] == "a"
+    assert rec.queue_depth == 1
+
+
+async def test_queue_overflow_coalesce_bounded(hass):
+    """Test events that are not state changes are capped when the queue is full."""
+    rec = _queue_limited_recorder(hass, "coalesce")
+
+    rec.event_listener(_state_changed_event("test.one", "a"))
+    rec.event_listener(_state_changed_event("test.one", "b"))
+    for index in range(4):
+        rec.event_listener(Event("custom_event", {"index": index}))
+    rec.event_listener(_state_changed_event("test.two", "a"))
+
+    assert rec.queue_depth == 5
+    assert rec.dropped_events == 2
+
+    rec.queue.get_nowait()
+    rec.queue.get_nowait()
+    rec.event_listener(Event(EVENT_TIME_CHANGED))
+
+    assert rec.queue.get_nowait().data == {"index": 2}
+    assert rec.queue.get_nowait().data == {"index": 3}
+
+    rec.event_listener(Event("custom_event", {"index": 4}))
+    rec.event_listener(Event("custom_event", {"index": 5}))
+    rec.event_listener(Event("custom_event", {"index": 6}))
+    assert rec.dropped_events == 2
+    assert rec.queue_depth == 4
+
+
+def test_queue_overflow_coalesce_stop():
+    """Test held back events are recorded when Home Assistant stops."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass, {"max_queue_size": 5, "queue_overflow": "coalesce"})
+    hass.start()
+    wait_recording_done(hass)
+    rec = hass.data[DATA_INSTANCE]
+
+    with patch.object(rec.queue, "qsize", return_value=5):
+        hass.bus.fire("custom_event", {"index": 1})
+        hass.states.set("test.one", "on")
+        hass.bus.fire("custom_event", {"index": 2})
+        hass.block_till_done()
+        assert len(rec._overflow) == 3
+
+    with patch(
+        "homeassistant.components.recorder.Events.from_event", wraps=Events.from_event,
+    ) as mock_from_event:
+        hass.stop()
+
+    assert not rec._overflow
+    assert rec.dropped_events == 0
+    recorded = [call[0][0] for call in mock_from_event.call_args_list]
+    assert [event.data.get("index") for event in recorded[:3]] == [1, None, 2]
+
+
+def test_queue_overflow_coalesce_block_till_done():
+    """Test waiting for the recorder includes held back events."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass, {"max_queue_size": 1, "queue_overflow": "coalesce"})
+    hass.start()
+    wait_recording_done(hass)
+    rec = hass.data[DATA_INSTANCE]
+
+    with patch.object(rec.queue, "qsize", return_value=1):
+        hass.states.set("test.one", "on")
+        hass.block_till_done()
+        assert len(rec._overflow) == 1
+
+    wait_recording_done(hass)
+    assert not rec._overflow
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).filter_by(entity_id="test.one").count() == 1
+
+    hass.stop()
+
+
+async def test_queue_overflow_spill(hass, tmp_path):
+    """Test events are appended to the spill file when the queue is full."""
+    spill_path = tmp_path / "spill.jsonl"
+    rec = _queue_limited_recorder(hass, "spill", str(spill_path))
+
+    for state in ("a", "b", "c", "d"):
+        rec.event_listener(_state_changed_event("test.one", state))
+    rec.event_listener(_state_changed_event("test.one", CannotSerializeMe()))
+    await hass.async_block_till_done()
+
+    assert rec.spilled_events == 2
+    assert rec.dropped_events == 1
+    lines = spill_path.read_text().splitlines()
+    assert [json.loads(line)["data"]["new_state"] for line in lines] == ["c", "d"]
+
+
 async def test_defaults_set(hass):
     """Test the config defaults are set."""
     recorder_config = None
@@ -357,6 +517,48 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_batched(hass_recorder, caplog):
+    """Test saving events and states in batches keeps old state links."""
+    hass = hass_recorder({"batch_size": 3})
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.fail", "on", {"fail": CannotSerializeMe()})
+    hass.states.set("test.two", "on", {})
+    hass.states.set("test.one", "off", {})
+    hass.bus.fire("custom_event", {"some": "data"})
+    wait_recording_done(hass)
+    hass.states.set("test.two", "off", {})
+    hass.states.remove("test.one")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert [(state.entity_id, state.state) for state in states] == [
+            ("test.one", "on"),
+            ("test.two", "on"),
+            ("test.one", "off"),
+            ("test.two", "off"),
+            ("test.one", ""),
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[4].old_state_id == states[2].state_id
+
+        for state in states:
+            event = session.query(Events).filter_by(event_id=state.event_id).one()
+            assert event.event_type == "state_changed"
+
+        db_events = list(session.query(Events).filter_by(event_type="custom_event"))
+        assert len(db_events) == 1
+        assert db_events[0].to_native().data == {"some": "data"}
+        last_two_state_id = states[3].state_id
+
+    assert hass.data[DATA_INSTANCE]._old_state_ids["test.two"] == last_two_state_id
+    assert "Event is not JSON serializable" in caplog.text
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -20,7 +20,7 @@ class TestRecorderPurge(unittest.TestCase):
     def setUp(self):  # pylint: disable=invalid-name
         """Set up things to be run when tests are started."""
         self.hass = get_test_home_assistant()
-        init_recorder_component(self.hass)
+        init_recorder_component(self.hass, {"purge_batch_size": 2})
         self.hass.start()
         self.addCleanup(self.tear_down_cleanup)
 
@@ -142,6 +142,57 @@ class TestRecorderPurge(unittest.TestCase):
             assert finished
             assert states.count() == 2
 
+    def test_purge_progress(self):
+        """Test the progress of a purge spread over several chunks."""
+        self._add_test_states()
+        self._add_test_events()
+        instance = self.hass.data[DATA_INSTANCE]
+
+        assert not purge_old_data(instance, 4, repack=False)
+        progress = instance.purge_progress
+        assert progress.as_dict()["states_deleted"] == 2
+        assert progress.as_dict()["events_deleted"] == 2
+        assert progress.remaining_estimate == 4
+
+        assert not purge_old_data(instance, 4, repack=False)
+        assert instance.purge_progress is progress
+        assert progress.chunks == 2
+        assert progress.rows_deleted == 8
+        assert progress.remaining_estimate == 0
+
+        assert purge_old_data(instance, 4, repack=False)
+        assert instance.purge_progress is None
+        assert progress.chunks == 3
+
+    def test_purge_keeps_newer_rows_in_range(self):
+        """Test rows in the purged id range that are too new are kept."""
+        now = dt_util.utcnow()
+        instance = self.hass.data[DATA_INSTANCE]
+        instance.purge_batch_size = 10
+        self.hass.block_till_done()
+        instance.block_till_done()
+
+        with session_scope(hass=self.hass) as session:
+            for day in (11, 0, 9, 0, 6):
+                timestamp = now - timedelta(days=day)
+                session.add(
+                    States(
+                        entity_id="test.recorder2",
+                        domain="sensor",
+                        state=str(day),
+                        attributes="{}",
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        created=timestamp,
+                    )
+                )
+
+        assert purge_old_data(instance, 4, repack=False)
+
+        with session_scope(hass=self.hass) as session:
+            states = session.query(States).filter_by(entity_id="test.recorder2")
+            assert [state.state for state in states] == ["0", "0"]
+
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -224,6 +275,6 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
                 assert (
-                    mock_logger.debug.mock_calls[4][1][0]
+                    mock_logger.debug.mock_calls[5][1][0]
                     == "Vacuuming SQL DB to free space"
                 )
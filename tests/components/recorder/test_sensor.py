@@ -0,0 +1,69 @@
+"""The tests for the recorder sensors."""
+import pytest
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.setup import setup_component
+
+from .common import wait_recording_done
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def test_sensors_not_loaded_by_default(hass_recorder):
+    """Test the sensors are only loaded with a queue limit."""
+    hass = hass_recorder()
+
+    assert hass.states.get("sensor.recorder_queue_depth") is None
+    assert hass.states.get("sensor.recorder_commit_latency") is None
+
+
+def test_queue_sensors(hass_recorder):
+    """Test the queue depth and commit latency sensors."""
+    hass = hass_recorder({"max_queue_size": 100, "queue_overflow": "coalesce"})
+    assert setup_component(hass, "homeassistant", {})
+
+    hass.states.set("test.one", "on")
+    wait_recording_done(hass)
+
+    instance = hass.data[DATA_INSTANCE]
+    instance.coalesced_events = 3
+    hass.services.call(
+        "homeassistant",
+        "update_entity",
+        {
+            "entity_id": [
+                "sensor.recorder_queue_depth",
+                "sensor.recorder_commit_latency",
+            ]
+        },
+        blocking=True,
+    )
+
+    state = hass.states.get("sensor.recorder_queue_depth")
+    assert int(state.state) >= 0
+    assert state.attributes["unit_of_measurement"] == "events"
+    assert state.attributes["max_queue_size"] == 100
+    assert state.attributes["queue_overflow"] == "coalesce"
+    assert state.attributes["coalesced_events"] == 3
+    assert state.attributes["dropped_events"] == 0
+
+    state = hass.states.get("sensor.recorder_commit_latency")
+    assert state.attributes["unit_of_measurement"] == "ms"
+    assert float(state.state) >= 0
@@ -0,0 +1,124 @@
+"""The tests for the recorder state snapshots."""
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.components import history
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import StateSnapshots
+from homeassistant.components.recorder.snapshot import last_checkpoint, write_snapshot
+from homeassistant.components.recorder.util import session_scope
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _set_states(hass, point_in_time, states):
+    """Set states at a point in time."""
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow", return_value=point_in_time
+    ):
+        for entity_id, state in states.items():
+            hass.states.set(entity_id, state)
+    wait_recording_done(hass)
+
+
+def _write_snapshot(hass):
+    """Write a snapshot of the current run."""
+    with session_scope(hass=hass) as session:
+        return write_snapshot(session, hass.data[DATA_INSTANCE].run_info.start)
+
+
+def _states_at(hass, point_in_time, entity_ids=None):
+    """Return the state of each entity at a point in time."""
+    return {
+        state.entity_id: state.state
+        for state in history.get_states(hass, point_in_time, entity_ids)
+    }
+
+
+def test_snapshot_states_at_time(hass_recorder):
+    """Test states at a point in time are the same with snapshots."""
+    hass = hass_recorder()
+    start = dt_util.utcnow()
+    one = start + timedelta(minutes=1)
+    two = start + timedelta(minutes=2)
+    three = start + timedelta(minutes=3)
+
+    _set_states(hass, one, {"test.a": "1", "test.b": "1", "test.c": "1"})
+    assert _write_snapshot(hass) == one
+    # Nothing changed since the previous snapshot
+    assert _write_snapshot(hass) is None
+
+    _set_states(hass, two, {"test.a": "2"})
+    assert _write_snapshot(hass) == two
+    _set_states(hass, three, {"test.b": "3"})
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateSnapshots).filter_by(checkpoint=two).count() == 3
+        run_start = hass.data[DATA_INSTANCE].run_info.start
+        assert last_checkpoint(session, run_start, two) == one
+        assert last_checkpoint(session, run_start, three) == two
+
+    end = three + timedelta(seconds=1)
+    assert _states_at(hass, end) == {"test.a": "2", "test.b": "3", "test.c": "1"}
+    assert _states_at(hass, two) == {"test.a": "1", "test.b": "1", "test.c": "1"}
+    assert _states_at(hass, two + timedelta(seconds=1)) == {
+        "test.a": "2",
+        "test.b": "1",
+        "test.c": "1",
+    }
+    assert _states_at(hass, end, ["test.a", "test.b"]) == {"test.a": "2", "test.b": "3"}
+    assert _states_at(hass, end, ["test.c", "test.b"]) == {"test.b": "3", "test.c": "1"}
+
+
+def test_states_at_time_entity_filter_without_snapshot(hass_recorder):
+    """Test the entity ids are used when there is no snapshot."""
+    hass = hass_recorder()
+    one = dt_util.utcnow() + timedelta(minutes=1)
+
+    _set_states(hass, one, {"test.a": "1", "test.b": "1", "test.c": "1"})
+
+    end = one + timedelta(seconds=1)
+    assert _states_at(hass, end, ["test.a", "test.c"]) == {"test.a": "1", "test.c": "1"}
+
+
+def test_recorder_writes_snapshots(hass_recorder):
+    """Test the recorder writes a snapshot every interval."""
+    hass = hass_recorder()
+    hass.states.set("test.a", "1")
+    wait_recording_done(hass)
+
+    with patch(
+        "homeassistant.components.recorder.dt_util.utcnow",
+        return_value=dt_util.utcnow() + timedelta(hours=1, seconds=1),
+    ):
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(StateSnapshots.entity_id)
+            .filter(StateSnapshots.entity_id == "test.a")
+            .count()
+            == 1
+        )
@@ -0,0 +1,163 @@
+"""The tests for the recorder statistics."""
+# pylint: disable=protected-access
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.statistics import (
+    PERIOD_5MINUTE,
+    PERIOD_HOURLY,
+    StatisticsCompiler,
+    period_start,
+    statistics_during_period,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import Event, State
+import homeassistant.util.dt as dt_util
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import get_test_home_assistant, init_recorder_component
+
+ATTRIBUTES = {ATTR_UNIT_OF_MEASUREMENT: "W"}
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _state_changed(entity_id, state, last_updated, attributes=ATTRIBUTES):
+    """Return a state changed event."""
+    return Event(
+        "state_changed",
+        {
+            "entity_id": entity_id,
+            "new_state": State(
+                entity_id, state, attributes, last_updated, last_updated
+            ),
+        },
+    )
+
+
+def test_period_start():
+    """Test the start of a period."""
+    point = dt_util.parse_datetime("2020-07-01 10:17:43+00:00")
+    assert period_start(PERIOD_HOURLY, point) == dt_util.parse_datetime(
+        "2020-07-01 10:00:00+00:00"
+    )
+    assert period_start(PERIOD_5MINUTE, point) == dt_util.parse_datetime(
+        "2020-07-01 10:15:00+00:00"
+    )
+
+
+def test_compiler():
+    """Test buckets are finished when their period is over."""
+    start = dt_util.parse_datetime("2020-07-01 10:00:00+00:00")
+    compiler = StatisticsCompiler([PERIOD_HOURLY])
+
+    compiler.add_event(_state_changed("sensor.power", "10", start))
+    compiler.add_event(_state_changed("sensor.power", "30", start + timedelta(1 / 48)))
+    compiler.add_event(_state_changed("sensor.power", "5", start + timedelta(1 / 96)))
+    compiler.add_event(_state_changed("sensor.power", "unavailable", start))
+    compiler.add_event(_state_changed("sensor.name", "1", start, {}))
+    compiler.add_event(
+        Event("state_changed", {"entity_id": "sensor.power", "new_state": None})
+    )
+
+    assert compiler.pop_finished(start + timedelta(minutes=59)) == []
+
+    finished = compiler.pop_finished(start + timedelta(hours=1))
+    assert len(finished) == 1
+    entity_id, period, bucket = finished[0]
+    assert (entity_id, period, bucket.start) == ("sensor.power", PERIOD_HOURLY, start)
+    assert (bucket.min, bucket.max, bucket.total, bucket.count, bucket.last) == (
+        5,
+        30,
+        45,
+        3,
+        5,
+    )
+    assert compiler.pop_finished(start + timedelta(hours=2)) == []
+
+    # A state in a new period finishes the previous one
+    compiler.add_event(_state_changed("sensor.power", "1", start))
+    compiler.add_event(_state_changed("sensor.power", "2", start + timedelta(hours=1)))
+    finished = compiler.pop_finished(start)
+    assert [bucket.last for _, _, bucket in finished] == [1]
+
+    compiler.restore(finished)
+    compiler.close_all()
+    finished = compiler.pop_finished(start)
+    assert [bucket.last for _, _, bucket in finished] == [1, 2]
+
+
+def test_statistics_recorded(hass_recorder):
+    """Test statistics are written and survive a purge."""
+    hass = hass_recorder({"statistics_periods": ["hourly", "5minute"]})
+    start = period_start(PERIOD_HOURLY, dt_util.utcnow() - timedelta(days=20))
+
+    for minutes, state in ((1, "10"), (2, "20"), (7, "60"), (65, "1")):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow",
+            return_value=start + timedelta(minutes=minutes),
+        ):
+            hass.states.set("sensor.power", state, ATTRIBUTES)
+    wait_recording_done(hass)
+
+    stats = statistics_during_period(hass, start, start + timedelta(hours=1))
+    assert stats == {
+        "sensor.power": [
+            {"start": start, "min": 10, "max": 60, "mean": 30, "last": 60, "count": 3}
+        ]
+    }
+    stats = statistics_during_period(
+        hass, start, start + timedelta(hours=1), period=PERIOD_5MINUTE
+    )
+    assert [row["mean"] for row in stats["sensor.power"]] == [15, 60]
+
+    # The period that has not ended yet is written on shutdown and merged
+    # when it is continued after a restart
+    instance = hass.data[DATA_INSTANCE]
+    instance.statistics.close_all()
+    wait_recording_done(hass)
+    instance.statistics.add_event(
+        _state_changed("sensor.power", "3", start + timedelta(minutes=70))
+    )
+    instance.statistics.close_all()
+    wait_recording_done(hass)
+
+    stats = statistics_during_period(
+        hass, start + timedelta(hours=1), entity_ids=["sensor.power"]
+    )
+    assert stats["sensor.power"][0]["mean"] == 2
+    assert stats["sensor.power"][0]["count"] == 2
+    assert stats["sensor.power"][0]["last"] == 3
+
+    while not purge_old_data(instance, 4, repack=False):
+        pass
+    with session_scope(hass=hass) as session:
+        assert session.query(Statistics).count() == 6
+
+
+def test_statistics_disabled(hass_recorder):
+    """Test statistics can be turned off."""
+    hass = hass_recorder({"statistics_periods": []})
+    assert hass.data[DATA_INSTANCE].statistics is None
@@ -0,0 +1,88 @@
+"""The tests for the sliding window of the statistics sensor."""
+from datetime import timedelta
+import random
+import statistics
+
+import pytest
+
+from homeassistant.components.statistics.window import SlidingWindow
+import homeassistant.util.dt as dt_util
+
+
+def assert_matches(window, values):
+    """Assert the window statistics match the values."""
+    assert len(window) == len(values)
+    assert window.first == values[0]
+    assert window.last == values[-1]
+    assert window.mean == pytest.approx(statistics.mean(values))
+    assert window.median == statistics.median(values)
+    assert window.total == pytest.approx(sum(values))
+    assert window.min == min(values)
+    assert window.max == max(values)
+    if len(values) > 1:
+        assert window.variance == pytest.approx(statistics.variance(values))
+        assert window.stdev == pytest.approx(statistics.stdev(values))
+
+
+def test_count_eviction():
+    """Test the oldest samples are removed when the window is full."""
+    rnd = random.Random(42)
+    start = dt_util.utcnow()
+    window = SlidingWindow(25)
+    values = []
+
+    for index in range(500):
+        value = float(rnd.randint(-50, 50))
+        window.add(value, start + timedelta(seconds=index))
+        values = (values + [value])[-25:]
+        assert_matches(window, values)
+
+    assert window.oldest_age == start + timedelta(seconds=475)
+    assert window.newest_age == start + timedelta(seconds=499)
+
+
+def test_age_eviction():
+    """Test removing samples older than a point in time."""
+    rnd = random.Random(7)
+    start = dt_util.utcnow()
+    window = SlidingWindow(1000)
+    samples = []
+
+    for index in range(300):
+        age = start + timedelta(seconds=index)
+        value = rnd.uniform(0, 10)
+        window.add(value, age)
+        samples.append((value, age))
+
+        cutoff = age - timedelta(seconds=rnd.randint(0, 40))
+        kept = [sample for sample in samples if sample[1] >= cutoff]
+        assert window.purge_older_than(cutoff) == len(samples) - len(kept)
+        samples = kept
+        assert_matches(window, [value for value, _ in samples])
+
+
+def test_empty_after_removal():
+    """Test a window can be emptied and filled again."""
+    now = dt_util.utcnow()
+    window = SlidingWindow(3)
+    window.add(1.0, now)
+    window.add(5.0, now)
+
+    assert window.purge_older_than(now + timedelta(seconds=1)) == 2
+    assert not window
+    assert window.oldest_age is None
+
+    window.add(2.0, now)
+    assert_matches(window, [2.0])
+
+
+def test_not_numeric():
+    """Test a window of samples that are not numbers."""
+    now = dt_util.utcnow()
+    window = SlidingWindow(2, numeric=False)
+    for state in ("on", "off", "on"):
+        window.add(state, now)
+
+    assert len(window) == 2
+    assert window.first == "off"
+    assert window.pop_oldest() == ("off", now)
@@ -10,6 +10,8 @@ from homeassistant.components.websocket_api.auth import (
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import startup_trace
+from homeassistant.helpers.exporter import ExportPipeline
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
@@ -318,6 +320,103 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
+async def test_subscribe_entities(hass, websocket_client):
+    """Test subscribe entities sends the states and then the changes."""
+    hass.states.async_set("light.permitted", "off", {"color": "red", "level": 1})
+    original = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red", "level": 1},
+                "c": original.context.id,
+                "lc": original.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"color": "blue", "level": 1})
+    changed = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "s": "on",
+                    "a": {"color": "blue"},
+                    "c": changed.context.id,
+                    "lc": changed.last_changed.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_set("light.permitted", "on", {"level": 2})
+    updated = hass.states.get("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"level": 2},
+                    "c": updated.context.id,
+                    "lu": updated.last_updated.timestamp(),
+                },
+                "-": {"a": ["color"]},
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+    hass.states.async_set("light.new", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["light.new"]["s"] == "on"
+
+
+async def test_subscribe_entities_filtered(hass, websocket_client, hass_admin_user):
+    """Test subscribe entities only sends the requested and allowed entities."""
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.other": True}}}
+    )
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+    hass.states.async_set("light.not_permitted", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.permitted", "light.not_permitted"],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["light.permitted"]
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "on")
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["c"]) == ["light.permitted"]
+
+
 async def test_get_states_not_allows_nan(hass, websocket_client):
     """Test get_states command not allows NaN floats."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
@@ -515,3 +614,60 @@ async def test_manifest_get(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert not msg["success"]
     assert msg["error"]["code"] == "not_found"
+
+
+async def test_startup_trace(hass, websocket_client, hass_admin_user):
+    """Test getting the startup trace."""
+    await websocket_client.send_json({"id": 5, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_NOT_FOUND
+
+    trace = startup_trace.async_enable(hass)
+    startup_trace.async_mark(hass, "test", "moment")
+
+    await websocket_client.send_json({"id": 6, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == trace.as_chrome_trace()
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json({"id": 7, "type": "startup_trace"})
+
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
+async def test_exporter_metrics(hass, websocket_client):
+    """Test getting the metrics of the exporters."""
+    ExportPipeline(
+        hass, None, "test", lambda event: event, None, linger=60
+    ).async_start()
+    hass.states.async_set("sensor.test", 1)
+    await hass.async_block_till_done()
+
+    await websocket_client.send_json({"id": 5, "type": "exporter/metrics"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["test"]["received"] == 1
+    assert msg["result"]["test"]["backlog"] == 1
+
+
+async def test_template_cache_stats(hass, websocket_client):
+    """Test getting the hits and misses of the template caches."""
+    await websocket_client.send_json({"id": 5, "type": "template/cache_stats"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert set(msg["result"]) == {
+        "compile_hits",
+        "compile_misses",
+        "render_hits",
+        "render_misses",
+        "json_hits",
+        "json_misses",
+    }
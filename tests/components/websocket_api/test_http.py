@@ -53,6 +53,10 @@ async def test_pending_msg_peak(hass, mock_low_peak, hass_ws_client, caplog):
     for _ in range(5):
         instance._to_write.put_nowait(None)
 
+    # Let the writer exit before the peak checker is scheduled, it cancels
+    # a pending peak checker when it shuts down.
+    await hass.async_block_till_done()
+
     # Trigger the peak check
     instance._send_message({})
 
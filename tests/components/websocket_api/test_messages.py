@@ -0,0 +1,39 @@
+"""Test WebSocket messages."""
+import json
+
+from homeassistant.components.websocket_api import messages
+from homeassistant.components.websocket_api.const import DATA_EVENT_CACHE, JSON_DUMP
+from homeassistant.core import Event
+
+from tests.async_mock import patch
+
+
+async def test_cached_event_message(hass):
+    """Test an event is serialized once for all subscriptions."""
+    event = Event("test_event", {"hello": "world"})
+
+    with patch.object(
+        messages, "message_to_json", wraps=messages.message_to_json
+    ) as mock_to_json:
+        first = messages.cached_event_message(hass, 1, event)
+        second = messages.cached_event_message(hass, 22, event)
+
+    assert mock_to_json.call_count == 1
+    assert hass.data[DATA_EVENT_CACHE][id(event)][0] is event
+    assert first == JSON_DUMP(messages.event_message(1, event))
+    assert second == JSON_DUMP(messages.event_message(22, event))
+
+    other = Event("test_event", {"hello": "there"})
+    assert json.loads(messages.cached_event_message(hass, 1, other))["event"][
+        "data"
+    ] == {"hello": "there"}
+
+
+async def test_cached_event_message_invalid_json(hass, caplog):
+    """Test an event that can't be serialized is sent as an error."""
+    event = Event("test_event", {"bad": object()})
+
+    message = json.loads(messages.cached_event_message(hass, 7, event))
+    assert message["id"] == 7
+    assert not message["success"]
+    assert "Unable to serialize to JSON" in caplog.text
@@ -824,3 +824,85 @@ async def test_restore_simple_device(hass, registry, update_events):
     assert update_events[2]["device_id"] == entry2.id
     assert update_events[3]["action"] == "create"
     assert update_events[3]["device_id"] == entry3.id
+
+
+async def test_index_shared_identifier(registry):
+    """Test a device sharing an identifier is found after the other is removed."""
+    entry = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "456")}
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "789")}
+    )
+    entry2 = registry.async_update_device(
+        entry2.id, new_identifiers={("hue", "456"), ("hue", "789")}
+    )
+    assert registry.async_get_device({("hue", "456")}, set()) == entry
+
+    registry.async_remove_device(entry.id)
+    assert registry.async_get_device({("hue", "456")}, set()) == entry2
+
+
+async def test_index_earliest_match(registry):
+    """Test the earliest device wins when devices match by different values."""
+    entry = registry.async_get_or_create(
+        config_entry_id="1234",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+    )
+    registry.async_get_or_create(config_entry_id="1234", identifiers={("hue", "456")})
+
+    assert (
+        registry.async_get_device(
+            {("hue", "456")},
+            {(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:ab:cd:ef")},
+        )
+        == entry
+    )
+
+
+async def test_indexes_follow_updates(registry):
+    """Test lookups by identifier, connection, config entry and area."""
+    entry = registry.async_get_or_create(
+        config_entry_id="1234",
+        connections={(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:AB:CD:EF")},
+        identifiers={("hue", "456")},
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="5678", identifiers={("hue", "789")}
+    )
+
+    assert registry.async_get_device({("hue", "456")}, set()) == entry
+    assert (
+        registry.async_get_device(
+            set(), {(device_registry.CONNECTION_NETWORK_MAC, "12:34:56:ab:cd:ef")}
+        )
+        == entry
+    )
+
+    entry = registry.async_update_device(
+        entry.id, area_id="kitchen", new_identifiers={("hue", "654")}
+    )
+    assert registry.async_get_device({("hue", "456")}, set()) is None
+    assert registry.async_get_device({("hue", "654")}, set()) == entry
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [entry]
+
+    entry2 = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "789")}
+    )
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == [
+        entry,
+        entry2,
+    ]
+
+    registry.async_clear_area_id("kitchen")
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+
+    registry.async_remove_device(entry.id)
+    assert registry.async_get_device({("hue", "654")}, set()) is None
+    assert device_registry.async_entries_for_config_entry(registry, "1234") == [entry2]
+
+    restored = registry.async_get_or_create(
+        config_entry_id="1234", identifiers={("hue", "654")}
+    )
+    assert restored.id == entry.id
+    assert registry.deleted_devices == {}
@@ -648,3 +648,47 @@ async def test_async_get_device_class_lookup(hass):
             ("sensor", "battery"): "sensor.vacuum_battery",
         },
     }
+
+
+async def test_indexes_follow_updates(registry):
+    """Test lookups by unique id, device and config entry follow updates."""
+    config_1 = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    config_2 = MockConfigEntry(domain="light", entry_id="mock-id-2")
+    entry = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=config_1, device_id="device-1"
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=config_1, device_id="device-1"
+    )
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry,
+        entry2,
+    ]
+
+    entry = registry.async_update_entity(
+        entry.entity_id, new_entity_id="light.renamed", new_unique_id="4321"
+    )
+    assert registry.async_get_entity_id("light", "hue", "1234") is None
+    assert registry.async_get_entity_id("light", "hue", "4321") == "light.renamed"
+
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=config_2, device_id="device-2"
+    )
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [entry]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [entry2]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-2") == [
+        entry2
+    ]
+
+    registry.async_clear_config_entry("mock-id-2")
+    assert registry.async_get_entity_id("light", "hue", "5678") is None
+    assert entity_registry.async_entries_for_device(registry, "device-2") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-2") == []
+
+    registry.async_remove("light.renamed")
+    assert registry.async_get_entity_id("light", "hue", "4321") is None
+    assert entity_registry.async_entries_for_device(registry, "device-1") == []
@@ -9,8 +9,12 @@ from homeassistant.components import sun
 from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.event import (
+    ALL_STATES_RATE_LIMIT,
     async_call_later,
+    async_get_point_in_time_scheduler,
+    async_get_time_pattern_scheduler,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -19,6 +23,7 @@ from homeassistant.helpers.event import (
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
+    async_track_template_result,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -86,6 +91,62 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_scheduler(hass):
+    """Test point in time listeners share one ordered scheduler."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    scheduler = async_get_point_in_time_scheduler(hass)
+    runs = []
+
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("late")), birthday_paulus
+    )
+    async_track_point_in_utc_time(
+        hass,
+        callback(lambda x: runs.append("early")),
+        birthday_paulus - timedelta(seconds=5),
+    )
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("cancelled")), birthday_paulus
+    )
+
+    assert scheduler.pending == 3
+    assert hass.bus.async_listeners()[ha.EVENT_TIME_CHANGED] == 1
+
+    unsub()
+    unsub()
+    assert scheduler.pending == 2
+
+    _send_time_changed(hass, birthday_paulus + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert runs == ["early", "late"]
+    assert scheduler.pending == 0
+    assert scheduler.last_lateness == timedelta(seconds=2)
+    assert scheduler.max_lateness == timedelta(seconds=7)
+    assert ha.EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+
+async def test_track_point_in_time_scheduler_error(hass, caplog):
+    """Test a failing point in time listener does not block others."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def failing(now):
+        raise ValueError("bla")
+
+    async_track_point_in_utc_time(hass, failing, birthday_paulus)
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(1)), birthday_paulus
+    )
+
+    _send_time_changed(hass, birthday_paulus)
+    await hass.async_block_till_done()
+
+    assert len(runs) == 1
+    assert "Error running point in time listener" in caplog.text
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -324,6 +385,137 @@ async def test_track_template(hass):
     assert len(wildercard_runs) == 2
 
 
+async def test_track_template_result(hass):
+    """Test tracking the entities of the last render of a template."""
+    hass.states.async_set("input_boolean.switch", "on")
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "2")
+
+    template = Template(
+        "{% if is_state('input_boolean.switch', 'on') %}"
+        "{{ states('sensor.a') }}{% else %}{{ states('sensor.b') }}{% endif %}",
+        hass,
+    )
+    results = []
+
+    @callback
+    def result_changed(event, result):
+        results.append((event, result))
+
+    info = async_track_template_result(hass, template, result_changed)
+    assert results == [(None, "1")]
+    assert info.entities == {"input_boolean.switch", "sensor.a"}
+
+    hass.states.async_set("sensor.b", "3")
+    await hass.async_block_till_done()
+    assert len(results) == 1
+
+    hass.states.async_set("sensor.a", "4")
+    await hass.async_block_till_done()
+    assert len(results) == 2
+    assert results[-1][0].data["entity_id"] == "sensor.a"
+    assert results[-1][1] == "4"
+
+    hass.states.async_set("input_boolean.switch", "off")
+    await hass.async_block_till_done()
+    assert results[-1][1] == "3"
+    assert info.entities == {"input_boolean.switch", "sensor.b"}
+
+    # Same result, no call
+    hass.states.async_set("sensor.b", "3", {"attr": 1})
+    await hass.async_block_till_done()
+    assert len(results) == 3
+
+    hass.states.async_set("sensor.a", "5")
+    await hass.async_block_till_done()
+    assert len(results) == 3
+
+    info.async_remove()
+    hass.states.async_set("sensor.b", "6")
+    await hass.async_block_till_done()
+    assert len(results) == 3
+
+
+async def test_track_template_result_domain(hass):
+    """Test tracking entities added to a domain a template iterates."""
+    hass.states.async_set("light.one", "on")
+    hass.states.async_set("sensor.other", "on")
+
+    template = Template("{{ states.light | count }}", hass)
+    results = []
+
+    @callback
+    def result_changed(event, result):
+        results.append(result)
+
+    info = async_track_template_result(hass, template, result_changed)
+    assert results == ["1"]
+    assert info.lifecycle_domains == {"light"}
+
+    hass.states.async_set("sensor.new", "on")
+    await hass.async_block_till_done()
+    assert results == ["1"]
+
+    hass.states.async_set("light.two", "off")
+    await hass.async_block_till_done()
+    assert results == ["1", "2"]
+
+    hass.states.async_remove("light.one")
+    await hass.async_block_till_done()
+    assert results == ["1", "2", "1"]
+
+    info.async_remove()
+    assert info.lifecycle_domains == frozenset()
+
+
+async def test_track_template_result_error(hass):
+    """Test the action receives template errors."""
+    hass.states.async_set("sensor.value", "1")
+    template = Template("{{ states('sensor.value') }}{{ states(keyword) }}", hass)
+    results = []
+
+    @callback
+    def result_changed(event, result):
+        results.append(result)
+
+    async_track_template_result(hass, template, result_changed)
+    assert len(results) == 1
+    assert isinstance(results[0], TemplateError)
+
+    hass.states.async_set("sensor.value", "2")
+    await hass.async_block_till_done()
+    assert len(results) == 2
+    assert isinstance(results[1], TemplateError)
+
+
+async def test_track_template_result_all_states_rate_limit(hass):
+    """Test templates iterating all states are rate limited."""
+    hass.states.async_set("sensor.one", "on")
+    template = Template("{{ states | count }}", hass)
+    results = []
+
+    @callback
+    def result_changed(event, result):
+        results.append(result)
+
+    now = dt_util.utcnow()
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        info = async_track_template_result(hass, template, result_changed)
+        assert results == ["1"]
+        assert info.lifecycle_domains == MATCH_ALL
+
+        hass.states.async_set("sensor.two", "on")
+        hass.states.async_set("switch.three", "on")
+        await hass.async_block_till_done()
+    assert results == ["1"]
+
+    async_fire_time_changed(hass, now + ALL_STATES_RATE_LIMIT)
+    await hass.async_block_till_done()
+    assert results == ["1", "3"]
+
+    info.async_remove()
+
+
 async def test_track_same_state_simple_trigger(hass):
     """Test track_same_change with trigger simple."""
     thread_runs = []
@@ -804,6 +996,51 @@ async def test_periodic_task_clock_rollback(hass):
     assert len(specific_runs) == 4
 
 
+async def test_periodic_task_shared_scheduler(hass):
+    """Test periodic tasks share one scheduler and only run when due."""
+    scheduler = async_get_time_pattern_scheduler(hass)
+    minute_runs = []
+    hour_runs = []
+
+    unsub_minute = async_track_utc_time_change(
+        hass, callback(lambda x: minute_runs.append(x)), second=0
+    )
+    unsub_hour = async_track_utc_time_change(
+        hass, callback(lambda x: hour_runs.append(x)), minute=0, second=0
+    )
+
+    assert scheduler.tracked == 2
+    assert hass.bus.async_listeners()[ha.EVENT_TIME_CHANGED] == 1
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 22, 59, 0, tzinfo=dt_util.UTC))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 1
+    assert len(hour_runs) == 0
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 23, 0, 0, tzinfo=dt_util.UTC))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 2
+    assert len(hour_runs) == 1
+
+    # Time rolled back
+    _send_time_changed(hass, datetime(2014, 5, 24, 22, 0, 0, tzinfo=dt_util.UTC))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 3
+    assert len(hour_runs) == 2
+
+    unsub_minute()
+    assert scheduler.tracked == 1
+
+    _send_time_changed(hass, datetime(2014, 5, 24, 23, 0, 0, tzinfo=dt_util.UTC))
+    await hass.async_block_till_done()
+    assert len(minute_runs) == 3
+    assert len(hour_runs) == 3
+
+    unsub_hour()
+    assert scheduler.tracked == 0
+    assert ha.EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_periodic_task_duplicate_time(hass):
     """Test periodic tasks not triggering on duplicate time."""
     specific_runs = []
@@ -0,0 +1,193 @@
+"""Test the batched export of state changes."""
+import asyncio
+import logging
+
+import pytest
+
+from homeassistant.helpers.exporter import (
+    DROP_NEWEST,
+    ExportError,
+    ExportPipeline,
+    async_get_hub,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _recorder(writes):
+    """Return a write function that records the batches."""
+
+    async def write(records):
+        writes.append(records)
+
+    return write
+
+
+def _pipeline(hass, write, **kwargs):
+    """Create and start a pipeline that exports the entity ids."""
+    kwargs.setdefault("linger", 60)
+    pipeline = ExportPipeline(
+        hass,
+        _LOGGER,
+        "test",
+        lambda export_event: export_event.entity_id,
+        write,
+        **kwargs,
+    )
+    pipeline.async_start()
+    return pipeline
+
+
+async def test_batch_size_and_flush(hass):
+    """Test full batches are written right away and the rest on flush."""
+    writes = []
+    pipeline = _pipeline(hass, _recorder(writes), batch_size=2)
+
+    for index in range(5):
+        hass.states.async_set(f"sensor.test_{index}", index)
+    await hass.async_block_till_done()
+    assert writes == [
+        ["sensor.test_0", "sensor.test_1"],
+        ["sensor.test_2", "sensor.test_3"],
+    ]
+    assert pipeline.metrics["backlog"] == 1
+
+    await pipeline.async_flush()
+    assert writes[-1] == ["sensor.test_4"]
+    assert pipeline.metrics["written"] == 5
+    assert pipeline.metrics["batches"] == 3
+
+
+async def test_linger(hass):
+    """Test a partial batch is written once it has lingered."""
+    writes = []
+    _pipeline(hass, _recorder(writes), linger=0)
+
+    hass.states.async_set("sensor.test", 1)
+    await hass.async_block_till_done()
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+    assert writes == [["sensor.test"]]
+
+
+async def test_shared_event(hass):
+    """Test pipelines share the wrapped state change."""
+    events = []
+    ExportPipeline(
+        hass, _LOGGER, "first", events.append, None, entity_filter=lambda _: True
+    ).async_start()
+    ExportPipeline(hass, _LOGGER, "second", events.append, None).async_start()
+    assert len(async_get_hub(hass).pipelines) == 2
+
+    hass.states.async_set("sensor.test", 1)
+    await hass.async_block_till_done()
+    for pipeline in async_get_hub(hass).pipelines:
+        assert pipeline.metrics["received"] == 1
+        assert pipeline.metrics["backlog"] == 1
+
+    first, second = (pipeline._backlog[0] for pipeline in async_get_hub(hass).pipelines)
+    assert first is second
+    assert first.entity_id == "sensor.test"
+
+
+@pytest.mark.parametrize(
+    "drop_policy, expected", [("oldest", ["b", "c"]), (DROP_NEWEST, ["a", "b"])]
+)
+async def test_backlog_full(hass, drop_policy, expected):
+    """Test events are dropped when the backlog is full."""
+    writes = []
+    pipeline = _pipeline(
+        hass, _recorder(writes), max_backlog=2, drop_policy=drop_policy
+    )
+
+    for name in "abc":
+        hass.states.async_set(f"sensor.{name}", 1)
+    await hass.async_block_till_done()
+    assert pipeline.metrics["dropped"] == 1
+
+    await pipeline.async_flush()
+    assert writes == [[f"sensor.{name}" for name in expected]]
+
+
+async def test_entity_filter(hass):
+    """Test events of filtered entities are not exported."""
+    writes = []
+    pipeline = _pipeline(
+        hass, _recorder(writes), entity_filter=lambda entity_id: entity_id != "sensor.b"
+    )
+
+    hass.states.async_set("sensor.a", 1)
+    hass.states.async_set("sensor.b", 1)
+    await hass.async_block_till_done()
+    await pipeline.async_flush()
+    assert writes == [["sensor.a"]]
+    assert pipeline.metrics["filtered"] == 1
+
+
+async def test_max_in_flight(hass):
+    """Test the number of concurrent writes is limited."""
+    release = asyncio.Event()
+    writes = []
+
+    async def write(records):
+        writes.append(records)
+        await release.wait()
+
+    pipeline = _pipeline(hass, write, batch_size=1, max_in_flight=2)
+
+    for name in "abcd":
+        hass.states.async_set(f"sensor.{name}", 1)
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert len(writes) == 2
+    assert pipeline.metrics["in_flight"] == 2
+    assert pipeline.metrics["backlog"] == 2
+
+    release.set()
+    await pipeline.async_flush()
+    assert len(writes) == 4
+    assert pipeline.metrics["in_flight"] == 0
+
+
+async def test_retry_and_resume(hass, caplog):
+    """Test failed writes are retried and the lost events are logged."""
+    writes = []
+    fail = True
+
+    async def write(records):
+        writes.append(records)
+        if fail:
+            raise ExportError("unreachable")
+
+    pipeline = _pipeline(hass, write, max_retries=1, retry_delay=0)
+
+    hass.states.async_set("sensor.a", 1)
+    await hass.async_block_till_done()
+    await pipeline.async_flush()
+    assert len(writes) == 2
+    assert "Write error: unreachable" in caplog.text
+    assert pipeline.metrics["failed"] == 1
+
+    fail = False
+    hass.states.async_set("sensor.a", 2)
+    await hass.async_block_till_done()
+    await pipeline.async_flush()
+    assert len(writes) == 3
+    assert "Resumed, lost 1 events" in caplog.text
+    assert pipeline.metrics["written"] == 1
+
+
+async def test_stop(hass):
+    """Test stopping writes the backlog and unregisters the pipeline."""
+    writes = []
+    pipeline = _pipeline(hass, _recorder(writes))
+
+    hass.states.async_set("sensor.a", 1)
+    await hass.async_block_till_done()
+    await pipeline.async_stop()
+    assert writes == [["sensor.a"]]
+    assert async_get_hub(hass).pipelines == []
+
+    hass.states.async_set("sensor.a", 2)
+    await hass.async_block_till_done()
+    assert pipeline.metrics["received"] == 1
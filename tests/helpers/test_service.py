@@ -301,6 +301,98 @@ async def test_extract_entity_ids_from_area(hass, area_mock):
     )
 
 
+async def test_extract_entity_ids_cache_group_change(hass):
+    """Test cached group targets are resolved again when members change."""
+    hass.states.async_set("group.test", STATE_ON, {ATTR_ENTITY_ID: ["light.bowl"]})
+    call = ha.ServiceCall("light", "turn_on", {ATTR_ENTITY_ID: "group.test"})
+
+    assert {"light.bowl"} == await service.async_extract_entity_ids(hass, call)
+
+    hass.states.async_set("group.test", STATE_OFF, {ATTR_ENTITY_ID: ["light.bowl"]})
+    await hass.async_block_till_done()
+    with patch(
+        "homeassistant.components.group.expand_entity_ids"
+    ) as mock_expand_entity_ids:
+        assert {"light.bowl"} == await service.async_extract_entity_ids(hass, call)
+    assert not mock_expand_entity_ids.called
+
+    hass.states.async_set(
+        "group.test", STATE_ON, {ATTR_ENTITY_ID: ["light.bowl", "light.kitchen"]}
+    )
+    await hass.async_block_till_done()
+    assert {"light.bowl", "light.kitchen"} == await service.async_extract_entity_ids(
+        hass, call
+    )
+
+
+async def test_extract_entity_ids_cache_group_added(hass):
+    """Test cached targets are resolved again when a used group is added."""
+    hass.states.async_set(
+        "group.outer", STATE_ON, {ATTR_ENTITY_ID: ["group.inner", "light.bowl"]}
+    )
+    call = ha.ServiceCall("light", "turn_on", {ATTR_ENTITY_ID: "group.outer"})
+
+    assert {"light.bowl"} == await service.async_extract_entity_ids(hass, call)
+
+    hass.states.async_set("group.inner", STATE_ON, {ATTR_ENTITY_ID: ["light.kitchen"]})
+    await hass.async_block_till_done()
+    assert {"light.bowl", "light.kitchen"} == await service.async_extract_entity_ids(
+        hass, call
+    )
+
+    hass.states.async_set(
+        "group.inner", STATE_ON, {ATTR_ENTITY_ID: ["light.kitchen", "light.ceiling"]}
+    )
+    await hass.async_block_till_done()
+    assert {
+        "light.bowl",
+        "light.kitchen",
+        "light.ceiling",
+    } == await service.async_extract_entity_ids(hass, call)
+
+
+async def test_extract_target_ids_order(hass):
+    """Test targets keep the order of the service call."""
+    hass.states.async_set(
+        "group.test", STATE_ON, {ATTR_ENTITY_ID: ["light.kitchen", "light.bowl"]}
+    )
+    call = ha.ServiceCall(
+        "light",
+        "turn_on",
+        {ATTR_ENTITY_ID: ["light.ceiling", "group.test", "light.bowl", "light.attic"]},
+    )
+
+    for _ in range(2):
+        assert list(await service._async_extract_target_ids(hass, call, True)) == [
+            "light.ceiling",
+            "light.kitchen",
+            "light.bowl",
+            "light.attic",
+        ]
+
+
+async def test_extract_entity_ids_cache_registry_change(hass, area_mock):
+    """Test cached area targets are resolved again when a registry changes."""
+    call = ha.ServiceCall("light", "turn_on", {"area_id": "test-area"})
+
+    assert {"light.in_area"} == await service.async_extract_entity_ids(hass, call)
+
+    registry = await hass.helpers.entity_registry.async_get_registry()
+    registry.async_get_or_create(
+        "light",
+        "test",
+        "new-id",
+        suggested_object_id="new_in_area",
+        device_id=registry.async_get("light.in_area").device_id,
+    )
+    await hass.async_block_till_done()
+
+    assert {
+        "light.in_area",
+        "light.new_in_area",
+    } == await service.async_extract_entity_ids(hass, call)
+
+
 async def test_async_get_all_descriptions(hass):
     """Test async_get_all_descriptions."""
     group = hass.components.group
@@ -382,6 +474,27 @@ async def test_call_with_one_of_required_features(hass, mock_entities):
     assert all(entity in actual for entity in expected)
 
 
+async def test_call_targets_across_platforms(hass, mock_entities):
+    """Test targets are looked up in each platform."""
+    other = MockEntity(entity_id="light.other", available=True, should_poll=False)
+    test_service_mock = AsyncMock(return_value=None)
+    await service.entity_service_call(
+        hass,
+        [Mock(entities=mock_entities), Mock(entities={other.entity_id: other})],
+        test_service_mock,
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.bedroom", "light.other", "light.unknown"]},
+        ),
+    )
+
+    assert test_service_mock.call_count == 2
+    actual = [call[0][0] for call in test_service_mock.call_args_list]
+    assert mock_entities["light.bedroom"] in actual
+    assert other in actual
+
+
 async def test_call_with_sync_func(hass, mock_entities):
     """Test invoking sync service calls."""
     test_service_mock = Mock(return_value=None)
@@ -0,0 +1,159 @@
+"""Test the startup trace."""
+import asyncio
+import time
+
+from homeassistant.helpers import startup_trace
+from homeassistant.setup import async_setup_component
+
+from tests.async_mock import patch
+from tests.common import (
+    MockEntity,
+    MockModule,
+    MockPlatform,
+    mock_entity_platform,
+    mock_integration,
+)
+
+
+def _spans(trace, lane):
+    """Return the spans of a lane by name."""
+    chrome = trace.as_chrome_trace()
+    tid = next(
+        event["tid"]
+        for event in chrome["traceEvents"]
+        if event["ph"] == "M" and event["args"]["name"] == lane
+    )
+    return {
+        event["name"]: event
+        for event in chrome["traceEvents"]
+        if event["ph"] != "M" and event["tid"] == tid
+    }
+
+
+async def test_disabled(hass):
+    """Test nothing is recorded when the startup is not traced."""
+    with startup_trace.async_span(hass, "test", "setup") as span:
+        assert span is startup_trace.NULL_SPAN
+
+    assert startup_trace.async_get_trace(hass) is None
+
+
+async def test_blocking_time(hass):
+    """Test only the steps of a timed coroutine count as blocking."""
+    trace = startup_trace.async_enable(hass)
+
+    async def work():
+        time.sleep(0.02)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    with startup_trace.async_span(hass, "test", "async", extra=1) as span:
+        assert await span.timed(work()) == "done"
+
+    with startup_trace.async_span(hass, "test", "sync", blocking=True):
+        time.sleep(0.01)
+
+    with startup_trace.async_span(hass, "test", "untimed"):
+        await asyncio.sleep(0)
+
+    spans = _spans(trace, "test")
+    assert spans["async"]["ph"] == "X"
+    assert spans["async"]["args"]["extra"] == 1
+    assert 20 <= spans["async"]["args"]["blocking_ms"] < 50
+    assert spans["async"]["dur"] >= 70000
+    assert abs(spans["sync"]["args"]["blocking_ms"] * 1000 - spans["sync"]["dur"]) < 1
+    assert "blocking_ms" not in spans["untimed"]["args"]
+
+
+async def test_timed_errors(hass):
+    """Test exceptions and cancellation pass through a timed coroutine."""
+    startup_trace.async_enable(hass)
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError
+
+    with startup_trace.async_span(hass, "test", "fail") as span:
+        try:
+            await span.timed(fail())
+        except ValueError:
+            pass
+        else:
+            assert False
+
+    cancelled = []
+
+    async def wait():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with startup_trace.async_span(hass, "test", "cancel") as span:
+        try:
+            await asyncio.wait_for(span.timed(wait()), 0.01)
+        except asyncio.TimeoutError:
+            pass
+
+    assert cancelled == [True]
+
+
+async def test_mark_once(hass):
+    """Test a moment recorded once per lane."""
+    trace = startup_trace.async_enable(hass)
+
+    startup_trace.async_mark(hass, "light.test", "first_state", once=True, x=1)
+    startup_trace.async_mark(hass, "light.test", "first_state", once=True, x=2)
+
+    marks = [event for event in trace.events if event["ph"] == "i"]
+    assert len(marks) == 1
+    assert marks[0]["args"] == {"x": 1}
+
+
+async def test_trace_setup(hass):
+    """Test the phases of setting up an integration and platform."""
+    trace = startup_trace.async_enable(hass)
+
+    async def async_setup(hass, config):
+        time.sleep(0.01)
+        return True
+
+    async def async_setup_platform(hass, config, async_add_entities, info=None):
+        async_add_entities([MockEntity(name="test")])
+
+    mock_integration(hass, MockModule("comp", async_setup=async_setup))
+    mock_entity_platform(
+        hass, "light.comp", MockPlatform(async_setup_platform=async_setup_platform)
+    )
+
+    assert await async_setup_component(hass, "comp", {})
+    assert await async_setup_component(hass, "light", {"light": {"platform": "comp"}})
+    await hass.async_block_till_done()
+
+    spans = _spans(trace, "comp")
+    assert {"resolve", "dependencies", "import", "config", "setup"} <= set(spans)
+    assert spans["setup"]["args"]["blocking_ms"] >= 10
+
+    spans = _spans(trace, "light.comp")
+    assert {"setup", "add_entities", "first_state"} <= set(spans)
+    assert spans["add_entities"]["args"]["entities"] == 1
+    assert spans["first_state"]["args"]["entity_id"] == "light.test"
+
+
+async def test_finish(hass, tmpdir):
+    """Test finishing stops the trace and writes it to the config dir."""
+    hass.config.config_dir = str(tmpdir)
+    trace = startup_trace.async_enable(hass)
+    startup_trace.async_mark(hass, "test", "moment")
+
+    with patch("homeassistant.helpers.startup_trace.save_json") as mock_save:
+        path = await startup_trace.async_finish(hass)
+
+    assert path == hass.config.path(startup_trace.TRACE_FILE)
+    assert mock_save.call_args[0] == (path, trace.as_chrome_trace())
+    assert startup_trace.async_get_trace(hass) is None
+
+    startup_trace.async_mark(hass, "test", "later")
+    assert len(trace.events) == 1
+    assert await startup_trace.async_finish(hass) is None
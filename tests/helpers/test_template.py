@@ -685,6 +685,75 @@ def test_render_with_possible_json_value_with_valid_json(hass):
     assert tpl.async_render_with_possible_json_value('{"hello": "world"}') == "world"
 
 
+def test_compiled_template_shared(hass):
+    """Test templates with the same source share their compiled template."""
+    before = template.cache_stats()
+    first = template.Template("{{ 'shared' ~ value }}", hass)
+    second = template.Template("{{ 'shared' ~ value }}", hass)
+    first.ensure_valid()
+    second.ensure_valid()
+    after = template.cache_stats()
+
+    assert after["compile_misses"] == before["compile_misses"] + 1
+    assert after["compile_hits"] == before["compile_hits"] + 1
+    assert first.async_render(value=1) == "shared1"
+    assert second.async_render(value=2) == "shared2"
+    # pylint: disable=protected-access
+    assert first._compiled is second._compiled
+
+
+def test_render_with_possible_json_value_cached(hass):
+    """Test templates of only value and value_json render a value once."""
+    first = template.Template("{{ value_json.cached | float * 2 }}", hass)
+    second = template.Template("{{ value_json.cached | float * 2 }}", hass)
+
+    before = template.cache_stats()
+    assert first.async_render_with_possible_json_value('{"cached": 2}') == "4.0"
+    assert second.async_render_with_possible_json_value('{"cached": 2}') == "4.0"
+    assert second.async_render_with_possible_json_value('{"cached": 3}') == "6.0"
+    after = template.cache_stats()
+
+    assert after["render_misses"] == before["render_misses"] + 2
+    assert after["render_hits"] == before["render_hits"] + 1
+    assert after["json_misses"] == before["json_misses"] + 2
+
+    other = template.Template("{{ value_json.cached }}", hass)
+    assert other.async_render_with_possible_json_value('{"cached": 3}') == "3"
+    assert template.cache_stats()["json_hits"] == after["json_hits"] + 1
+
+
+def test_render_with_possible_json_value_not_cached(hass):
+    """Test templates depending on more than the value are always rendered."""
+    hass.states.async_set("sensor.cache_test", "on")
+    tpl = template.Template("{{ value }} {{ states('sensor.cache_test') }}", hass)
+
+    before = template.cache_stats()
+    assert tpl.async_render_with_possible_json_value("x") == "x on"
+    hass.states.async_set("sensor.cache_test", "off")
+    assert tpl.async_render_with_possible_json_value("x") == "x off"
+
+    tpl = template.Template("{{ [value, 'other'] | random }}", hass)
+    tpl.async_render_with_possible_json_value("x")
+    after = template.cache_stats()
+
+    assert after["render_hits"] == before["render_hits"]
+    assert after["render_misses"] == before["render_misses"]
+
+
+def test_render_with_possible_json_value_time_zone(hass):
+    """Test templates depending on the time zone are always rendered."""
+    tpl = template.Template("{{ value | int | timestamp_local }}", hass)
+    time_zone = hass.config.time_zone
+
+    try:
+        hass.config.set_time_zone("US/Pacific")
+        assert tpl.async_render_with_possible_json_value("0") == "1969-12-31 16:00:00"
+        hass.config.set_time_zone("Asia/Tokyo")
+        assert tpl.async_render_with_possible_json_value("0") == "1970-01-01 09:00:00"
+    finally:
+        hass.config.set_time_zone(time_zone.zone)
+
+
 def test_render_with_possible_json_value_with_invalid_json(hass):
     """Render with possible JSON value with invalid JSON."""
     tpl = template.Template("{{ value_json }}", hass)
@@ -392,6 +392,42 @@ async def test_setup_hass(
     assert len(mock_process_ha_config_upgrade.mock_calls) == 1
 
 
+async def test_setup_hass_trace_startup(
+    mock_enable_logging,
+    mock_is_virtual_env,
+    mock_mount_local_lib_path,
+    mock_ensure_config_exists,
+    mock_process_ha_config_upgrade,
+):
+    """Test the startup is traced and written to the config dir."""
+    with patch(
+        "homeassistant.config.async_hass_config_yaml",
+        return_value={"browser": {}, "frontend": {}},
+    ), patch.object(bootstrap, "LOG_SLOW_STARTUP_INTERVAL", 5000), patch(
+        "homeassistant.components.http.start_http_server_and_save_config"
+    ), patch(
+        "homeassistant.helpers.startup_trace.save_json"
+    ) as mock_save:
+        hass = await bootstrap.async_setup_hass(
+            config_dir=get_test_config_dir(),
+            verbose=False,
+            log_rotate_days=10,
+            log_file="",
+            log_no_color=False,
+            skip_pip=True,
+            safe_mode=False,
+            trace_startup=True,
+        )
+
+    assert len(mock_save.mock_calls) == 1
+    path, trace = mock_save.mock_calls[0][1]
+    assert path == hass.config.path("startup_trace.json")
+    lanes = {
+        event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"
+    }
+    assert {"bootstrap", "browser", "frontend"} <= lanes
+
+
 async def test_setup_hass_takes_longer_than_log_slow_startup(
     mock_enable_logging,
     mock_is_virtual_env,
@@ -480,6 +480,71 @@ class TestEventBus(unittest.TestCase):
         assert len(coroutine_calls) == 1
 
 
+async def test_eventbus_dispatch_rebuilt_on_listener_change(hass):
+    """Test the dispatch table follows listener changes."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(("listener", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        calls.append(("match_all", event.event_type))
+
+    unsub = hass.bus.async_listen("test_event", listener)
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert calls == [("listener", "test_event")]
+
+    unsub_match_all = hass.bus.async_listen(ha.MATCH_ALL, match_all_listener)
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert calls[1:] == [("match_all", "test_event"), ("listener", "test_event")]
+
+    unsub()
+    unsub_match_all()
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+
+async def test_eventbus_metrics(hass):
+    """Test recording dispatch metrics per event type."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(event)
+
+    async def coro_listener(event):
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", listener)
+    hass.bus.async_listen("test_event", coro_listener)
+
+    assert not hass.bus.metrics_enabled
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert hass.bus.async_metrics() == {}
+
+    hass.bus.async_set_metrics_enabled(True)
+    assert hass.bus.metrics_enabled
+
+    hass.bus.async_fire("test_event")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 6
+    metrics = hass.bus.async_metrics()
+    assert metrics["test_event"]["fires"] == 2
+    assert metrics["test_event"]["listener_count"] == 2
+    assert metrics["test_event"]["dispatch_time"] > 0
+
+    hass.bus.async_set_metrics_enabled(False)
+    assert hass.bus.async_metrics() == {}
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -0,0 +1,101 @@
+"""Test Home Assistant sliding window util methods."""
+from datetime import timedelta
+import random
+import statistics
+
+import pytest
+
+import homeassistant.util.dt as dt_util
+from homeassistant.util.sliding_window import (
+    ExponentialMovingState,
+    SlidingMedian,
+    TimeWeightedSum,
+)
+
+
+def test_sliding_median_oldest_first():
+    """Test the median of a window removing the oldest sample."""
+    rnd = random.Random(3)
+    median = SlidingMedian()
+    values = []
+
+    for key in range(400):
+        value = rnd.randint(0, 20)
+        median.add(value, key)
+        values.append(value)
+        if len(values) > 15:
+            median.remove(key - 15)
+            values.pop(0)
+
+        assert len(median) == len(values)
+        assert median.median == statistics.median(values)
+
+
+def test_sliding_median_any_order():
+    """Test samples can be removed in any order."""
+    rnd = random.Random(11)
+    median = SlidingMedian()
+    samples = {}
+
+    for key in range(400):
+        samples[key] = rnd.uniform(-5, 5)
+        median.add(samples[key], key)
+        if len(samples) > 1 and rnd.random() < 0.45:
+            removed = rnd.choice(list(samples))
+            del samples[removed]
+            median.remove(removed)
+
+        if samples:
+            assert median.median == statistics.median(samples.values())
+
+
+def test_time_weighted_sum():
+    """Test the integral of the samples as a step function."""
+    start = dt_util.utcnow()
+    window = TimeWeightedSum()
+    window.add(start, 2.0)
+    assert window.total == 0
+
+    window.add(start + timedelta(seconds=10), 5.0)
+    window.add(start + timedelta(seconds=15), 1.0)
+    assert window.total == pytest.approx(2.0 * 10 + 5.0 * 5)
+
+    assert window.pop_oldest() == (start, 2.0)
+    assert window.total == pytest.approx(5.0 * 5)
+    assert window.oldest == (start + timedelta(seconds=10), 5.0)
+
+    window.pop_oldest()
+    window.pop_oldest()
+    assert not window
+    assert window.total == 0
+
+
+def test_time_weighted_sum_long_run():
+    """Test the sum stays exact over many samples."""
+    rnd = random.Random(5)
+    start = dt_util.utcnow()
+    window = TimeWeightedSum()
+    samples = []
+
+    for index in range(1000):
+        sample = (start + timedelta(seconds=index * 1.5), rnd.uniform(0, 1000))
+        window.add(*sample)
+        samples.append(sample)
+        if len(samples) > 50:
+            assert window.pop_oldest() == samples.pop(0)
+
+    expected = sum(
+        (samples[index + 1][0] - samples[index][0]).total_seconds() * samples[index][1]
+        for index in range(len(samples) - 1)
+    )
+    assert window.total == pytest.approx(expected)
+
+
+def test_exponential_moving_state():
+    """Test the exponential moving average."""
+    moving = ExponentialMovingState(0.25)
+    assert moving.state is None
+    assert moving.update(8) == 8
+    assert moving.update(0) == 6
+    assert moving.update(6) == 6
+    assert moving.state == 6